@@ -2,7 +2,13 @@ from typing import Annotated
 
 from fastapi import Depends
 
-from ..database.session import AsyncSession, get_session
+from ..database.session import (
+    AsyncSession,
+    async_session,
+    get_replica_router,
+    get_session,
+)
+from ..services.cache import read_cache
 from ..services.get_services import (
     CharacterGetService,
     FilmGetService,
@@ -10,25 +16,35 @@ from ..services.get_services import (
 )
 
 
-from .schemas import PaginationParams
+from .schemas import FieldParams, PaginationParams, TraversalParams
+
+
+async def get_read_session():
+    """Yield a session for read-only requests, bound to a replica that has
+    caught up with the dataset version this worker serves, or to the primary."""
+    engine = get_replica_router().engine(read_cache.version)
+    async with async_session(bind=engine) as session:
+        yield session
+
 
-# Async database session dependency
+# Async database session dependencies; writes always use the primary
 AsyncSessionDep = Annotated[AsyncSession, Depends(get_session)]
+ReadSessionDep = Annotated[AsyncSession, Depends(get_read_session)]
 
 
-def get_film_service(session: AsyncSessionDep) -> FilmGetService:
+def get_film_service(session: ReadSessionDep) -> FilmGetService:
     """Provide FilmGetService with injected session."""
 
     return FilmGetService(session)
 
 
-def get_character_service(session: AsyncSessionDep) -> CharacterGetService:
+def get_character_service(session: ReadSessionDep) -> CharacterGetService:
     """Provide CharacterGetService with injected session."""
 
     return CharacterGetService(session)
 
 
-def get_starship_service(session: AsyncSessionDep) -> StarshipGetService:
+def get_starship_service(session: ReadSessionDep) -> StarshipGetService:
     """Provide StarshipGetService with injected session."""
 
     return StarshipGetService(session)
@@ -36,6 +52,8 @@ def get_starship_service(session: AsyncSessionDep) -> StarshipGetService:
 
 # Dependency type aliases
 PaginationParamsDep = Annotated[PaginationParams, Depends()]
+FieldParamsDep = Annotated[FieldParams, Depends()]
+TraversalParamsDep = Annotated[TraversalParams, Depends()]
 FilmServiceDep = Annotated[FilmGetService, Depends(get_film_service)]
 CharacterServiceDep = Annotated[CharacterGetService, Depends(get_character_service)]
 StarshipServiceDep = Annotated[StarshipGetService, Depends(get_starship_service)]
@@ -0,0 +1,87 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import HTTPException, Request, Response, status
+
+from ..config import get_cache_settings
+from ..services.cache import read_cache
+
+
+def conditional_get(request: Request, response: Response):
+    """Answer conditional GETs from the dataset version known to this worker.
+
+    Adds ETag, Last-Modified and Cache-Control headers, and raises a 304 when
+    the client's validators still match, before the route touches the
+    database or serializes anything.
+    """
+    headers = {"Cache-Control": cache_control(request)}
+    etag = None
+    if read_cache.version is not None:
+        etag = make_etag(read_cache.version, request)
+        headers["ETag"] = etag
+    last_modified = _last_modified()
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+    if etag and _not_modified(request, etag):
+        raise HTTPException(status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+
+
+def cache_control(request: Request) -> str:
+    """Return the Cache-Control value configured for the matched route."""
+    route = request.scope.get("route")
+    path = getattr(route, "path", request.url.path)
+    cache_settings = get_cache_settings()
+    return cache_settings.HTTP_CACHE_CONTROL_ROUTES.get(
+        path, cache_settings.HTTP_CACHE_CONTROL
+    )
+
+
+def make_etag(version: int, request: Request) -> str:
+    """Build a strong ETag from the dataset version, path and query parameters."""
+    query = sorted(request.query_params.multi_items())
+    digest = hashlib.blake2b(
+        repr((request.url.path, query)).encode(), digest_size=8
+    ).hexdigest()
+    return f'"{version}-{digest}"'
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    """Evaluate If-None-Match, or If-Modified-Since when no ETag was sent."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+
+    since = _parse_http_date(request.headers.get("if-modified-since"))
+    last_modified = _last_modified()
+    if since is None or last_modified is None:
+        return False
+    return last_modified <= since
+
+
+def _last_modified() -> Optional[datetime]:
+    """Return the dataset bump time in UTC, truncated to HTTP date precision."""
+    if read_cache.updated_at is None:
+        return None
+    return read_cache.updated_at.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def _parse_http_date(value: Optional[str]):
+    """Parse an HTTP date header, returning None when absent or malformed.
+
+    Dates without a zone, or with `-0000`, are taken as UTC, which HTTP dates
+    always are.
+    """
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed
@@ -0,0 +1,48 @@
+from time import perf_counter
+
+from ..config import get_metrics_settings
+from ..metrics import RequestMetrics, current_request, observe_request
+
+
+class MetricsMiddleware:
+    """Record latency, SQL work, serialization time and response size of
+    every HTTP request, labelled by its route template.
+
+    A plain ASGI middleware, so streamed responses pass through unbuffered
+    and are timed until their last chunk is sent. Requests matching no route
+    share the `unmatched` label, keeping the number of series bounded.
+    METRICS_ENABLED is read on first use.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.enabled = None
+
+    async def __call__(self, scope, receive, send):
+        if self.enabled is None:
+            self.enabled = get_metrics_settings().METRICS_ENABLED
+        if scope["type"] != "http" or not self.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        metrics = RequestMetrics()
+        status = 500
+        size = 0
+
+        async def send_counting(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        token = current_request.set(metrics)
+        start = perf_counter()
+        try:
+            await self.app(scope, receive, send_counting)
+        finally:
+            seconds = perf_counter() - start
+            current_request.reset(token)
+            route = getattr(scope.get("route"), "path", "unmatched")
+            observe_request(scope["method"], route, status, seconds, size, metrics)
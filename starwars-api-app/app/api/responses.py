@@ -0,0 +1,108 @@
+import json
+from typing import Any, AsyncIterator, Mapping, Optional
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+from ..config import get_api_settings
+from ..metrics import serializing
+
+# Items serialized into each chunk of a streamed response
+STREAM_CHUNK_ITEMS = 50
+
+
+def native_json(content: Any) -> bytes:
+    """Encode with pydantic-core, which serializes models, UUIDs and dates
+    natively, so read routes can hand over their results without a
+    `jsonable_encoder` pass."""
+    return to_json(content)
+
+
+def stdlib_json(content: Any) -> bytes:
+    """Encode the way FastAPI does by default."""
+    return json.dumps(
+        jsonable_encoder(content),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+ENCODERS = {"native": native_json, "stdlib": stdlib_json}
+
+
+class NativeJSONResponse(JSONResponse):
+    """JSON response encoded by pydantic-core."""
+
+    def render(self, content: Any) -> bytes:
+        with serializing():
+            return native_json(content)
+
+
+class StdlibJSONResponse(JSONResponse):
+    """JSON response encoded the way FastAPI does by default."""
+
+    def render(self, content: Any) -> bytes:
+        with serializing():
+            return stdlib_json(content)
+
+
+class ConfiguredJSONResponse(JSONResponse):
+    """Default response class of the app, encoded as JSON_RESPONSE_CLASS says.
+
+    The app is built at import, before settings are read, so the encoder is
+    looked up when a response is rendered.
+    """
+
+    def render(self, content: Any) -> bytes:
+        encode = ENCODERS[get_api_settings().JSON_RESPONSE_CLASS]
+        with serializing():
+            return encode(content)
+
+
+class StreamingJSONResponse(StreamingResponse):
+    """Response writing a page or batch incrementally.
+
+    The envelope is sent first and the items follow in chunks, so the full
+    payload is never held as one string.
+    """
+
+    def __init__(self, content: BaseModel, headers: Optional[Mapping] = None):
+        super().__init__(
+            _stream_items(content), media_type="application/json", headers=headers
+        )
+
+
+def json_response(content: Any, headers: Optional[Mapping] = None) -> Response:
+    """Build the response of a read route from its result.
+
+    Pre-serialized bytes are sent as they are, pages and batches of at least
+    JSON_STREAM_MIN_ITEMS items are streamed, and anything else is encoded
+    as JSON_RESPONSE_CLASS says.
+    """
+    if isinstance(content, bytes):
+        return Response(content, media_type="application/json", headers=headers)
+    threshold = get_api_settings().JSON_STREAM_MIN_ITEMS
+    items = getattr(content, "items", None)
+    if threshold and isinstance(items, list) and len(items) >= threshold:
+        return StreamingJSONResponse(content, headers=headers)
+    return ConfiguredJSONResponse(content, headers=headers)
+
+
+async def _stream_items(content: BaseModel) -> AsyncIterator[bytes]:
+    """Yield the JSON of `content` with its `items` written chunk by chunk."""
+    with serializing():
+        envelope = to_json(content, exclude={"items"})
+    yield envelope[:-1] + (b',"items":[' if len(envelope) > 2 else b'"items":[')
+    items = content.items
+    for start in range(0, len(items), STREAM_CHUNK_ITEMS):
+        with serializing():
+            chunk = b",".join(
+                to_json(i) for i in items[start : start + STREAM_CHUNK_ITEMS]
+            )
+        yield chunk if start == 0 else b"," + chunk
+    yield b"]}"
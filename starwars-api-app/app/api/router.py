@@ -1,107 +1,397 @@
-from typing import Optional
+from dataclasses import asdict
+from typing import List, Optional, Union
 from uuid import UUID
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Depends, Query, Response, status
 
 from ..api.dependencies import (
     AsyncSessionDep,
     CharacterServiceDep,
+    FieldParamsDep,
     FilmServiceDep,
     PaginationParamsDep,
     StarshipServiceDep,
+    TraversalParamsDep,
 )
+from ..api.http_cache import conditional_get
+from ..api.responses import json_response
 from ..api.schemas import (
+    AdjacencyIndexRead,
+    BatchCharacterRead,
+    BatchFilmRead,
+    BatchRequest,
+    BatchStarshipRead,
+    CacheStatsRead,
     CharacterRead,
     FilmRead,
     PaginatedCharacterRead,
     PaginatedFilmRead,
     PaginatedStarshipRead,
+    PoolStatsRead,
+    RelationCountsRead,
+    ReplicaRead,
     StarshipRead,
-    SyncResponse,
+    SyncJobRead,
+    TraversalResponse,
 )
+from ..config import SWAPI_SYNC_CHUNK_SIZE, get_cache_settings, get_db_settings
+from ..database.session import get_engine, get_replica_router
 from ..exceptions import exception_handler
-from ..services.swapi.sync import sync_swapi
+from ..services.cache import read_cache
+from ..services.graph import adjacency_index
+from ..services.snapshot import DatasetSnapshot
+from ..services.swapi.entities import SyncMode, WriteEngine
 
 router = APIRouter(prefix="/api")
 
 
-@router.post("/sync")
+def _read_route(schema, conditional: bool = True) -> dict:
+    """Route options shared by the read endpoints.
+
+    `fields=` and `expand=` change the shape of items, so the schema only
+    documents the full response; the services return validated models, and
+    the routes encode them with `json_response`. Headers set by dependencies
+    are passed on, as FastAPI only applies them to responses it builds.
+    """
+    return {
+        "dependencies": [Depends(conditional_get)] if conditional else [],
+        "response_model": None,
+        "responses": {200: {"model": schema}},
+    }
+
+
+def _ids_query():
+    """Query parameter switching a list endpoint to a batch lookup by id."""
+    return Query(
+        None,
+        description="Comma-separated ids to fetch in request order instead of a page",
+    )
+
+
+@router.post("/sync", status_code=status.HTTP_202_ACCEPTED)
+@exception_handler(session_arg="session")
+async def sync_data(
+    session: AsyncSessionDep,
+    mode: SyncMode = Query(
+        SyncMode.INCREMENTAL,
+        description="`incremental` upserts by SWAPI URL, `full` wipes and reloads",
+    ),
+    engine: WriteEngine = Query(
+        WriteEngine.VALUES,
+        description="Write path for new rows: `orm`, multi-row `values` or `copy`",
+    ),
+    chunk_size: int = Query(
+        SWAPI_SYNC_CHUNK_SIZE,
+        ge=1,
+        le=10000,
+        description="Number of records parsed and written per batch",
+    ),
+    trace_memory: bool = Query(
+        False,
+        description="Report the peak traced Python allocation of the run, "
+        "at the cost of slowing it down",
+    ),
+) -> SyncJobRead:
+    """Start synchronizing the local database with SWAPI in the background.
+
+    If a sync is already running in any worker, its job is returned instead.
+    """
+    # The sync stack, with its HTTP client, loads on first use
+    from ..services.swapi.jobs import enqueue_sync, job_read
+
+    job, coalesced = await enqueue_sync(
+        session,
+        mode=mode,
+        engine=engine,
+        chunk_size=chunk_size,
+        trace_memory=trace_memory,
+    )
+    return job_read(job, coalesced=coalesced)
+
+
+@router.get("/sync/{job_id}")
 @exception_handler(session_arg="session")
-async def sync_data(session: AsyncSessionDep) -> SyncResponse:
-    """Synchronize local database with SWAPI data."""
-
-    entities_dict = await sync_swapi(session)
-    return SyncResponse(
-        status="success",
-        message="Data synchronized successfully",
-        synced_entities=entities_dict,
+async def get_sync_status(job_id: UUID, session: AsyncSessionDep) -> SyncJobRead:
+    """Report phase, progress counts and timing of a sync job."""
+    from ..services.swapi.jobs import get_sync_job, job_read
+
+    return job_read(await get_sync_job(session, job_id))
+
+
+@router.get("/cache/stats")
+async def get_cache_stats() -> CacheStatsRead:
+    """Report hit, miss and eviction counters of this worker's read cache."""
+
+    index = adjacency_index.index
+    return CacheStatsRead(
+        enabled=read_cache.enabled,
+        dataset_version=read_cache.version,
+        entries=len(read_cache),
+        size_bytes=read_cache.size_bytes,
+        max_bytes=read_cache.max_bytes,
+        max_entries=read_cache.max_entries,
+        adjacency_index=index
+        and AdjacencyIndexRead(
+            dataset_version=index.version,
+            snapshot=isinstance(index, DatasetSnapshot),
+            nodes=index.nodes,
+            edges=index.edges,
+            memory_bytes=index.memory_bytes,
+        ),
+        **asdict(read_cache.stats),
     )
 
 
-@router.get("/films")
+@router.get("/database/pool")
+async def get_pool_stats() -> PoolStatsRead:
+    """Report connections in use and checkout waits of this worker's pool."""
+
+    pool = get_engine().pool
+    return PoolStatsRead(
+        size=pool.size(),
+        max_overflow=get_db_settings().POOL_MAX_OVERFLOW,
+        checked_in=pool.checkedin(),
+        checked_out=pool.checkedout(),
+        overflow=pool.overflow(),
+        **asdict(pool.wait_stats),
+    )
+
+
+@router.get("/database/replicas")
+async def get_replicas() -> List[ReplicaRead]:
+    """Report the read replicas and their last health check."""
+
+    return [
+        ReplicaRead(
+            name=replica.name,
+            healthy=replica.healthy,
+            lag_seconds=replica.lag_seconds,
+            dataset_version=replica.dataset_version,
+        )
+        for replica in get_replica_router().replicas
+    ]
+
+
+@router.get(
+    "/films", **_read_route(Union[PaginatedFilmRead, BatchFilmRead])
+)
 async def get_films(
     service: FilmServiceDep,
     pagionation: PaginationParamsDep,
+    view: FieldParamsDep,
+    response: Response,
     title: Optional[str] = Query(None, description="Filter by title"),
-) -> PaginatedFilmRead:
-    """Retrieve paginated list of films with optional title filter."""
+    ids: Optional[List[str]] = _ids_query(),
+) -> Union[PaginatedFilmRead, BatchFilmRead]:
+    """Retrieve paginated list of films with optional title filter, or the
+    films with the given ids."""
 
+    if ids:
+        result = await service.get_many(ids, fields=view.fields, expand=view.expand)
+        return json_response(result, response.headers)
     result = await service.get_paginated(
         filter_value=title,
         offset=pagionation.offset,
         limit=pagionation.limit,
+        cursor=pagionation.cursor,
+        total_mode=pagionation.total,
+        fields=view.fields,
+        expand=view.expand,
     )
-    return result
+    return json_response(result, response.headers)
+
 
+@router.post("/films/batch", **_read_route(BatchFilmRead, conditional=False))
+async def get_films_batch(
+    batch: BatchRequest, service: FilmServiceDep
+) -> BatchFilmRead:
+    """Retrieve the films with the given ids, for lists too long for a URL."""
 
-@router.get("/films/{id}")
-async def get_film(id: UUID, service: FilmServiceDep) -> FilmRead:
+    result = await service.get_many(batch.ids, fields=batch.fields, expand=batch.expand)
+    return json_response(result)
+
+
+@router.get("/films/{id}", **_read_route(FilmRead))
+async def get_film(
+    id: UUID, service: FilmServiceDep, view: FieldParamsDep, response: Response
+) -> FilmRead:
     """Retrieve a film by its unique ID."""
 
-    return await service.get(id)
+    if get_cache_settings().DETAIL_BYTES_CACHE_ENABLED:
+        content = await service.get_json(id, fields=view.fields, expand=view.expand)
+    else:
+        content = await service.get(id, fields=view.fields, expand=view.expand)
+    return json_response(content, response.headers)
 
 
-@router.get("/characters")
+@router.get(
+    "/characters", **_read_route(Union[PaginatedCharacterRead, BatchCharacterRead])
+)
 async def get_characters(
     service: CharacterServiceDep,
     pagionation: PaginationParamsDep,
+    view: FieldParamsDep,
+    response: Response,
     name: Optional[str] = Query(None, description="Filter by name"),
-) -> PaginatedCharacterRead:
-    """Retrieve paginated list of characters with optional name filter."""
+    ids: Optional[List[str]] = _ids_query(),
+) -> Union[PaginatedCharacterRead, BatchCharacterRead]:
+    """Retrieve paginated list of characters with optional name filter, or the
+    characters with the given ids."""
 
+    if ids:
+        result = await service.get_many(ids, fields=view.fields, expand=view.expand)
+        return json_response(result, response.headers)
     result = await service.get_paginated(
         filter_value=name,
         offset=pagionation.offset,
         limit=pagionation.limit,
+        cursor=pagionation.cursor,
+        total_mode=pagionation.total,
+        fields=view.fields,
+        expand=view.expand,
     )
-    return result
+    return json_response(result, response.headers)
 
 
-@router.get("/characters/{id}")
-async def get_character(id: UUID, service: CharacterServiceDep) -> CharacterRead:
+@router.post("/characters/batch", **_read_route(BatchCharacterRead, conditional=False))
+async def get_characters_batch(
+    batch: BatchRequest, service: CharacterServiceDep
+) -> BatchCharacterRead:
+    """Retrieve the characters with the given ids, for lists too long for a URL."""
+
+    result = await service.get_many(batch.ids, fields=batch.fields, expand=batch.expand)
+    return json_response(result)
+
+
+@router.get("/characters/{id}", **_read_route(CharacterRead))
+async def get_character(
+    id: UUID, service: CharacterServiceDep, view: FieldParamsDep, response: Response
+) -> CharacterRead:
     """Retrieve a character by its unique ID."""
 
-    return await service.get(id)
+    if get_cache_settings().DETAIL_BYTES_CACHE_ENABLED:
+        content = await service.get_json(id, fields=view.fields, expand=view.expand)
+    else:
+        content = await service.get(id, fields=view.fields, expand=view.expand)
+    return json_response(content, response.headers)
 
 
-@router.get("/starships")
+@router.get(
+    "/starships", **_read_route(Union[PaginatedStarshipRead, BatchStarshipRead])
+)
 async def get_starships(
     service: StarshipServiceDep,
     pagionation: PaginationParamsDep,
+    view: FieldParamsDep,
+    response: Response,
     name: Optional[str] = Query(None, description="Filter by name"),
-) -> PaginatedStarshipRead:
-    """Retrieve paginated list of starships with optional name filter."""
+    ids: Optional[List[str]] = _ids_query(),
+) -> Union[PaginatedStarshipRead, BatchStarshipRead]:
+    """Retrieve paginated list of starships with optional name filter, or the
+    starships with the given ids."""
 
+    if ids:
+        result = await service.get_many(ids, fields=view.fields, expand=view.expand)
+        return json_response(result, response.headers)
     result = await service.get_paginated(
         filter_value=name,
         offset=pagionation.offset,
         limit=pagionation.limit,
+        cursor=pagionation.cursor,
+        total_mode=pagionation.total,
+        fields=view.fields,
+        expand=view.expand,
     )
-    return result
+    return json_response(result, response.headers)
+
+
+@router.post("/starships/batch", **_read_route(BatchStarshipRead, conditional=False))
+async def get_starships_batch(
+    batch: BatchRequest, service: StarshipServiceDep
+) -> BatchStarshipRead:
+    """Retrieve the starships with the given ids, for lists too long for a URL."""
+
+    result = await service.get_many(batch.ids, fields=batch.fields, expand=batch.expand)
+    return json_response(result)
 
 
-@router.get("/starships/{id}")
-async def get_starship(id: UUID, service: StarshipServiceDep) -> StarshipRead:
+@router.get("/starships/{id}", **_read_route(StarshipRead))
+async def get_starship(
+    id: UUID, service: StarshipServiceDep, view: FieldParamsDep, response: Response
+) -> StarshipRead:
     """Retrieve a starship by its unique ID."""
 
-    return await service.get(id)
+    if get_cache_settings().DETAIL_BYTES_CACHE_ENABLED:
+        content = await service.get_json(id, fields=view.fields, expand=view.expand)
+    else:
+        content = await service.get(id, fields=view.fields, expand=view.expand)
+    return json_response(content, response.headers)
+
+
+@router.get("/films/{id}/traverse", dependencies=[Depends(conditional_get)])
+async def traverse_film(
+    id: UUID, service: FilmServiceDep, traversal: TraversalParamsDep
+) -> TraversalResponse:
+    """Follow relationships from a film and count the entities reached."""
+
+    return await service.traverse(
+        id,
+        path=traversal.path,
+        limit=traversal.limit,
+        include_start=traversal.include_start,
+    )
+
+
+@router.get("/films/{id}/counts", dependencies=[Depends(conditional_get)])
+async def count_film_relations(
+    id: UUID, service: FilmServiceDep
+) -> RelationCountsRead:
+    """Count the entities in each relationship of a film."""
+
+    return await service.count_related(id)
+
+
+@router.get("/characters/{id}/traverse", dependencies=[Depends(conditional_get)])
+async def traverse_character(
+    id: UUID, service: CharacterServiceDep, traversal: TraversalParamsDep
+) -> TraversalResponse:
+    """Follow relationships from a character and count the entities reached."""
+
+    return await service.traverse(
+        id,
+        path=traversal.path,
+        limit=traversal.limit,
+        include_start=traversal.include_start,
+    )
+
+
+@router.get("/characters/{id}/counts", dependencies=[Depends(conditional_get)])
+async def count_character_relations(
+    id: UUID, service: CharacterServiceDep
+) -> RelationCountsRead:
+    """Count the entities in each relationship of a character."""
+
+    return await service.count_related(id)
+
+
+@router.get("/starships/{id}/traverse", dependencies=[Depends(conditional_get)])
+async def traverse_starship(
+    id: UUID, service: StarshipServiceDep, traversal: TraversalParamsDep
+) -> TraversalResponse:
+    """Follow relationships from a starship and count the entities reached."""
+
+    return await service.traverse(
+        id,
+        path=traversal.path,
+        limit=traversal.limit,
+        include_start=traversal.include_start,
+    )
+
+
+@router.get("/starships/{id}/counts", dependencies=[Depends(conditional_get)])
+async def count_starship_relations(
+    id: UUID, service: StarshipServiceDep
+) -> RelationCountsRead:
+    """Count the entities in each relationship of a starship."""
+
+    return await service.count_related(id)
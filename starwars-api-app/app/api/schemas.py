@@ -1,22 +1,118 @@
 from abc import ABC, abstractmethod
-from datetime import date
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum
 from typing import Generic, List, Optional, TypeVar
 from uuid import UUID
 
 from fastapi import Query
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
+from ..config import BATCH_MAX_IDS, TRAVERSAL_MAX_DEPTH, TRAVERSAL_MAX_LIMIT
 from ..utils import parse_value
 
 T = TypeVar("T")
 
 
+class SyncStatsRead(BaseModel):
+    """Where a sync spent its time and how much it moved."""
+
+    elapsed_seconds: float
+    phase_seconds: dict[str, float]
+    records_per_second: float
+    bytes_fetched: int
+    statements: int
+    rows_written: dict[str, int]
+
+
 class SyncResponse(BaseModel):
     """Response model for synchronization results."""
 
     status: str
     message: str = None
+    mode: str = None
     synced_entities: dict[str, int] = None
+    changes: dict[str, dict[str, int]] = None
+    chunk_size: Optional[int] = None
+    peak_memory_bytes: Optional[int] = None
+    stats: Optional[SyncStatsRead] = None
+
+
+class SyncJobRead(BaseModel):
+    """Status of a background synchronization job."""
+
+    id: UUID
+    status: str
+    phase: Optional[str] = None
+    mode: str
+    engine: str
+    chunk_size: int
+    progress: dict[str, int] = {}
+    result: Optional[SyncResponse] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    elapsed_seconds: Optional[float] = None
+    coalesced: bool = False
+
+
+class AdjacencyIndexRead(BaseModel):
+    """Size of this worker's in-memory adjacency index."""
+
+    dataset_version: int
+    snapshot: bool = False
+    nodes: int
+    edges: int
+    memory_bytes: int
+
+
+class PoolStatsRead(BaseModel):
+    """Occupancy and checkout waits of this worker's connection pool."""
+
+    size: int
+    max_overflow: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+
+
+class ReplicaRead(BaseModel):
+    """Health of a read replica as last checked by this worker."""
+
+    name: str
+    healthy: bool
+    lag_seconds: Optional[float] = None
+    dataset_version: Optional[int] = None
+
+
+class CacheStatsRead(BaseModel):
+    """Counters and occupancy of this worker's read cache."""
+
+    enabled: bool
+    dataset_version: Optional[int] = None
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    entries: int
+    size_bytes: int
+    max_bytes: int
+    max_entries: int
+    adjacency_index: Optional[AdjacencyIndexRead] = None
+
+
+class TotalMode(str, Enum):
+    """How list endpoints compute the total number of matching rows."""
+
+    EXACT = "exact"
+    WINDOW = "window"
+    ESTIMATED = "estimated"
+    NONE = "none"
 
 
 class PaginationParams(BaseModel):
@@ -24,15 +120,105 @@ class PaginationParams(BaseModel):
 
     offset: int = Query(0, ge=0, description="Pagination offset")
     limit: int = Query(10, ge=1, le=100, description="Pagination limit")
+    cursor: Optional[str] = Query(
+        None,
+        description="`next_cursor` of the previous page; takes precedence over offset",
+    )
+    total: TotalMode = Query(
+        TotalMode.EXACT,
+        description=(
+            "`exact` runs a COUNT query, `window` counts in the page query, "
+            "`estimated` uses a cached or planner count, `none` skips it"
+        ),
+    )
+
+
+@dataclass
+class FieldParams:
+    """Query parameters shaping the fields of each returned item.
+
+    A dataclass rather than a model, so FastAPI keeps the list parameters in
+    the query string and they may be repeated.
+    """
+
+    fields: Optional[List[str]] = Query(
+        None,
+        description="Comma-separated fields to return; other columns are not read",
+    )
+    expand: Optional[List[str]] = Query(
+        None,
+        description="Comma-separated relations to inline as objects instead of ids",
+    )
+
+
+@dataclass
+class TraversalParams:
+    """Query parameters of the graph traversal endpoints."""
+
+    path: List[str] = Query(
+        ...,
+        description=(
+            f"Comma-separated relationships to follow, at most {TRAVERSAL_MAX_DEPTH}, "
+            "e.g. `films,characters`"
+        ),
+    )
+    limit: int = Query(
+        100, ge=1, le=TRAVERSAL_MAX_LIMIT, description="Most entities to return"
+    )
+    include_start: bool = Query(
+        False, description="Keep the start entity when the path leads back to it"
+    )
 
 
 class PaginatedResponse(BaseModel, Generic[T]):
     """Generic paginated response wrapper."""
 
-    total: int
-    offset: int
+    total: Optional[int] = None
+    total_mode: TotalMode = TotalMode.EXACT
+    offset: Optional[int] = None
     limit: int
     items: List[T]
+    has_more: bool = False
+    next_cursor: Optional[str] = None
+
+
+class BatchResponse(BaseModel, Generic[T]):
+    """Entities fetched by id, in request order, and the ids not found."""
+
+    items: List[T]
+    missing: List[UUID] = []
+
+
+class BatchRequest(BaseModel):
+    """Body of a batch lookup, for id lists too long for a query string."""
+
+    ids: List[UUID] = Field(min_length=1, max_length=BATCH_MAX_IDS)
+    fields: Optional[List[str]] = None
+    expand: Optional[List[str]] = None
+
+
+class TraversalNode(BaseModel):
+    """Entity reached by a traversal and how many entities led to it."""
+
+    id: UUID
+    count: int
+
+
+class TraversalResponse(BaseModel):
+    """Distinct entities at the end of a relationship path."""
+
+    start: UUID
+    path: List[str]
+    total: int
+    items: List[TraversalNode]
+    has_more: bool = False
+
+
+class RelationCountsRead(BaseModel):
+    """Number of entities in each relationship of an entity."""
+
+    id: UUID
+    counts: dict[str, int]
 
 
 class UUIDRef(BaseModel):
@@ -185,6 +371,24 @@ class StarshipRead(BaseStarship):
     films: List[UUIDRef]
 
 
+class FilmSummary(BaseFilm):
+    """Film inlined into an expanded relation."""
+
+    id: UUID
+
+
+class CharacterSummary(BaseCharacter):
+    """Character inlined into an expanded relation."""
+
+    id: UUID
+
+
+class StarshipSummary(BaseStarship):
+    """Starship inlined into an expanded relation."""
+
+    id: UUID
+
+
 class PaginatedFilmRead(PaginatedResponse[FilmRead]):
     """Paginated response for films."""
 
@@ -201,3 +405,21 @@ class PaginatedStarshipRead(PaginatedResponse[StarshipRead]):
     """Paginated response for starships."""
 
     items: List[StarshipRead]
+
+
+class BatchFilmRead(BatchResponse[FilmRead]):
+    """Batch lookup response for films."""
+
+    items: List[FilmRead]
+
+
+class BatchCharacterRead(BatchResponse[CharacterRead]):
+    """Batch lookup response for characters."""
+
+    items: List[CharacterRead]
+
+
+class BatchStarshipRead(BatchResponse[StarshipRead]):
+    """Batch lookup response for starships."""
+
+    items: List[StarshipRead]
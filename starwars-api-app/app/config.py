@@ -1,9 +1,18 @@
+import tempfile
+from functools import cache
 from pathlib import Path
+from typing import Literal, Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 PROJECT_DIR = Path(__file__).resolve().parent.parent.parent
 SWAPI_BASE_URL = "https://swapi.info/api"
+SWAPI_SYNC_CHUNK_SIZE = 500
+# Most ids one batch lookup may request
+BATCH_MAX_IDS = 1000
+# Most relationship hops and result rows of one graph traversal
+TRAVERSAL_MAX_DEPTH = 4
+TRAVERSAL_MAX_LIMIT = 1000
 
 
 _base_config = SettingsConfigDict(
@@ -22,6 +31,24 @@ class DatabaseSettings(BaseSettings):
     POSTGRES_PASSWORD: str
     POSTGRES_DB: str
 
+    # Connections kept open per worker, and extra ones opened under load
+    POOL_SIZE: int = 5
+    POOL_MAX_OVERFLOW: int = 10
+    # Seconds a checkout waits for a free connection before failing
+    POOL_TIMEOUT: float = 30.0
+    # Seconds after which a connection is replaced, -1 to keep them
+    POOL_RECYCLE: int = 1800
+    POOL_PRE_PING: bool = True
+    # Connections opened at startup; defaults to POOL_SIZE
+    POOL_WARMUP: Optional[int] = None
+    # Server-side limit for every statement, in milliseconds
+    STATEMENT_TIMEOUT_MS: Optional[int] = None
+    # Full SQLAlchemy URLs of read replicas serving the GET endpoints
+    POSTGRES_REPLICA_URLS: list[str] = []
+    # Replicas further behind than this, in seconds, are skipped
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    REPLICA_CHECK_SECONDS: float = 5.0
+
     model_config = _base_config
 
     @property
@@ -32,5 +59,105 @@ class DatabaseSettings(BaseSettings):
             f"@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         )
 
+    @property
+    def engine_options(self) -> dict:
+        """Keyword arguments configuring the engine's pool and connections."""
+        server_settings = {}
+        if self.STATEMENT_TIMEOUT_MS is not None:
+            server_settings["statement_timeout"] = str(self.STATEMENT_TIMEOUT_MS)
+        return {
+            "pool_size": self.POOL_SIZE,
+            "max_overflow": self.POOL_MAX_OVERFLOW,
+            "pool_timeout": self.POOL_TIMEOUT,
+            "pool_recycle": self.POOL_RECYCLE,
+            "pool_pre_ping": self.POOL_PRE_PING,
+            "connect_args": {"server_settings": server_settings},
+        }
+
+
+class CacheSettings(BaseSettings):
+    """Settings for the in-process read-through cache of GET responses."""
+
+    READ_CACHE_ENABLED: bool = True
+    READ_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    READ_CACHE_MAX_ENTRIES: int = 10_000
+    # Cache detail responses as serialized JSON and send the bytes as they are
+    DETAIL_BYTES_CACHE_ENABLED: bool = True
+    # Serve relation lookups and traversals from an in-memory adjacency index
+    ADJACENCY_INDEX_ENABLED: bool = True
+    # Hold every row in the index too and answer all reads from memory
+    READ_SNAPSHOT_ENABLED: bool = False
+    # Fallback check for dataset version notifications missed while reconnecting
+    DATASET_VERSION_POLL_SECONDS: float = 5.0
+    # Cache-Control sent by read routes, overridable per route path
+    HTTP_CACHE_CONTROL: str = "public, max-age=0, must-revalidate"
+    HTTP_CACHE_CONTROL_ROUTES: dict[str, str] = {}
+
+    model_config = _base_config
+
+
+class ApiSettings(BaseSettings):
+    """Settings for encoding API responses."""
+
+    # `native` encodes with pydantic-core, `stdlib` with FastAPI's encoder
+    JSON_RESPONSE_CLASS: Literal["native", "stdlib"] = "native"
+    # Pages and batches of at least this many items are streamed; 0 disables.
+    # One stream chunk, so pages of up to half the largest limit are encoded
+    # whole and larger ones streamed
+    JSON_STREAM_MIN_ITEMS: int = 50
+
+    model_config = _base_config
+
+
+class MetricsSettings(BaseSettings):
+    """Settings for request metrics served on /metrics."""
+
+    METRICS_ENABLED: bool = True
+    # Directory shared by the workers of one server so /metrics covers all of
+    # them. Unset, each worker reports only itself
+    METRICS_DIR: Optional[Path] = Path(tempfile.gettempdir()) / "starwars-metrics"
+    # Seconds between writes of a worker's values to METRICS_DIR
+    METRICS_WRITE_SECONDS: float = 1.0
+
+    model_config = _base_config
+
+
+@cache
+def get_db_settings() -> DatabaseSettings:
+    """Read the database settings once, on first use."""
+    return DatabaseSettings()
+
+
+@cache
+def get_cache_settings() -> CacheSettings:
+    """Read the cache settings once, on first use."""
+    return CacheSettings()
+
+
+@cache
+def get_api_settings() -> ApiSettings:
+    """Read the API settings once, on first use."""
+    return ApiSettings()
+
+
+@cache
+def get_metrics_settings() -> MetricsSettings:
+    """Read the metrics settings once, on first use."""
+    return MetricsSettings()
+
+
+# Settings are resolved when first imported or accessed rather than when
+# this module loads, so importing its constants does not read `.env`
+_SETTINGS = {
+    "db_settings": get_db_settings,
+    "cache_settings": get_cache_settings,
+    "api_settings": get_api_settings,
+    "metrics_settings": get_metrics_settings,
+}
+
 
-db_settings = DatabaseSettings()
+def __getattr__(name: str):
+    """Resolve the module-level settings objects lazily."""
+    if name in _SETTINGS:
+        return _SETTINGS[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
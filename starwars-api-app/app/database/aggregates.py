@@ -0,0 +1,81 @@
+import json
+from uuid import UUID
+
+from sqlalchemy import any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ColumnElement
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.sql.visitors import InternalTraversal
+from sqlalchemy.types import Boolean, String, TypeDecorator
+
+
+class IdList(TypeDecorator):
+    """Result type of `id_array`, normalized to a list of UUIDs."""
+
+    impl = String
+    cache_ok = True
+
+    def process_result_value(self, value, dialect):
+        """Accept a driver array or, on SQLite, a JSON array of hex strings."""
+        if value is None:
+            return []
+        if isinstance(value, str):
+            value = json.loads(value)
+        return [v if isinstance(v, UUID) else UUID(v) for v in value if v is not None]
+
+
+class id_array(FunctionElement):
+    """Aggregate a UUID column into one sorted array per group."""
+
+    type = IdList()
+    name = "id_array"
+    inherit_cache = True
+
+
+@compiles(id_array)
+def _compile_id_array(element, compiler, **kw):
+    """Render `array_agg` ordered by the aggregated column."""
+    column = compiler.process(element.clauses, **kw)
+    return f"array_agg({column} ORDER BY {column})"
+
+
+@compiles(id_array, "sqlite")
+def _compile_id_array_sqlite(element, compiler, **kw):
+    """Render SQLite's JSON aggregate, used by the test suite."""
+    return f"json_group_array({compiler.process(element.clauses, **kw)})"
+
+
+class id_in(ColumnElement):
+    """`column = ANY(:ids)`, binding all ids as a single array parameter.
+
+    The ids are the only bound value of the construct, so statements using it
+    share one cache key, and one compiled statement, for any number of ids.
+    """
+
+    type = Boolean()
+    inherit_cache = True
+    _traverse_internals = [
+        ("column", InternalTraversal.dp_clauseelement),
+        ("ids", InternalTraversal.dp_clauseelement),
+    ]
+
+    def __init__(self, column, ids):
+        self.column = column
+        self.ids = bindparam(None, list(ids), type_=ARRAY(column.type))
+
+
+@compiles(id_in)
+def _compile_id_in(element, compiler, **kw):
+    """Render `= ANY` over the array parameter."""
+    return compiler.process(element.column == any_(element.ids), **kw)
+
+
+@compiles(id_in, "sqlite")
+def _compile_id_in_sqlite(element, compiler, **kw):
+    """Render an expanding `IN` over the same parameter, used by the test
+    suite."""
+    ids = element.ids._clone()
+    ids.expanding = True
+    ids.type = element.column.type
+    return compiler.process(element.column.in_(ids), **kw)
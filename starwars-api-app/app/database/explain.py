@@ -0,0 +1,17 @@
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+
+class Explain(Executable, ClauseElement):
+    """`EXPLAIN (FORMAT JSON)` of a statement, keeping its bound parameters."""
+
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kw):
+    """Render the PostgreSQL EXPLAIN prefix ahead of the compiled statement."""
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
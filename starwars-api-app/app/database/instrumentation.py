@@ -0,0 +1,31 @@
+from time import perf_counter
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from ..metrics import current_request
+
+
+def instrument_statements():
+    """Count statements and their execution time into the metrics of the
+    request that issued them.
+
+    Listens on every engine, including the async engines' synchronous cores
+    and replica engines. Statements run outside a request are not recorded.
+    """
+    if not event.contains(Engine, "before_cursor_execute", _before_execute):
+        event.listen(Engine, "before_cursor_execute", _before_execute)
+        event.listen(Engine, "after_cursor_execute", _after_execute)
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    # Per execution, so nothing is left behind when a statement fails
+    if context is not None:
+        context._statement_start = perf_counter()
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    metrics = current_request.get()
+    if metrics is not None and context is not None:
+        metrics.statements += 1
+        metrics.db_seconds += perf_counter() - context._statement_start
@@ -2,7 +2,16 @@ from datetime import datetime
 from typing import List, Optional
 from uuid import UUID, uuid4
 
-from sqlmodel import BigInteger, Column, Field, Relationship, SQLModel
+from sqlmodel import (
+    JSON,
+    BigInteger,
+    Column,
+    DateTime,
+    Field,
+    Index,
+    Relationship,
+    SQLModel,
+)
 
 
 class FilmCharacterLink(SQLModel, table=True):
@@ -17,6 +26,7 @@ class FilmCharacterLink(SQLModel, table=True):
         default_factory=uuid4,
         foreign_key="character.id",
         primary_key=True,
+        index=True,
     )
 
 
@@ -32,6 +42,7 @@ class FilmStarshipLink(SQLModel, table=True):
         default_factory=uuid4,
         foreign_key="starship.id",
         primary_key=True,
+        index=True,
     )
 
 
@@ -47,12 +58,29 @@ class StarshipPilotLink(SQLModel, table=True):
         default_factory=uuid4,
         foreign_key="character.id",
         primary_key=True,
+        index=True,
     )
 
 
+# Relationships never load implicitly: a query that needs related objects
+# declares its loader options, e.g. `selectinload(Film.characters)`. Touching
+# an unloaded relationship raises instead of cascading through the graph.
+
+
 class Character(SQLModel, table=True):
     """Database model for Star Wars characters."""
 
+    # Keyset pagination seeks on (name, id); substring filters use trigrams
+    __table_args__ = (
+        Index("ix_character_name_id", "name", "id"),
+        Index(
+            "ix_character_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
+
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     name: str
     height: Optional[int] = None
@@ -62,23 +90,34 @@ class Character(SQLModel, table=True):
     eye_color: str
     gender: str
     birth_year: str
-    swapi_url: str
+    swapi_url: str = Field(unique=True, index=True)
 
     films: List["Film"] = Relationship(
         back_populates="characters",
         link_model=FilmCharacterLink,
-        sa_relationship_kwargs={"lazy": "selectin"},
+        sa_relationship_kwargs={"lazy": "raise"},
     )
     starships: List["Starship"] = Relationship(
         back_populates="pilots",
         link_model=StarshipPilotLink,
-        sa_relationship_kwargs={"lazy": "selectin"},
+        sa_relationship_kwargs={"lazy": "raise"},
     )
 
 
 class Starship(SQLModel, table=True):
     """Database model for Star Wars starships."""
 
+    # Keyset pagination seeks on (name, id); substring filters use trigrams
+    __table_args__ = (
+        Index("ix_starship_name_id", "name", "id"),
+        Index(
+            "ix_starship_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
+
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     name: str
     model: str
@@ -93,23 +132,34 @@ class Starship(SQLModel, table=True):
     hyperdrive_rating: Optional[float] = None
     MGLT: Optional[int] = None
     starship_class: str
-    swapi_url: str
+    swapi_url: str = Field(unique=True, index=True)
 
     films: List["Film"] = Relationship(
         back_populates="starships",
         link_model=FilmStarshipLink,
-        sa_relationship_kwargs={"lazy": "selectin"},
+        sa_relationship_kwargs={"lazy": "raise"},
     )
     pilots: List[Character] = Relationship(
         back_populates="starships",
         link_model=StarshipPilotLink,
-        sa_relationship_kwargs={"lazy": "selectin"},
+        sa_relationship_kwargs={"lazy": "raise"},
     )
 
 
 class Film(SQLModel, table=True):
     """Database model for Star Wars films."""
 
+    # Keyset pagination seeks on (title, id); substring filters use trigrams
+    __table_args__ = (
+        Index("ix_film_title_id", "title", "id"),
+        Index(
+            "ix_film_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
+
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     title: str
     episode_id: int
@@ -117,15 +167,46 @@ class Film(SQLModel, table=True):
     director: str
     producer: str
     release_date: datetime
-    swapi_url: str
+    swapi_url: str = Field(unique=True, index=True)
 
     characters: List[Character] = Relationship(
         back_populates="films",
         link_model=FilmCharacterLink,
-        sa_relationship_kwargs={"lazy": "selectin"},
+        sa_relationship_kwargs={"lazy": "raise"},
     )
     starships: List[Starship] = Relationship(
         back_populates="films",
         link_model=FilmStarshipLink,
-        sa_relationship_kwargs={"lazy": "selectin"},
+        sa_relationship_kwargs={"lazy": "raise"},
+    )
+
+
+class SyncJob(SQLModel, table=True):
+    """Database model tracking background SWAPI sync runs across workers."""
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    status: str = Field(index=True)
+    phase: Optional[str] = None
+    mode: str
+    engine: str
+    chunk_size: int
+    progress: dict = Field(default_factory=dict, sa_column=Column(JSON))
+    result: Optional[dict] = Field(default=None, sa_column=Column(JSON))
+    error: Optional[str] = None
+    created_at: datetime = Field(sa_column=Column(DateTime(timezone=True)))
+    started_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True))
+    )
+    finished_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True))
+    )
+
+
+class DatasetVersion(SQLModel, table=True):
+    """Single-row stamp bumped in every sync transaction that changes data."""
+
+    id: int = Field(default=1, primary_key=True)
+    version: int = Field(default=0, sa_column=Column(BigInteger, nullable=False))
+    updated_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True))
     )
@@ -0,0 +1,67 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import exc, text
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PoolWaitStats:
+    """Time spent checking connections out of a pool."""
+
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+
+class PoolTimingMixin:
+    """Record how long each checkout waits for a connection.
+
+    The wait covers queueing for a free connection, opening a new one within
+    the overflow and the pre-ping, so it is what a request actually pays
+    before its first statement.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.wait_stats.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            stats = self.wait_stats
+            stats.checkouts += 1
+            stats.wait_seconds_total += waited
+            stats.wait_seconds_max = max(stats.wait_seconds_max, waited)
+
+
+class TimedAsyncQueuePool(PoolTimingMixin, AsyncAdaptedQueuePool):
+    """Queue pool of the async engine, with checkout wait statistics."""
+
+
+async def warm_up_pool(engine, connections: int):
+    """Open up to `connections` pooled connections concurrently, so the first
+    requests after startup do not pay for connecting.
+
+    Failures are logged rather than raised; the pool connects on demand.
+    """
+
+    async def ping():
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    try:
+        await asyncio.gather(*(ping() for _ in range(connections)))
+    except Exception:
+        logger.exception("Could not warm up the connection pool")
@@ -0,0 +1,20 @@
+from sqlalchemy import inspect
+
+
+def link_columns(model) -> list[tuple]:
+    """Return `(relationship, owner column, target column)` for each of the
+    model's many-to-many relationships, as columns of the link table."""
+    return [
+        (
+            relationship.key,
+            relationship.synchronize_pairs[0][1],
+            relationship.secondary_synchronize_pairs[0][1],
+        )
+        for relationship in inspect(model).relationships
+        if relationship.secondary is not None
+    ]
+
+
+def related_model(model, key: str):
+    """Return the model class on the other side of relationship `key`."""
+    return inspect(model).relationships[key].mapper.class_
@@ -0,0 +1,123 @@
+import asyncio
+import itertools
+import logging
+from typing import Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# Replay lag in seconds, zero once everything received has been replayed, and
+# the dataset version the replica has reached
+REPLICA_STATUS = text(
+    """
+    SELECT
+        CASE
+            WHEN NOT pg_is_in_recovery()
+                OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn()
+            THEN 0
+            ELSE extract(epoch FROM now() - pg_last_xact_replay_timestamp())
+        END AS lag,
+        (SELECT version FROM datasetversion WHERE id = 1) AS version
+    """
+)
+
+
+class Replica:
+    """A read replica and what its last health check found."""
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.healthy = False
+        self.lag_seconds: Optional[float] = None
+        self.dataset_version: Optional[int] = None
+
+    @property
+    def name(self) -> str:
+        """The replica's URL without the password."""
+        return self.engine.url.render_as_string(hide_password=True)
+
+
+class ReplicaRouter:
+    """Choose the engine read sessions are bound to.
+
+    Replicas take turns, skipping any that failed their last health check,
+    lag more than `max_lag` seconds behind the primary, or have not yet
+    replayed the dataset version this worker serves. With no replica fit,
+    reads go to the primary. Replicas start unhealthy until first checked.
+    """
+
+    def __init__(
+        self,
+        primary: AsyncEngine,
+        replicas: Sequence[AsyncEngine] = (),
+        max_lag: float = 5.0,
+        check_interval: float = 5.0,
+    ):
+        self.primary = primary
+        self.replicas = [Replica(engine) for engine in replicas]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._turns = itertools.cycle(self.replicas)
+        self._task: Optional[asyncio.Task] = None
+
+    def engine(self, version: Optional[int] = None) -> AsyncEngine:
+        """Return the next replica fit to serve dataset `version`, or the
+        primary."""
+        for _ in range(len(self.replicas)):
+            replica = next(self._turns)
+            if self._serves(replica, version):
+                return replica.engine
+        return self.primary
+
+    async def check(self):
+        """Probe every replica for reachability, lag and dataset version."""
+        await asyncio.gather(*(self._check(replica) for replica in self.replicas))
+
+    def start(self):
+        """Check replicas in the background of the running event loop."""
+        if self.replicas:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop checking and close the replica pools."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    def _serves(self, replica: Replica, version: Optional[int]) -> bool:
+        """Whether `replica` may serve a read of dataset `version`."""
+        if not replica.healthy or replica.lag_seconds > self.max_lag:
+            return False
+        if version is None or replica.dataset_version is None:
+            return True
+        return replica.dataset_version >= version
+
+    async def _check(self, replica: Replica):
+        """Probe one replica, marking it unhealthy on any failure."""
+        try:
+            async with replica.engine.connect() as connection:
+                result = await connection.execute(REPLICA_STATUS)
+                lag, version = result.one()
+        except Exception as error:
+            if replica.healthy:
+                logger.warning("Replica %s failed its check: %s", replica.name, error)
+            replica.healthy = False
+            return
+        replica.healthy = True
+        # No replayed transaction to measure from yet
+        replica.lag_seconds = float("inf") if lag is None else float(lag)
+        replica.dataset_version = version
+
+    async def _run(self):
+        """Check replicas every `check_interval` seconds."""
+        while True:
+            await self.check()
+            await asyncio.sleep(self.check_interval)
@@ -1,22 +1,59 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from functools import cache
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
-from ..config import db_settings
+from ..config import get_db_settings
+from .instrumentation import instrument_statements
+from .pool import TimedAsyncQueuePool
+from .replicas import ReplicaRouter
+
+# Statements are counted into the metrics of the request or sync running them
+instrument_statements()
+
+
+@cache
+def get_engine() -> AsyncEngine:
+    """Create the engine of the primary database on first use."""
+    db_settings = get_db_settings()
+    return create_async_engine(
+        url=db_settings.POSTGRES_URL,
+        echo=False,
+        poolclass=TimedAsyncQueuePool,
+        **db_settings.engine_options,
+    )
+
 
-# Create a database engine to connect with database
-engine = create_async_engine(
-    url=db_settings.POSTGRES_URL,
-    echo=False,
+@cache
+def get_replica_router() -> ReplicaRouter:
+    """Create the router sending reads to a replica when one is configured,
+    fit and caught up."""
+    db_settings = get_db_settings()
+    return ReplicaRouter(
+        get_engine(),
+        [
+            create_async_engine(
+                url=url,
+                echo=False,
+                poolclass=TimedAsyncQueuePool,
+                **db_settings.engine_options,
+            )
+            for url in db_settings.POSTGRES_REPLICA_URLS
+        ],
+        max_lag=db_settings.REPLICA_MAX_LAG_SECONDS,
+        check_interval=db_settings.REPLICA_CHECK_SECONDS,
+    )
+
+
+# Session factory shared by request dependencies and background jobs; each
+# use binds it to the primary or a replica
+async_session = sessionmaker(
+    class_=AsyncSession,
+    expire_on_commit=False,
 )
 
 
 async def get_session():
     """Yield an async database session for dependency injection."""
-    async_session = sessionmaker(
-        bind=engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
-    )
-
-    async with async_session() as session:
+    async with async_session(bind=get_engine()) as session:
         yield session
@@ -26,6 +26,36 @@ class NotFoundError(BaseError):
     status = status.HTTP_404_NOT_FOUND
 
 
+class InvalidCursorError(BaseError):
+    """Pagination cursor is malformed or expired"""
+
+    status = status.HTTP_400_BAD_REQUEST
+
+
+class InvalidFieldError(BaseError):
+    """Requested field or relation does not exist"""
+
+    status = status.HTTP_400_BAD_REQUEST
+
+
+class InvalidBatchError(BaseError):
+    """Batch ids are malformed or too many"""
+
+    status = status.HTTP_400_BAD_REQUEST
+
+
+class InvalidPathError(BaseError):
+    """Traversal path is unknown or too deep"""
+
+    status = status.HTTP_400_BAD_REQUEST
+
+
+class SyncConflictError(BaseError):
+    """A SWAPI sync is already running"""
+
+    status = status.HTTP_409_CONFLICT
+
+
 class DatabaseError(BaseError):
     """Database operation failed"""
 
@@ -1,23 +1,76 @@
-from fastapi import FastAPI
-from scalar_fastapi import get_scalar_api_reference
+from contextlib import asynccontextmanager
 
+from fastapi import FastAPI, Response
+
+from .api.middleware import MetricsMiddleware
+from .api.responses import ConfiguredJSONResponse
 from .api.router import router
+from .config import get_cache_settings, get_db_settings, get_metrics_settings
+from .database.pool import warm_up_pool
+from .database.session import get_engine, get_replica_router
 from .exceptions import add_exception_handlers
+from .metrics import PROMETHEUS_CONTENT_TYPE, registry
+from .services.cache import read_cache
+from .services.dataset_version import DatasetVersionWatcher
+from .services.graph import adjacency_index
+from .services.snapshot import build_dataset_snapshot
 
 description = """
 Star Wars API is a simple API for managing the Star Wars universe.
 """
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Apply the settings, open pooled connections, watch read replicas, share
+    metrics, and keep the read cache and adjacency index coherent with syncs
+    run by other workers."""
+    db_settings = get_db_settings()
+    cache_settings = get_cache_settings()
+    metrics_settings = get_metrics_settings()
+    engine, replica_router = get_engine(), get_replica_router()
+    read_cache.configure(cache_settings)
+    adjacency_index.enabled = cache_settings.ADJACENCY_INDEX_ENABLED
+    if metrics_settings.METRICS_DIR is not None:
+        registry.start(
+            metrics_settings.METRICS_DIR, metrics_settings.METRICS_WRITE_SECONDS
+        )
+    warmup = db_settings.POOL_WARMUP
+    await warm_up_pool(engine, db_settings.POOL_SIZE if warmup is None else warmup)
+    if cache_settings.READ_SNAPSHOT_ENABLED:
+        adjacency_index.enabled = True
+        adjacency_index.build = build_dataset_snapshot
+    # Every new dataset version, including the first one seen, rebuilds the index
+    read_cache.version_listeners.append(adjacency_index.schedule)
+    watcher = DatasetVersionWatcher(
+        engine,
+        read_cache,
+        poll_interval=cache_settings.DATASET_VERSION_POLL_SECONDS,
+    )
+    watcher.start()
+    replica_router.start()
+    yield
+    await replica_router.stop()
+    await watcher.stop()
+    read_cache.version_listeners.remove(adjacency_index.schedule)
+    await adjacency_index.stop()
+    if metrics_settings.METRICS_DIR is not None:
+        await registry.stop()
+
+
 app = FastAPI(
     title="Star Wars API",
     description=description,
     docs_url=None,
     redoc_url=None,
     version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ConfiguredJSONResponse,
 )
 
 app.include_router(router)
 add_exception_handlers(app)
+app.add_middleware(MetricsMiddleware)
 
 
 @app.get("/")
@@ -29,7 +82,16 @@ async def root() -> dict:
 @app.get("/docs", include_in_schema=False)
 async def scalar_docs():
     """Serve Scalar API documentation dynamically."""
+    # Loaded on the first docs request rather than at startup
+    from scalar_fastapi import get_scalar_api_reference
+
     return get_scalar_api_reference(
         openapi_url=app.openapi_url,
         title=app.title,
     )
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Serve request metrics of every worker in Prometheus text format."""
+    return Response(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
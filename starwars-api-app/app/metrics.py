@@ -0,0 +1,406 @@
+import asyncio
+import json
+import logging
+import math
+import os
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Iterator, Optional, Sequence
+from uuid import uuid4
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds of the default histogram buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SERIALIZATION_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+SYNC_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+
+class Metric:
+    """A named metric family holding one value per combination of labels."""
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.values: dict[tuple, Any] = {}
+
+    def _key(self, labels: dict) -> tuple:
+        """Return the label values of a sample in declaration order."""
+        return tuple(str(labels[label]) for label in self.labels)
+
+    def _format_labels(self, key: tuple, *extra: tuple[str, str]) -> str:
+        pairs = [*zip(self.labels, key), *extra]
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+class Counter(Metric):
+    """Monotonic total, such as a number of events or bytes."""
+
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    @staticmethod
+    def merge(a, b):
+        return a + b
+
+    def samples(self, key: tuple, value) -> Iterator[str]:
+        yield f"{self.name}{self._format_labels(key)} {_number(value)}"
+
+
+class Histogram(Metric):
+    """Distribution of observed values over fixed buckets, with their sum and
+    count.
+
+    Each sample holds per-bucket counts, not cumulative ones, so samples
+    from several workers merge by adding them up.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = (*sorted(buckets), math.inf)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        sample = self.values.get(key)
+        if sample is None:
+            sample = self.values[key] = [[0] * len(self.buckets), 0.0, 0]
+        sample[0][bisect_left(self.buckets, value)] += 1
+        sample[1] += value
+        sample[2] += 1
+
+    @staticmethod
+    def merge(a, b):
+        return [[x + y for x, y in zip(a[0], b[0])], a[1] + b[1], a[2] + b[2]]
+
+    def samples(self, key: tuple, value) -> Iterator[str]:
+        counts, total, count = value
+        cumulative = 0
+        for bound, bucket in zip(self.buckets, counts):
+            cumulative += bucket
+            le = self._format_labels(key, ("le", _number(bound)))
+            yield f"{self.name}_bucket{le} {cumulative}"
+        yield f"{self.name}_sum{self._format_labels(key)} {_number(total)}"
+        yield f"{self.name}_count{self._format_labels(key)} {count}"
+
+
+class MetricsRegistry:
+    """Metrics of this worker, rendered in the Prometheus text format.
+
+    Under several worker processes each one writes its values to its own file
+    in a shared directory every `interval` seconds, and rendering adds up the
+    files of the other workers with this worker's live values. A stopping
+    worker folds its values into the directory's retired totals and removes
+    its file, and a starting worker does the same for files of workers that
+    died without stopping, so totals never go backwards and the directory
+    holds one file per live worker.
+    """
+
+    def __init__(self):
+        self.metrics: dict[str, Metric] = {}
+        self.directory: Optional[Path] = None
+        self._path: Optional[Path] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def counter(self, name: str, documentation: str, labels=()) -> Counter:
+        return self._register(Counter(name, documentation, labels))
+
+    def histogram(
+        self, name: str, documentation: str, labels=(), buckets=LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labels, buckets))
+
+    def collect(self) -> dict[str, dict[tuple, Any]]:
+        """Return the values of every metric, summed across workers."""
+        merged = {name: dict(metric.values) for name, metric in self.metrics.items()}
+        if self.directory is None:
+            return merged
+        # Shared, so a worker retiring cannot be counted twice or not at all
+        with self._locked(shared=True):
+            for path in [self._retired_path, *self._worker_files()]:
+                self._merge(merged, _read_state(path))
+        return merged
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        lines = []
+        for name, values in self.collect().items():
+            metric = self.metrics[name]
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.type}")
+            for key in sorted(values):
+                lines.extend(metric.samples(key, values[key]))
+        return "\n".join(lines) + "\n"
+
+    def write(self):
+        """Write this worker's values to its file, replacing it atomically."""
+        if self._path is None:
+            return
+        state = {name: metric.values for name, metric in self.metrics.items()}
+        _write_state(self._path, state)
+
+    def start(self, directory: Path, interval: float = 1.0):
+        """Share this worker's values through `directory` every `interval`
+        seconds, in the background of the running event loop."""
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._path = self.directory / f"worker-{os.getpid()}-{uuid4().hex[:8]}.json"
+        self._retire([p for p in self._worker_files() if not _worker_alive(p)])
+        self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self):
+        """Stop sharing, folding the final values of this worker into the
+        retired totals."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.directory is None:
+            return
+        self.write()
+        self._retire([self._path])
+        self.directory = self._path = None
+
+    def _register(self, metric: Metric) -> Metric:
+        self.metrics[metric.name] = metric
+        return metric
+
+    @property
+    def _retired_path(self) -> Path:
+        return self.directory / "retired.json"
+
+    def _worker_files(self) -> list[Path]:
+        """Files written by the other workers."""
+        if self.directory is None:
+            return []
+        return [p for p in self.directory.glob("worker-*.json") if p != self._path]
+
+    def _merge(self, merged: dict[str, dict[tuple, Any]], state: dict):
+        """Add the samples of a worker file into `merged`."""
+        for name, samples in state.items():
+            metric = self.metrics.get(name)
+            if metric is None:
+                continue
+            values = merged.setdefault(name, {})
+            for key, value in samples:
+                key = tuple(key)
+                values[key] = (
+                    metric.merge(values[key], value) if key in values else value
+                )
+
+    def _retire(self, paths: list[Path]):
+        """Fold worker files into the retired totals and remove them."""
+        if not paths:
+            return
+        with self._locked(shared=False):
+            retired: dict[str, dict[tuple, Any]] = {}
+            # A file already retired by another worker reads as empty
+            for path in [self._retired_path, *paths]:
+                self._merge(retired, _read_state(path))
+            _write_state(self._retired_path, retired)
+            for path in paths:
+                path.unlink(missing_ok=True)
+
+    @contextmanager
+    def _locked(self, shared: bool):
+        """Hold the directory's lock while reading or retiring worker files."""
+        if fcntl is None:
+            yield
+            return
+        with open(self.directory / ".lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    async def _run(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.write()
+            except OSError:
+                logger.exception("Could not write metrics to %s", self._path)
+
+
+@dataclass
+class RequestMetrics:
+    """Work done while serving one request."""
+
+    statements: int = 0
+    db_seconds: float = 0.0
+    serialization_seconds: float = 0.0
+
+
+# Metrics of the request being served, set by the metrics middleware
+current_request: ContextVar[Optional[RequestMetrics]] = ContextVar(
+    "current_request", default=None
+)
+
+
+@contextmanager
+def serializing():
+    """Add the time spent in the block to the current request's serialization
+    time."""
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        metrics = current_request.get()
+        if metrics is not None:
+            metrics.serialization_seconds += perf_counter() - start
+
+
+registry = MetricsRegistry()
+
+request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "Time to serve a request, until its last body chunk is sent.",
+    ["method", "route", "status"],
+)
+request_statements = registry.histogram(
+    "http_request_db_statements",
+    "SQL statements executed per request.",
+    ["method", "route"],
+    buckets=STATEMENT_BUCKETS,
+)
+request_db_time = registry.histogram(
+    "http_request_db_seconds",
+    "Time spent executing SQL statements per request.",
+    ["method", "route"],
+)
+request_serialization_time = registry.histogram(
+    "http_request_serialization_seconds",
+    "Time spent encoding JSON per request.",
+    ["method", "route"],
+    buckets=SERIALIZATION_BUCKETS,
+)
+response_size = registry.histogram(
+    "http_response_size_bytes",
+    "Size of response bodies.",
+    ["method", "route"],
+    buckets=SIZE_BUCKETS,
+)
+
+
+# Sync metrics live here rather than with the lazily imported sync, so every
+# worker knows them when summing the files of the others
+sync_duration = registry.histogram(
+    "sync_duration_seconds",
+    "Duration of successful SWAPI syncs.",
+    ["mode", "engine"],
+    buckets=SYNC_BUCKETS,
+)
+sync_phase_time = registry.histogram(
+    "sync_phase_seconds",
+    "Time spent per phase of successful SWAPI syncs.",
+    ["mode", "phase"],
+    buckets=SYNC_BUCKETS,
+)
+sync_records = registry.counter(
+    "sync_records_total", "Records synced from SWAPI.", ["entity"]
+)
+sync_bytes_fetched = registry.counter(
+    "sync_fetched_bytes_total", "Bytes downloaded from SWAPI by syncs."
+)
+sync_statements = registry.counter(
+    "sync_statements_total", "SQL statements executed by syncs."
+)
+sync_rows_written = registry.counter(
+    "sync_rows_written_total",
+    "Rows inserted, updated or deleted by syncs.",
+    ["table"],
+)
+
+
+def observe_request(
+    method: str,
+    route: str,
+    status: int,
+    seconds: float,
+    size: int,
+    metrics: RequestMetrics,
+):
+    """Record one served request."""
+    request_duration.observe(seconds, method=method, route=route, status=status)
+    request_statements.observe(metrics.statements, method=method, route=route)
+    request_db_time.observe(metrics.db_seconds, method=method, route=route)
+    request_serialization_time.observe(
+        metrics.serialization_seconds, method=method, route=route
+    )
+    response_size.observe(size, method=method, route=route)
+
+
+def _read_state(path: Path) -> dict:
+    """Read a worker or retired file, empty if it is missing or unreadable."""
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        # Removed, or being replaced, since listed
+        return {}
+
+
+def _write_state(path: Path, state: dict[str, dict[tuple, Any]]):
+    """Write metric values to `path`, replacing it atomically."""
+    samples = {
+        name: [[key, value] for key, value in values.items()]
+        for name, values in state.items()
+    }
+    temporary = path.with_suffix(".tmp")
+    temporary.write_text(json.dumps(samples))
+    os.replace(temporary, path)
+
+
+def _worker_alive(path: Path) -> bool:
+    """Whether the process that wrote a worker file is still running."""
+    try:
+        os.kill(int(path.name.split("-")[1]), 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, ValueError, IndexError):
+        pass
+    return True
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _number(value: float) -> str:
+    """Format a sample value or bucket bound as Prometheus expects."""
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
@@ -0,0 +1,128 @@
+import sys
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Hashable, Optional
+
+from pydantic import BaseModel
+
+from ..config import CacheSettings
+
+
+@dataclass
+class CacheStats:
+    """Counters describing how a read cache is performing."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+class ReadCache:
+    """LRU cache of read results bounded by entry count and estimated memory.
+
+    Every invalidation starts a new generation. Values loaded during an older
+    generation are refused by `put`, so a read that raced with a sync can never
+    repopulate the cache with pre-sync data. `version` and `updated_at` describe
+    the last dataset version this cache was reconciled with.
+    """
+
+    def __init__(self, max_bytes: int, max_entries: int, enabled: bool = True):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.generation = 0
+        self.version: Optional[int] = None
+        self.updated_at: Optional[datetime] = None
+        self.size_bytes = 0
+        self.stats = CacheStats()
+        # Called with each new dataset version this cache observes
+        self.version_listeners: list[Callable[[int], None]] = []
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for `key` and mark it recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return entry[0]
+
+    def put(self, key: Hashable, value: Any, generation: int):
+        """Store `value` loaded during `generation`, evicting the least recent."""
+        if not self.enabled or generation != self.generation:
+            return
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        self._discard(key)
+        self._entries[key] = (value, size)
+        self.size_bytes += size
+        while self.size_bytes > self.max_bytes or len(self) > self.max_entries:
+            self._discard(next(iter(self._entries)))
+            self.stats.evictions += 1
+
+    def configure(self, settings: CacheSettings):
+        """Apply the limits and switch of `settings`, dropping every entry."""
+        self.max_bytes = settings.READ_CACHE_MAX_BYTES
+        self.max_entries = settings.READ_CACHE_MAX_ENTRIES
+        self.enabled = settings.READ_CACHE_ENABLED
+        self.generation += 1
+        self._entries = OrderedDict()
+        self.size_bytes = 0
+
+    def invalidate(self):
+        """Drop every entry and reject values loaded before this call."""
+        self.generation += 1
+        self._entries = OrderedDict()
+        self.size_bytes = 0
+        self.stats.invalidations += 1
+
+    def observe_version(self, version: int, updated_at: Optional[datetime] = None):
+        """Invalidate when the dataset version is newer than the one last seen.
+
+        Older versions, from a late notification or a slow poll, are ignored
+        so the cache, ETags and adjacency index never move back a generation.
+        """
+        if self.version is not None and version < self.version:
+            return
+        if version == self.version:
+            self.updated_at = self.updated_at or updated_at
+            return
+        self.version = version
+        self.updated_at = updated_at
+        self.invalidate()
+        for listener in self.version_listeners:
+            listener(version)
+
+    def _discard(self, key: Hashable):
+        """Remove `key` if present and release its accounted size."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size_bytes -= entry[1]
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate the memory held by a value built from models and containers."""
+    size = sys.getsizeof(value)
+    if isinstance(value, BaseModel):
+        size += estimate_size(value.__dict__)
+    elif isinstance(value, dict):
+        size += sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set)):
+        size += sum(estimate_size(item) for item in value)
+    return size
+
+
+# Shared by every service instance in this worker process. Sized from the
+# settings' defaults, built without reading the environment, until startup
+# applies the configured settings
+read_cache = ReadCache(max_bytes=0, max_entries=0)
+read_cache.configure(CacheSettings.model_construct())
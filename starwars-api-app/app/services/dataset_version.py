@@ -0,0 +1,106 @@
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from ..database.models import DatasetVersion
+from .cache import ReadCache
+
+logger = logging.getLogger(__name__)
+
+# Channel notified by the `datasetversion_notify` trigger on every bump
+DATASET_VERSION_CHANNEL = "dataset_version"
+
+
+async def bump_dataset_version(session: AsyncSession) -> tuple[int, datetime]:
+    """Increment the dataset version inside the caller's transaction.
+
+    The row lock taken here serializes concurrent bumps, and the database
+    trigger sends the new version to listening workers once it commits.
+    Returns the new version and its timestamp.
+    """
+    result = await session.execute(
+        update(DatasetVersion)
+        .where(DatasetVersion.id == 1)
+        .values(version=DatasetVersion.version + 1, updated_at=func.now())
+        .returning(DatasetVersion.version, DatasetVersion.updated_at)
+    )
+    return tuple(result.one())
+
+
+async def get_dataset_version(connection: AsyncConnection) -> tuple[int, datetime]:
+    """Read the current dataset version and the time it was bumped."""
+    result = await connection.execute(
+        select(DatasetVersion.version, DatasetVersion.updated_at).where(
+            DatasetVersion.id == 1
+        )
+    )
+    return tuple(result.one())
+
+
+class DatasetVersionWatcher:
+    """Keep this worker's read cache in step with the shared dataset version.
+
+    Holds one pooled connection that LISTENs on the version channel, so a sync
+    committed by any worker invalidates the cache as soon as the notification
+    arrives. The version is also polled on that connection every
+    `poll_interval` seconds to recover from notifications lost to a reconnect.
+    """
+
+    def __init__(self, engine: AsyncEngine, cache: ReadCache, poll_interval: float):
+        self.engine = engine
+        self.cache = cache
+        self.poll_interval = poll_interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start watching in the background of the running event loop."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop watching and return the listening connection to the pool."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        """Listen and poll, reconnecting after any connection failure."""
+        while True:
+            try:
+                async with self.engine.connect() as connection:
+                    await self._watch(connection)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Dataset version watcher lost its connection")
+                await asyncio.sleep(self.poll_interval)
+
+    async def _watch(self, connection: AsyncConnection):
+        """Subscribe to version notifications and poll until cancelled."""
+        raw_connection = await connection.get_raw_connection()
+        driver = raw_connection.driver_connection
+        await driver.add_listener(DATASET_VERSION_CHANNEL, self._on_notify)
+        try:
+            while True:
+                self.cache.observe_version(*await get_dataset_version(connection))
+                # Notifications are only delivered outside a transaction
+                await connection.commit()
+                await asyncio.sleep(self.poll_interval)
+        finally:
+            await driver.remove_listener(DATASET_VERSION_CHANNEL, self._on_notify)
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str):
+        """Handle a version notification delivered by asyncpg."""
+        stamp = json.loads(payload)
+        self.cache.observe_version(
+            stamp["version"], datetime.fromisoformat(stamp["updated_at"])
+        )
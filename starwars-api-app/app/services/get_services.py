@@ -1,30 +1,187 @@
-from typing import Optional
+import base64
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Awaitable, Callable, Hashable, List, Optional, Sequence
 from uuid import UUID
 
+from pydantic import BaseModel, create_model
+from pydantic_core import to_json
+from sqlalchemy import tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import func, select
+from sqlmodel import func, literal, select
 
-from ..api.schemas import PaginatedResponse, T
+from ..api.schemas import (
+    BatchResponse,
+    CharacterRead,
+    CharacterSummary,
+    FilmRead,
+    FilmSummary,
+    PaginatedResponse,
+    RelationCountsRead,
+    StarshipRead,
+    StarshipSummary,
+    T,
+    TotalMode,
+    TraversalNode,
+    TraversalResponse,
+)
+from ..config import BATCH_MAX_IDS, TRAVERSAL_MAX_DEPTH
+from ..database.aggregates import id_array, id_in
+from ..database.explain import Explain
 from ..database.models import Character, Film, Starship
-from ..exceptions import NotFoundError, exception_handler
+from ..database.relations import link_columns, related_model
+from ..exceptions import (
+    InvalidBatchError,
+    InvalidCursorError,
+    InvalidFieldError,
+    InvalidPathError,
+    NotFoundError,
+    exception_handler,
+)
+from ..metrics import serializing
+from .cache import ReadCache, read_cache
+from .graph import AdjacencyIndex, AdjacencyIndexHolder, adjacency_index
+from .snapshot import DatasetSnapshot
+
+# Schema of the related objects inlined by `expand=`
+SUMMARY_SCHEMAS = {
+    Film: FilmSummary,
+    Character: CharacterSummary,
+    Starship: StarshipSummary,
+}
+
+
+@dataclass(frozen=True)
+class View:
+    """Fields selected by `fields=` and relations inlined by `expand=`."""
+
+    fields: tuple[str, ...]
+    expand: tuple[str, ...] = ()
 
 
 class GetService:
     """Generic service class for retrieving and paginating database entities."""
-    def __init__(self, model, session: AsyncSession, filter_field: str = "name"):
+    def __init__(
+        self,
+        model,
+        session: AsyncSession,
+        filter_field: str = "name",
+        read_schema=None,
+        cache: ReadCache = read_cache,
+        adjacency: Optional[AdjacencyIndexHolder] = adjacency_index,
+    ):
         self.model = model
         self.session = session
         self.filter_field = filter_field
+        # Results are cached only when they can be snapshotted into this schema
+        self.read_schema = read_schema
+        self.cache = cache
+        # Relation ids come from here instead of the link tables when current,
+        # and every read when it holds a full dataset snapshot
+        self.adjacency = adjacency
 
     @exception_handler()
-    async def get(self, id: UUID):
-        """Retrieve a single entity by its UUID or raise NotFoundError."""
-        entity = await self.session.get(self.model, id)
-        if not entity:
-            raise NotFoundError(
-                detail=f"{self.model.__name__} with id `{id}` not found",
-            )
-        return entity
+    async def get(
+        self,
+        id: UUID,
+        fields: Optional[Sequence[str]] = None,
+        expand: Optional[Sequence[str]] = None,
+    ):
+        """Retrieve a single entity by its UUID or raise NotFoundError.
+
+        `fields` and `expand` shape the result as described in `get_paginated`.
+        """
+        view = self._view(fields, expand)
+
+        async def load():
+            index = self._adjacency()
+            if isinstance(index, DatasetSnapshot):
+                row = index.row(self.model, id)
+            else:
+                table = self.model.__table__
+                projection = self._projection(table, view, index)
+                result = await self.session.execute(
+                    select(*projection).where(table.c.id == id)
+                )
+                row = result.first()
+            if not row:
+                raise NotFoundError(
+                    detail=f"{self.model.__name__} with id `{id}` not found",
+                )
+            expanded = await self._expand([row], view, index)
+            return self._to_read(row, view, expanded, index)
+
+        return await self._read_through(self._detail_key(id, view), load)
+
+    @exception_handler()
+    async def get_json(
+        self,
+        id: UUID,
+        fields: Optional[Sequence[str]] = None,
+        expand: Optional[Sequence[str]] = None,
+    ) -> bytes:
+        """Retrieve a single entity as `get` does, serialized to JSON.
+
+        The bytes are cached next to the model, so repeated reads skip both
+        validation and encoding until the next sync invalidates them.
+        """
+        view = self._view(fields, expand)
+
+        async def load():
+            entity = await self.get(id, fields=fields, expand=expand)
+            with serializing():
+                return to_json(entity)
+
+        return await self._read_through((*self._detail_key(id, view), "json"), load)
+
+    @exception_handler()
+    async def get_many(
+        self,
+        ids: Sequence,
+        fields: Optional[Sequence[str]] = None,
+        expand: Optional[Sequence[str]] = None,
+    ) -> BatchResponse[T]:
+        """Retrieve entities by id in request order with a single query.
+
+        `ids` may hold UUIDs or comma-separated strings. Ids without a row are
+        reported in `missing` instead of failing the batch. Entities already in
+        the read cache are taken from it and the rest are cached as details.
+        """
+        view = self._view(fields, expand)
+        ids = _parse_ids(ids)
+        found, pending = {}, []
+        for id in ids:
+            cached = None
+            if self._caching:
+                cached = self.cache.get(self._detail_key(id, view))
+            if cached is None:
+                pending.append(id)
+            else:
+                found[id] = cached
+
+        if pending:
+            generation = self.cache.generation
+            index = self._adjacency()
+            if isinstance(index, DatasetSnapshot):
+                rows = [index.row(self.model, id) for id in pending]
+                rows = [row for row in rows if row is not None]
+            else:
+                table = self.model.__table__
+                query = select(*self._projection(table, view, index))
+                result = await self.session.execute(
+                    query.where(id_in(table.c.id, pending))
+                )
+                rows = result.all()
+            expanded = await self._expand(rows, view, index)
+            for row in rows:
+                item = found[row.id] = self._to_read(row, view, expanded, index)
+                self._cache_put(self._detail_key(row.id, view), item, generation)
+
+        return BatchResponse[T](
+            items=[found[id] for id in ids if id in found],
+            missing=[id for id in ids if id not in found],
+        )
 
     @exception_handler()
     async def get_paginated(
@@ -32,20 +189,441 @@ class GetService:
         filter_value: Optional[str] = None,
         offset: int = 0,
         limit: int = 10,
+        cursor: Optional[str] = None,
+        total_mode: TotalMode = TotalMode.EXACT,
+        fields: Optional[Sequence[str]] = None,
+        expand: Optional[Sequence[str]] = None,
     ) -> PaginatedResponse[T]:
-        """Retrieve a paginated list of entities with optional filtering."""
-        query, count_query = await self._build_base_query(filter_value)
-        total_result = await self.session.execute(count_query)
-        total = total_result.scalar_one()
-        result = await self.session.execute(query.offset(offset).limit(limit))
-        items = result.scalars().all()
-
-        return PaginatedResponse[T](
-            total=total,
-            offset=offset,
-            limit=limit,
-            items=items,
+        """Retrieve a paginated list of entities with optional filtering.
+
+        Rows are ordered by the filter field and id. With a `cursor` the page
+        seeks past the row it encodes instead of skipping `offset` rows.
+        `total_mode` selects how, and whether, the filtered total is counted.
+
+        `fields` limits each item, and the SELECT, to the named fields.
+        Relations named in `expand` are returned as objects rather than ids,
+        loaded for the whole page with one query per relation.
+        """
+        view = self._view(fields, expand)
+        after = _decode_cursor(cursor, len(self._sort_key())) if cursor else None
+        count_key = (self.model.__name__, "count", self.filter_field, filter_value)
+
+        async def load():
+            generation = self.cache.generation
+            index = self._adjacency()
+            query, count_query = await self._build_base_query(filter_value)
+            projection = {"view": view, "index": index}
+            total, found = None, None
+
+            if isinstance(index, DatasetSnapshot):
+                found = index.page(
+                    self.model,
+                    self.filter_field,
+                    filter_value,
+                    after[-1] if after is not None else None,
+                    offset,
+                    limit + 1,
+                )
+            if found is not None:
+                items, total = found
+                if total_mode is TotalMode.NONE:
+                    total = None
+            elif total_mode is TotalMode.WINDOW:
+                items, total = await self._fetch_page_with_total(
+                    query, after, offset, limit, **projection
+                )
+                if total is None:
+                    total = await self._count(count_query)
+            else:
+                if total_mode is TotalMode.EXACT:
+                    total = await self._count(count_query)
+                items = await self._fetch_page(
+                    query, after, offset, limit, **projection
+                )
+
+            has_more = len(items) > limit
+            items = items[:limit]
+            if total is not None:
+                self._cache_put(count_key, total, generation)
+            elif total_mode is TotalMode.ESTIMATED:
+                total = await self._estimate_total(query, count_key)
+                if after is None:
+                    # Rows seen so far bound the estimate; the last page pins it
+                    seen = offset + len(items)
+                    if has_more:
+                        total = max(total, seen + 1)
+                    elif items or offset == 0:
+                        total = seen
+
+            expanded = await self._expand(items, view, index)
+            next_cursor = None
+            if has_more:
+                last = items[-1]
+                next_cursor = _encode_cursor(
+                    [getattr(last, column.key) for column in self._sort_key()]
+                )
+
+            return PaginatedResponse[T](
+                total=total,
+                total_mode=total_mode.value,
+                offset=None if after is not None else offset,
+                limit=limit,
+                items=[self._to_read(item, view, expanded, index) for item in items],
+                has_more=has_more,
+                next_cursor=next_cursor,
+            )
+
+        page = ("cursor", cursor) if cursor else ("offset", offset)
+        key = (
+            self.model.__name__,
+            self.filter_field,
+            filter_value,
+            page,
+            limit,
+            total_mode.value,
+            view,
         )
+        return await self._read_through(key, load)
+
+    async def _fetch_page(
+        self,
+        query,
+        after: Optional[list],
+        offset: int,
+        limit: int,
+        view: Optional[View] = None,
+        index: Optional[AdjacencyIndex] = None,
+    ):
+        """Fetch one page plus one extra row telling whether another follows."""
+        source = query.subquery()
+        projection = self._projection(source, view, index)
+        page = self._seek(select(*projection), source, after, offset)
+        result = await self.session.execute(page.limit(limit + 1))
+        return result.all()
+
+    async def _fetch_page_with_total(
+        self,
+        query,
+        after: Optional[list],
+        offset: int,
+        limit: int,
+        view: Optional[View] = None,
+        index: Optional[AdjacencyIndex] = None,
+    ):
+        """Fetch a page and the filtered total in one statement.
+
+        `count(*) OVER ()` is computed in a subquery so a cursor seek in the
+        outer query does not shrink the total. Returns None as the total when
+        the page is empty.
+        """
+        windowed = query.add_columns(func.count().over().label("total")).subquery()
+        page = self._seek(
+            select(*self._projection(windowed, view, index), windowed.c.total),
+            windowed,
+            after,
+            offset,
+        )
+        result = await self.session.execute(page.limit(limit + 1))
+        rows = result.all()
+        return rows, rows[0].total if rows else None
+
+    def _projection(
+        self,
+        source,
+        view: Optional[View] = None,
+        index: Optional[AdjacencyIndex] = None,
+    ) -> list:
+        """Select the model's columns from `source` plus, for each relationship,
+        the related ids aggregated straight from its link table.
+
+        Related rows are never read and no ORM objects are built. With a view
+        only its fields are selected, besides the id and sort key. With an
+        adjacency index the related ids are left to it.
+        """
+        columns = list(self.model.__table__.columns)
+        relations = [] if index is not None else link_columns(self.model)
+        if view is not None:
+            needed = {"id", *view.fields, *(c.key for c in self._sort_key())}
+            columns = [column for column in columns if column.name in needed]
+            relations = [r for r in relations if r[0] in view.fields]
+
+        return [source.c[column.name] for column in columns] + [
+            select(id_array(target))
+            .where(owner == source.c.id)
+            .scalar_subquery()
+            .label(key)
+            for key, owner, target in relations
+        ]
+
+    async def _expand(
+        self, rows: list, view: Optional[View], index: Optional[AdjacencyIndex] = None
+    ) -> dict[str, dict]:
+        """Load the objects of each relation expanded by `view` for all `rows`,
+        with one query per relation or from a dataset snapshot, keyed by
+        relation and then by id."""
+        expanded = {}
+        for key in view.expand if view else ():
+            ids = sorted(
+                {id for row in rows for id in self._related_ids(row, key, index)}
+            )
+            target = related_model(self.model, key)
+            schema, table = SUMMARY_SCHEMAS[target], target.__table__
+            objects = {}
+            if isinstance(index, DatasetSnapshot):
+                # Ids dropped since the snapshot was taken are skipped
+                targets = filter(None, (index.row(target, id) for id in ids))
+                objects = {t.id: schema.model_validate(t._mapping) for t in targets}
+            elif ids:
+                query = select(*[table.c[name] for name in schema.model_fields])
+                result = await self.session.execute(query.where(table.c.id.in_(ids)))
+                objects = {
+                    row.id: schema.model_validate(row._mapping) for row in result
+                }
+            expanded[key] = objects
+        return expanded
+
+    def _view(
+        self, fields: Optional[Sequence[str]], expand: Optional[Sequence[str]]
+    ) -> Optional[View]:
+        """Resolve `fields=` and `expand=` values, which may be comma-separated,
+        into a view, or None for the full read schema."""
+        if not fields and not expand:
+            return None
+        relations = [key for key, _, _ in link_columns(self.model)]
+        default = self._field_names()
+        # Any view may ask for the id, even when the read schema omits it
+        available = default if "id" in default else ["id", *default]
+        selected = _split_names(fields) or default
+        expanded = _split_names(expand)
+
+        for name in selected:
+            if name not in available:
+                raise InvalidFieldError(
+                    detail=f"Unknown field `{name}`; expected one of "
+                    + ", ".join(available)
+                )
+        for name in expanded:
+            if name not in relations:
+                raise InvalidFieldError(
+                    detail=f"Cannot expand `{name}`; expected one of "
+                    + ", ".join(relations)
+                )
+        selected += [name for name in expanded if name not in selected]
+        return View(tuple(selected), tuple(expanded))
+
+    def _field_names(self) -> list[str]:
+        """Return the fields of a full result, in order."""
+        if self.read_schema is not None:
+            return list(self.read_schema.model_fields)
+        names = [column.name for column in self.model.__table__.columns]
+        return names + [key for key, _, _ in link_columns(self.model)]
+
+    async def _count(self, count_query) -> int:
+        """Run the exact count query."""
+        total_result = await self.session.execute(count_query)
+        return total_result.scalar_one()
+
+    async def _estimate_total(self, query, count_key: Hashable) -> int:
+        """Return the exact total cached since the last sync, or the planner's
+        row estimate for the filtered query."""
+        if self._caching:
+            cached = self.cache.get(count_key)
+            if cached is not None:
+                return cached
+        result = await self.session.execute(Explain(query))
+        plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def _seek(self, query, source, after: Optional[list], offset: int):
+        """Order `query` by the sort key columns of `source` and position it on
+        the page."""
+        keys = [source.c[column.key] for column in self._sort_key()]
+        query = query.order_by(*keys)
+        if after is not None:
+            return query.where(tuple_(*keys) > tuple_(*after))
+        return query.offset(offset)
+
+    @exception_handler()
+    async def traverse(
+        self,
+        id: UUID,
+        path: Sequence[str],
+        limit: int = 100,
+        include_start: bool = False,
+    ) -> TraversalResponse:
+        """Follow a path of relationships from one entity in a single query.
+
+        Each hop joins a link table to the distinct entities reached by the
+        previous hop. Entities at the end of the path are returned once, with
+        the number of distinct entities of the previous hop linking to them,
+        most linked first. The start entity is left out of its own results
+        unless `include_start` is set.
+        """
+        path = self._path(path)
+
+        async def load():
+            index = self._adjacency()
+            if index is not None:
+                found = index.traverse(self.model, id, path, limit + 1, include_start)
+                if found is None:
+                    raise self._not_found(id)
+                nodes, total = found
+            else:
+                query = _traversal_query(self.model, id, path, include_start)
+                result = await self.session.execute(query.limit(limit + 1))
+                rows = result.all()
+                if not rows and not await self._exists(id):
+                    raise self._not_found(id)
+                nodes = [(row.id, row.links) for row in rows]
+                total = rows[0].total if rows else 0
+
+            return TraversalResponse(
+                start=id,
+                path=path,
+                total=total,
+                items=[TraversalNode(id=node, count=n) for node, n in nodes[:limit]],
+                has_more=len(nodes) > limit,
+            )
+
+        key = (self.model.__name__, "traverse", id, tuple(path), limit, include_start)
+        return await self._read_through(key, load)
+
+    @exception_handler()
+    async def count_related(self, id: UUID) -> RelationCountsRead:
+        """Count the entities in each relationship of an entity, from the
+        adjacency index when it is current and the link tables otherwise."""
+
+        async def load():
+            index = self._adjacency()
+            keys = [key for key, _, _ in link_columns(self.model)]
+            if index is not None:
+                counts = {key: index.count(self.model, id, key) for key in keys}
+                if None in counts.values():
+                    raise self._not_found(id)
+                return RelationCountsRead(id=id, counts=counts)
+
+            table = self.model.__table__
+            query = select(
+                *[
+                    select(func.count())
+                    .where(owner == table.c.id)
+                    .scalar_subquery()
+                    .label(key)
+                    for key, owner, _ in link_columns(self.model)
+                ]
+            ).where(table.c.id == id)
+            row = (await self.session.execute(query)).first()
+            if row is None:
+                raise self._not_found(id)
+            return RelationCountsRead(id=id, counts=dict(row._mapping))
+
+        return await self._read_through((self.model.__name__, "counts", id), load)
+
+    def _not_found(self, id: UUID) -> NotFoundError:
+        """Build the error for a missing entity of this model."""
+        return NotFoundError(detail=f"{self.model.__name__} with id `{id}` not found")
+
+    def _path(self, path: Sequence[str]) -> list[str]:
+        """Validate relationship names hop by hop, or raise InvalidPathError."""
+        hops = [name.strip() for value in path for name in value.split(",")]
+        hops = [hop for hop in hops if hop]
+        if not hops or len(hops) > TRAVERSAL_MAX_DEPTH:
+            raise InvalidPathError(
+                detail=f"Paths take 1 to {TRAVERSAL_MAX_DEPTH} relationship hops"
+            )
+        model = self.model
+        for hop in hops:
+            relations = [key for key, _, _ in link_columns(model)]
+            if hop not in relations:
+                raise InvalidPathError(
+                    detail=f"{model.__name__} has no relationship `{hop}`; "
+                    f"expected one of {', '.join(relations)}"
+                )
+            model = related_model(model, hop)
+        return hops
+
+    async def _exists(self, id: UUID) -> bool:
+        """Whether an entity with this id exists."""
+        table = self.model.__table__
+        result = await self.session.execute(select(literal(1)).where(table.c.id == id))
+        return result.first() is not None
+
+    def _adjacency(self) -> Optional[AdjacencyIndex]:
+        """Return the adjacency index if it matches the dataset version the read
+        cache is reconciled with."""
+        if self.adjacency is None:
+            return None
+        return self.adjacency.current(self.cache.version)
+
+    def _related_ids(self, row, key: str, index: Optional[AdjacencyIndex]) -> list:
+        """Return the ids of relation `key` of a projected row."""
+        if index is None:
+            return row._mapping[key]
+        return index.related(self.model, row.id, key) or []
+
+    def _detail_key(self, id: UUID, view: Optional[View]) -> tuple:
+        """Return the read cache key of one entity shaped by `view`."""
+        return (self.model.__name__, id, view)
+
+    @property
+    def _caching(self) -> bool:
+        """Whether results of this service are stored in the read cache."""
+        return self.read_schema is not None and self.cache.enabled
+
+    def _cache_put(self, key: Hashable, value, generation: int):
+        """Store `value` in the read cache when this service caches results."""
+        if self._caching:
+            self.cache.put(key, value, generation)
+
+    async def _read_through(self, key: Hashable, load: Callable[[], Awaitable]):
+        """Return the cached result for `key`, loading and caching it on a miss."""
+        if not self._caching:
+            return await load()
+
+        generation = self.cache.generation
+        value = self.cache.get(key)
+        if value is None:
+            value = await load()
+            self._cache_put(key, value, generation)
+        return value
+
+    def _to_read(
+        self,
+        row,
+        view: Optional[View] = None,
+        expanded: Optional[dict] = None,
+        index: Optional[AdjacencyIndex] = None,
+    ):
+        """Build the read schema, or the schema of `view`, from a projected row
+        and the objects loaded for its expanded relations."""
+        if self.read_schema is None and view is None:
+            return row
+        data = dict(row._mapping)
+        for key, _, _ in link_columns(self.model):
+            if view is not None and key not in view.fields:
+                continue
+            ids = self._related_ids(row, key, index)
+            if expanded and key in expanded:
+                objects = expanded[key]
+                data[key] = [objects[id] for id in ids if id in objects]
+            else:
+                data[key] = [{"id": id} for id in ids]
+        if view is None:
+            return self.read_schema.model_validate(data)
+
+        data = {name: data[name] for name in view.fields}
+        if self.read_schema is None:
+            return data
+        return _view_schema(self.read_schema, self.model, view).model_validate(data)
+
+    def _sort_key(self) -> list:
+        """Return the columns giving list results a stable, seekable order."""
+        field = getattr(self.model, self.filter_field, None)
+        if field is None:
+            return [self.model.id]
+        return [field, self.model.id]
 
     async def _build_base_query(self, filter_value: Optional[str] = None):
         """Build a base SQL query and count query with optional filtering by field."""
@@ -55,25 +633,141 @@ class GetService:
         if filter_value:
             field = getattr(self.model, self.filter_field, None)
             if field is not None:
-                query = query.where(field.ilike(f"%{filter_value}%"))
-                count_query = count_query.where(field.ilike(f"%{filter_value}%"))
+                # Plain ILIKE on the column is what the trigram GIN index serves
+                condition = field.ilike(_contains_pattern(filter_value), escape="\\")
+                query = query.where(condition)
+                count_query = count_query.where(condition)
 
         return query, count_query
 
 
+def _traversal_query(model, start: UUID, path: list[str], include_start: bool):
+    """Build the query following `path` from entity `start` of `model`.
+
+    Every hop but the last is a CTE of distinct ids, so the row count stays
+    bounded by the number of entities rather than the number of walks. The
+    last hop groups by target id, counting linking entities, and carries the
+    number of distinct targets as a window total.
+    """
+    origin, frontier = model, None
+    for depth, hop in enumerate(path, start=1):
+        _, owner, target = next(c for c in link_columns(model) if c[0] == hop)
+        link = owner.table.alias(f"hop{depth}")
+        owner, target = link.c[owner.name], link.c[target.name]
+        model = related_model(model, hop)
+
+        if frontier is None:
+            query = select(target.label("id")).where(owner == start)
+        else:
+            query = select(target.label("id")).join(frontier, owner == frontier.c.id)
+        if depth < len(path):
+            frontier = query.distinct().cte(f"frontier{depth}")
+
+    query = query.add_columns(
+        func.count().label("links"), func.count().over().label("total")
+    ).group_by(target)
+    if not include_start and model is origin:
+        query = query.where(target != start)
+    return query.order_by(func.count().desc(), target)
+
+
+@lru_cache(maxsize=256)
+def _view_schema(read_schema, model, view: View) -> type[BaseModel]:
+    """Build a schema holding only the fields of `view`, with expanded
+    relations typed as lists of the related summary schema."""
+    definitions = {}
+    for name in view.fields:
+        if name in view.expand:
+            summary = SUMMARY_SCHEMAS[related_model(model, name)]
+            definitions[name] = (List[summary], ...)
+        elif name in read_schema.model_fields:
+            field = read_schema.model_fields[name]
+            definitions[name] = (field.annotation, field)
+        else:
+            definitions[name] = (UUID, ...)
+    return create_model(f"{read_schema.__name__}View", **definitions)
+
+
+def _split_names(values: Optional[Sequence[str]]) -> list[str]:
+    """Flatten repeated and comma-separated names, dropping duplicates."""
+    names = []
+    for value in values or ():
+        for name in value.split(","):
+            name = name.strip()
+            if name and name not in names:
+                names.append(name)
+    return names
+
+
+def _parse_ids(values: Sequence) -> list[UUID]:
+    """Flatten and parse requested ids, dropping duplicates, or raise
+    InvalidBatchError."""
+    ids = {}
+    for value in values:
+        names = [value] if isinstance(value, UUID) else _split_names([value])
+        for name in names:
+            try:
+                ids[name if isinstance(name, UUID) else UUID(name)] = None
+            except ValueError:
+                raise InvalidBatchError(detail=f"`{name}` is not a valid id")
+    if len(ids) > BATCH_MAX_IDS:
+        raise InvalidBatchError(detail=f"At most {BATCH_MAX_IDS} ids per request")
+    return list(ids)
+
+
+def _contains_pattern(value: str) -> str:
+    """Build a LIKE pattern matching `value` literally anywhere in the column."""
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _encode_cursor(values: list) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor."""
+    raw = json.dumps([str(value) for value in values]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, size: int) -> list:
+    """Decode a cursor into sort key values, raising InvalidCursorError."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != size:
+            raise ValueError("Unexpected cursor shape")
+        # The id column is always last
+        return [*values[:-1], UUID(values[-1])]
+    except (ValueError, TypeError):
+        raise InvalidCursorError()
+
+
 class FilmGetService(GetService):
     """Service class for retrieving Film entities."""
     def __init__(self, session: AsyncSession):
-        super().__init__(model=Film, session=session, filter_field="title")
+        super().__init__(
+            model=Film,
+            session=session,
+            filter_field="title",
+            read_schema=FilmRead,
+        )
 
 
 class CharacterGetService(GetService):
     """Service class for retrieving Character entities."""
     def __init__(self, session: AsyncSession):
-        super().__init__(model=Character, session=session, filter_field="name")
+        super().__init__(
+            model=Character,
+            session=session,
+            filter_field="name",
+            read_schema=CharacterRead,
+        )
 
 
 class StarshipGetService(GetService):
     """Service class for retrieving Starship entities."""
     def __init__(self, session: AsyncSession):
-        super().__init__(model=Starship, session=session, filter_field="name")
+        super().__init__(
+            model=Starship,
+            session=session,
+            filter_field="name",
+            read_schema=StarshipRead,
+        )
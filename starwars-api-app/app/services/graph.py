@@ -0,0 +1,239 @@
+import asyncio
+import heapq
+import logging
+import sys
+from array import array
+from collections import Counter
+from itertools import accumulate
+from typing import Awaitable, Callable, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import select
+
+from ..database.models import Character, DatasetVersion, Film, Starship
+from ..database.relations import link_columns, related_model
+from ..database.session import get_engine
+
+logger = logging.getLogger(__name__)
+
+# Entities whose relationships the index covers
+GRAPH_MODELS = (Film, Character, Starship)
+
+
+class AdjacencyIndex:
+    """Immutable adjacency of the film, character and starship graph.
+
+    Entities of each model are numbered by ascending id. Every relationship
+    direction is stored in compressed sparse row form: `offsets[i]` to
+    `offsets[i + 1]` delimit the positions in `targets` of the entities
+    linked to entity `i`, sorted so related ids come out in id order, as
+    they do from the link table aggregates. `version` is the dataset version
+    the index was read at.
+    """
+
+    def __init__(
+        self,
+        version: int,
+        ids: dict[type, list[UUID]],
+        positions: dict[type, dict[UUID, int]],
+        edges: dict[tuple[type, str], tuple[array, array]],
+    ):
+        self.version = version
+        self._ids = ids
+        self._positions = positions
+        self._edges = edges
+        self.nodes = sum(len(model_ids) for model_ids in ids.values())
+        # Each link row is stored once per direction
+        self.edges = sum(len(targets) for _, targets in edges.values()) // 2
+        self.memory_bytes = _memory_bytes(self._ids, self._positions, self._edges)
+
+    def related(self, model, id: UUID, key: str) -> Optional[list[UUID]]:
+        """Return the ids related to an entity, or None if it is unknown."""
+        position = self._positions[model].get(id)
+        if position is None:
+            return None
+        target_ids = self._ids[related_model(model, key)]
+        return [target_ids[t] for t in self._neighbours(model, key, position)]
+
+    def count(self, model, id: UUID, key: str) -> Optional[int]:
+        """Return how many entities are related to an entity, or None if it is
+        unknown."""
+        position = self._positions[model].get(id)
+        if position is None:
+            return None
+        offsets, _ = self._edges[(model, key)]
+        return offsets[position + 1] - offsets[position]
+
+    def traverse(
+        self,
+        model,
+        id: UUID,
+        path: Sequence[str],
+        limit: int,
+        include_start: bool = False,
+    ) -> Optional[tuple[list[tuple[UUID, int]], int]]:
+        """Follow `path` from an entity with the semantics of the SQL traversal.
+
+        Returns up to `limit` `(id, count)` pairs, most linked first, and the
+        number of distinct entities reached, or None if the start is unknown.
+        """
+        start = self._positions[model].get(id)
+        if start is None:
+            return None
+        frontier, current = {start}, model
+        for hop in path[:-1]:
+            frontier = {t for f in frontier for t in self._neighbours(current, hop, f)}
+            current = related_model(current, hop)
+
+        counts = Counter(
+            t for f in frontier for t in self._neighbours(current, path[-1], f)
+        )
+        target = related_model(current, path[-1])
+        if not include_start and target is model:
+            counts.pop(start, None)
+        # Positions follow id order, so this breaks ties by id as SQL does
+        best = heapq.nsmallest(limit, counts.items(), key=lambda c: (-c[1], c[0]))
+        target_ids = self._ids[target]
+        return [(target_ids[p], count) for p, count in best], len(counts)
+
+    def _neighbours(self, model, key: str, position: int) -> array:
+        """Return the positions of the entities related to one entity."""
+        offsets, targets = self._edges[(model, key)]
+        return targets[offsets[position] : offsets[position + 1]]
+
+
+async def build_adjacency_index(connection) -> AdjacencyIndex:
+    """Read entity ids and link tables into a new index.
+
+    The dataset version is read through the same connection, so callers run
+    this in a repeatable-read transaction to label the index exactly.
+    """
+    result = await connection.execute(
+        select(DatasetVersion.version).where(DatasetVersion.id == 1)
+    )
+    version = result.scalar_one()
+
+    ids, positions = {}, {}
+    for model in GRAPH_MODELS:
+        column = model.__table__.c.id
+        result = await connection.execute(select(column).order_by(column))
+        ids[model] = [row[0] for row in result]
+        positions[model] = {id: i for i, id in enumerate(ids[model])}
+
+    # Each link table is read once and stored in both directions
+    links, edges = {}, {}
+    for model in GRAPH_MODELS:
+        for key, owner, target in link_columns(model):
+            table = owner.table
+            if table not in links:
+                result = await connection.execute(select(table))
+                links[table] = [row._mapping for row in result]
+            owners, targets = positions[model], positions[related_model(model, key)]
+            pairs = [(owners[row[owner]], targets[row[target]]) for row in links[table]]
+            edges[(model, key)] = _compress(pairs, len(ids[model]))
+    return AdjacencyIndex(version, ids, positions, edges)
+
+
+class AdjacencyIndexHolder:
+    """The adjacency index this worker serves reads from.
+
+    A rebuild is scheduled whenever the read cache sees a new dataset version,
+    and the finished index replaces the old one in a single assignment.
+    `current` only hands out an index built at the version the caller
+    expects, so reads fall back to SQL while a rebuild is in flight. `build`
+    reads the index from a connection and may return a subclass carrying
+    more of the dataset. Without an `engine`, it is read from the primary.
+    """
+
+    def __init__(
+        self,
+        engine=None,
+        enabled: bool = True,
+        build: Callable[..., Awaitable[AdjacencyIndex]] = build_adjacency_index,
+    ):
+        self.engine = engine
+        self.enabled = enabled
+        self.build = build
+        self.index: Optional[AdjacencyIndex] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def current(self, version: Optional[int]) -> Optional[AdjacencyIndex]:
+        """Return the index if it was built at dataset `version`."""
+        index = self.index
+        if not self.enabled or index is None or index.version != version:
+            return None
+        return index
+
+    def schedule(self, version: int):
+        """Rebuild in the background, superseding any rebuild in progress."""
+        if not self.enabled:
+            return
+        if self._task is not None:
+            self._task.cancel()
+        self._task = asyncio.get_running_loop().create_task(self._rebuild())
+
+    def swap(self, index: AdjacencyIndex):
+        """Serve `index` unless a newer one is already in place."""
+        if self.index is None or index.version >= self.index.version:
+            self.index = index
+
+    async def stop(self):
+        """Cancel any rebuild in progress."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _rebuild(self):
+        """Build an index from a consistent snapshot and swap it in."""
+        try:
+            async with (self.engine or get_engine()).connect() as connection:
+                await connection.execution_options(isolation_level="REPEATABLE READ")
+                index = await self.build(connection)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Could not rebuild the adjacency index")
+            return
+        self.swap(index)
+        logger.info(
+            "%s at version %s: %s nodes, %s edges, %s bytes",
+            type(index).__name__,
+            index.version,
+            index.nodes,
+            index.edges,
+            index.memory_bytes,
+        )
+
+
+def _compress(pairs: list[tuple[int, int]], size: int) -> tuple[array, array]:
+    """Build sorted compressed sparse rows from `(owner, target)` positions."""
+    neighbours = [[] for _ in range(size)]
+    for owner, target in pairs:
+        neighbours[owner].append(target)
+    offsets = array("I", accumulate((len(n) for n in neighbours), initial=0))
+    targets = array("I")
+    for row in neighbours:
+        targets.extend(sorted(row))
+    return offsets, targets
+
+
+def _memory_bytes(ids: dict, positions: dict, edges: dict) -> int:
+    """Approximate the memory held by the index."""
+    size = sum(
+        sys.getsizeof(offsets) + sys.getsizeof(targets)
+        for offsets, targets in edges.values()
+    )
+    for model_ids in ids.values():
+        size += sys.getsizeof(model_ids)
+        size += sum(sys.getsizeof(id) + sys.getsizeof(id.int) for id in model_ids)
+    return size + sum(sys.getsizeof(p) for p in positions.values())
+
+
+# Shared by every service instance in this worker process; enabled or not
+# from the settings at startup
+adjacency_index = AdjacencyIndexHolder()
@@ -0,0 +1,131 @@
+import sys
+from array import array
+from bisect import bisect_right
+from collections import defaultdict
+from typing import Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import select
+
+from ..database.models import Character, Film, Starship
+from .graph import AdjacencyIndex, build_adjacency_index
+
+# Field each model is listed and searched by, as its get service does
+LISTING_FIELDS = {Film: "title", Character: "name", Starship: "name"}
+
+
+class Listing:
+    """Rows of one model in list order, with a trigram index over their
+    lowercase names.
+
+    Rows are read ordered by the listing field and id in the database, so
+    pages follow its collation and cursors issued from SQL pages stay valid.
+    """
+
+    def __init__(self, field: str, rows: list):
+        self.field = field
+        self.rows = rows
+        self.ranks = {row.id: rank for rank, row in enumerate(rows)}
+        self._names = [getattr(row, field).lower() for row in rows]
+        postings = defaultdict(lambda: array("I"))
+        for rank, name in enumerate(self._names):
+            for gram in _trigrams(name):
+                postings[gram].append(rank)
+        self._postings = dict(postings)
+
+    def search(self, value: Optional[str]) -> Sequence[int]:
+        """Return the ranks of rows whose name contains `value`, ignoring case,
+        in list order."""
+        if not value:
+            return range(len(self.rows))
+        needle = value.lower()
+        grams = _trigrams(needle)
+        if grams:
+            # Any posting list holds every match; the shortest is checked
+            candidates = min((self._postings.get(g, ()) for g in grams), key=len)
+        else:
+            candidates = range(len(self.rows))
+        return [rank for rank in candidates if needle in self._names[rank]]
+
+    @property
+    def memory_bytes(self) -> int:
+        """Approximate the memory held by the rows and name index."""
+        size = sys.getsizeof(self.rows) + sys.getsizeof(self.ranks)
+        size += sum(sys.getsizeof(row) + _values_size(row) for row in self.rows)
+        size += sum(sys.getsizeof(name) for name in self._names)
+        return size + sum(sys.getsizeof(p) for p in self._postings.values())
+
+
+class DatasetSnapshot(AdjacencyIndex):
+    """Adjacency index that also holds every film, character and starship row,
+    so reads can be answered without the database.
+
+    Like the index, a snapshot is never modified once built.
+    """
+
+    def __init__(self, adjacency: AdjacencyIndex, listings: dict[type, Listing]):
+        super().__init__(
+            adjacency.version, adjacency._ids, adjacency._positions, adjacency._edges
+        )
+        self._listings = listings
+        self.memory_bytes += sum(
+            listing.memory_bytes for listing in listings.values()
+        )
+
+    def row(self, model, id: UUID):
+        """Return the row of an entity, or None if it is unknown."""
+        listing = self._listings[model]
+        rank = listing.ranks.get(id)
+        return None if rank is None else listing.rows[rank]
+
+    def page(
+        self,
+        model,
+        field: str,
+        value: Optional[str],
+        after: Optional[UUID],
+        offset: int,
+        limit: int,
+    ) -> Optional[tuple[list, int]]:
+        """Return up to `limit` rows whose `field` contains `value`, following
+        the row with id `after` or skipping `offset` rows, and the number of
+        matches.
+
+        Returns None when the snapshot cannot list by `field` or does not hold
+        the cursor's row, so the caller can fall back to SQL.
+        """
+        listing = self._listings[model]
+        if listing.field != field:
+            return None
+        ranks = listing.search(value)
+        start = offset
+        if after is not None:
+            rank = listing.ranks.get(after)
+            if rank is None:
+                return None
+            start = bisect_right(ranks, rank)
+        return [listing.rows[r] for r in ranks[start : start + limit]], len(ranks)
+
+
+async def build_dataset_snapshot(connection) -> DatasetSnapshot:
+    """Read the adjacency index and every entity row into a new snapshot,
+    through one connection so both describe the same dataset version."""
+    adjacency = await build_adjacency_index(connection)
+    listings = {}
+    for model, field in LISTING_FIELDS.items():
+        table = model.__table__
+        result = await connection.execute(
+            select(table).order_by(table.c[field], table.c.id)
+        )
+        listings[model] = Listing(field, result.all())
+    return DatasetSnapshot(adjacency, listings)
+
+
+def _trigrams(value: str) -> set[str]:
+    """Return the distinct three-character substrings of `value`."""
+    return {value[i : i + 3] for i in range(len(value) - 2)}
+
+
+def _values_size(row) -> int:
+    """Approximate the memory held by the values of a row."""
+    return sum(sys.getsizeof(value) for value in row)
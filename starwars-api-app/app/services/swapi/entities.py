@@ -1,13 +1,39 @@
-from dataclasses import dataclass
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date, datetime, time
 from enum import Enum
+from time import perf_counter
+from typing import Iterator, Optional
 
 from pydantic import BaseModel
-from sqlmodel import SQLModel
+from sqlmodel import DateTime
 
-from ...database.models import Character, Film, Starship
+from ...database.models import (
+    Character,
+    Film,
+    FilmCharacterLink,
+    FilmStarshipLink,
+    Starship,
+    StarshipPilotLink,
+)
 from ...api.schemas import CharacterSWAPICreate, FilmSWAPICreate, StarshipSWAPICreate
 
 
+class SyncMode(str, Enum):
+    """Strategy used to bring the local database in line with SWAPI."""
+
+    FULL = "full"
+    INCREMENTAL = "incremental"
+
+
+class WriteEngine(str, Enum):
+    """How sync writes new rows: ORM unit of work, multi-row VALUES, or COPY."""
+
+    ORM = "orm"
+    VALUES = "values"
+    COPY = "copy"
+
+
 class EntityType(Enum):
     """Enumeration of SWAPI entity types with endpoints, schemas, and ORM models."""
 
@@ -35,10 +61,151 @@ class EntityType(Enum):
         """Return the SQLAlchemy ORM class for this entity type."""
         return self._orm_cls
 
+    @property
+    def label(self) -> str:
+        """Return the plural label used when reporting sync results."""
+        return f"{self._orm_cls.__tablename__}s"
+
+    @property
+    def owned_links(self) -> list["LinkType"]:
+        """Return the link tables populated from this entity's URL lists."""
+        return [link for link in LinkType if link.owner is self]
+
+    @classmethod
+    def sync_order(cls) -> tuple["EntityType", ...]:
+        """Return entity types ordered so link targets are written before owners."""
+        return (cls.CHARACTER, cls.STARSHIP, cls.FILM)
+
+    @property
+    def columns(self) -> list[str]:
+        """Return the table columns populated from parsed SWAPI data."""
+        return [c.name for c in self._orm_cls.__table__.columns if c.name != "id"]
+
+    def to_row(self, parsed: BaseModel) -> dict:
+        """Convert a parsed SWAPI model into column values for this entity's table."""
+        row = parsed.model_dump(include=set(self.columns))
+        for column in self._orm_cls.__table__.columns:
+            value = row.get(column.name)
+            if (
+                isinstance(column.type, DateTime)
+                and isinstance(value, date)
+                and not isinstance(value, datetime)
+            ):
+                row[column.name] = datetime.combine(value, time())
+        return row
+
+
+class LinkType(Enum):
+    """Enumeration of many-to-many link tables populated from SWAPI URL lists."""
+
+    FILM_CHARACTER = (
+        "film_characters",
+        FilmCharacterLink,
+        EntityType.FILM,
+        "character_urls",
+        EntityType.CHARACTER,
+    )
+    FILM_STARSHIP = (
+        "film_starships",
+        FilmStarshipLink,
+        EntityType.FILM,
+        "starship_urls",
+        EntityType.STARSHIP,
+    )
+    STARSHIP_PILOT = (
+        "starship_pilots",
+        StarshipPilotLink,
+        EntityType.STARSHIP,
+        "pilot_urls",
+        EntityType.CHARACTER,
+    )
+
+    def __init__(self, label: str, link_cls, owner, urls_field: str, target):
+        self._label = label
+        self._link_cls = link_cls
+        self._owner = owner
+        self._urls_field = urls_field
+        self._target = target
+
+    @property
+    def label(self) -> str:
+        """Return the label used when reporting sync results."""
+        return self._label
+
+    @property
+    def link_class(self):
+        """Return the SQLModel link table class."""
+        return self._link_cls
+
+    @property
+    def owner(self) -> EntityType:
+        """Return the entity type whose SWAPI record lists the related URLs."""
+        return self._owner
+
+    @property
+    def target(self) -> EntityType:
+        """Return the entity type referenced by the URL list."""
+        return self._target
+
+    @property
+    def owner_column(self):
+        """Return the link table column referencing the owner entity."""
+        return self._link_cls.__table__.columns[0]
+
+    @property
+    def target_column(self):
+        """Return the link table column referencing the target entity."""
+        return self._link_cls.__table__.columns[1]
+
+    def target_urls(self, parsed: BaseModel) -> list[str]:
+        """Return the related SWAPI URLs listed on a parsed owner record."""
+        return getattr(parsed, self._urls_field)
+
+
+@dataclass
+class EntityChanges:
+    """Per-table counters describing what a sync run changed."""
+
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+
+
+@dataclass
+class SyncStats:
+    """Where a sync run spent its time and how much it moved.
+
+    Phases are timed cumulatively across chunks and entities, so their sum
+    approaches `elapsed_seconds`. Statements run by the COPY engine go
+    through asyncpg directly and are not counted.
+    """
+
+    elapsed_seconds: float = 0.0
+    phase_seconds: dict[str, float] = field(default_factory=dict)
+    records_per_second: float = 0.0
+    bytes_fetched: int = 0
+    statements: int = 0
+    rows_written: dict[str, int] = field(default_factory=dict)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Add the time spent in the block to phase `name`."""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = perf_counter() - start
+            self.phase_seconds[name] = self.phase_seconds.get(name, 0.0) + elapsed
+
 
 @dataclass
-class EntityRecord:
-    """Container linking ORM and parsed Pydantic objects for an entity."""
+class SyncResult:
+    """Outcome of a sync run."""
 
-    orm: SQLModel
-    parsed: BaseModel
+    mode: SyncMode
+    synced_entities: dict[str, int]
+    changes: dict[str, EntityChanges] = field(default_factory=dict)
+    chunk_size: Optional[int] = None
+    peak_memory_bytes: Optional[int] = None
+    stats: SyncStats = field(default_factory=SyncStats)
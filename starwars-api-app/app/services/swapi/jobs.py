@@ -0,0 +1,259 @@
+import asyncio
+import logging
+import time
+from dataclasses import asdict
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from ...api.schemas import SyncJobRead, SyncResponse, SyncStatsRead
+from ...database.models import SyncJob
+from ...database.session import async_session, get_engine
+from ...exceptions import NotFoundError, SyncConflictError
+from .entities import SyncMode, SyncResult, WriteEngine
+from .sync import sync_swapi
+
+logger = logging.getLogger(__name__)
+
+# Postgres advisory lock keys shared by every worker process
+ENQUEUE_LOCK_KEY = 0x5357_4150_0001
+RUN_LOCK_KEY = 0x5357_4150_0002
+
+# A held run lock without an active job belongs to a runner releasing it;
+# the lock is retried this many times, this many seconds apart, before
+# reporting a conflict
+FINISHING_RETRIES = 5
+FINISHING_RETRY_SECONDS = 0.02
+
+# Minimum seconds between progress writes while a phase is running
+PROGRESS_INTERVAL = 0.5
+
+# Keep references so running jobs are not garbage collected
+_background_tasks: set[asyncio.Task] = set()
+
+
+class JobStatus(str, Enum):
+    """Lifecycle states of a sync job."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+ACTIVE_STATUSES = (JobStatus.PENDING.value, JobStatus.RUNNING.value)
+
+
+async def enqueue_sync(
+    session: AsyncSession,
+    mode: SyncMode,
+    engine: WriteEngine,
+    chunk_size: int,
+    trace_memory: bool = False,
+) -> tuple[SyncJob, bool]:
+    """Start a background sync, or return the job already running in any worker.
+
+    The enqueue step is serialized by a transaction-level advisory lock. The
+    new job's runner owns a session-level run lock for its whole lifetime, so
+    an active job whose run lock is free belonged to a worker that died. A
+    held lock without an active job is a runner between recording its outcome
+    and releasing the lock, and is waited for briefly rather than reported as
+    a conflict. Returns the job and whether it was coalesced into an existing run.
+    """
+    lock_connection = await get_engine().connect()
+    try:
+        await session.execute(select(func.pg_advisory_xact_lock(ENQUEUE_LOCK_KEY)))
+        for attempt in range(FINISHING_RETRIES + 1):
+            acquired = await _try_run_lock(lock_connection)
+            active = await _active_job(session)
+            if acquired or active is not None or attempt == FINISHING_RETRIES:
+                break
+            # A runner that has just recorded its outcome still holds the lock
+            await asyncio.sleep(FINISHING_RETRY_SECONDS)
+
+        if acquired:
+            if active is not None:
+                active.status = JobStatus.FAILED.value
+                active.error = "Sync worker exited before the job finished"
+                active.finished_at = _now()
+            job = SyncJob(
+                status=JobStatus.PENDING.value,
+                mode=mode.value,
+                engine=engine.value,
+                chunk_size=chunk_size,
+                created_at=_now(),
+            )
+            session.add(job)
+        await session.commit()
+    except BaseException:
+        await _release_run_lock(lock_connection)
+        raise
+
+    if not acquired:
+        await lock_connection.close()
+        if active is None:
+            raise SyncConflictError()
+        return active, True
+
+    _spawn(
+        run_sync_job(
+            job.id, lock_connection, mode, engine, chunk_size, trace_memory
+        )
+    )
+    return job, False
+
+
+async def get_sync_job(session: AsyncSession, job_id: UUID) -> SyncJob:
+    """Retrieve a sync job by id or raise NotFoundError."""
+    job = await session.get(SyncJob, job_id)
+    if not job:
+        raise NotFoundError(detail=f"Sync job with id `{job_id}` not found")
+    return job
+
+
+async def run_sync_job(
+    job_id: UUID,
+    lock_connection: AsyncConnection,
+    mode: SyncMode,
+    engine: WriteEngine,
+    chunk_size: int,
+    trace_memory: bool = False,
+):
+    """Run a sync while holding the run lock on `lock_connection`.
+
+    Progress is written through `lock_connection` in short transactions so it
+    is visible to other workers while the sync transaction is still open.
+    """
+    last_phase, last_write = None, 0.0
+
+    async def on_progress(phase: str, counts: dict[str, int]):
+        nonlocal last_phase, last_write
+        if phase == last_phase and time.monotonic() - last_write < PROGRESS_INTERVAL:
+            return
+        last_phase, last_write = phase, time.monotonic()
+        await _update_job(lock_connection, job_id, phase=phase, progress=counts)
+
+    try:
+        await _update_job(
+            lock_connection,
+            job_id,
+            status=JobStatus.RUNNING.value,
+            phase="starting",
+            started_at=_now(),
+        )
+        async with async_session(bind=get_engine()) as session:
+            result = await sync_swapi(
+                session,
+                mode=mode,
+                engine=engine,
+                chunk_size=chunk_size,
+                on_progress=on_progress,
+                trace_memory=trace_memory,
+            )
+        await _update_job(
+            lock_connection,
+            job_id,
+            status=JobStatus.SUCCEEDED.value,
+            phase="done",
+            progress=result.synced_entities,
+            result=sync_response(result).model_dump(mode="json"),
+            finished_at=_now(),
+        )
+    except Exception as e:
+        logger.exception("Sync job %s failed", job_id)
+        try:
+            await lock_connection.rollback()
+            await _update_job(
+                lock_connection,
+                job_id,
+                status=JobStatus.FAILED.value,
+                error=str(e) or type(e).__name__,
+                finished_at=_now(),
+            )
+        except Exception:
+            logger.exception("Could not record failure of sync job %s", job_id)
+    finally:
+        await _release_run_lock(lock_connection)
+
+
+def sync_response(result: SyncResult) -> SyncResponse:
+    """Build the API response describing a finished sync."""
+    return SyncResponse(
+        status="success",
+        message="Data synchronized successfully",
+        mode=result.mode.value,
+        synced_entities=result.synced_entities,
+        changes={label: asdict(counts) for label, counts in result.changes.items()},
+        chunk_size=result.chunk_size,
+        peak_memory_bytes=result.peak_memory_bytes,
+        stats=SyncStatsRead(**asdict(result.stats)),
+    )
+
+
+def job_read(job: SyncJob, coalesced: bool = False) -> SyncJobRead:
+    """Build the API representation of a sync job, including elapsed time."""
+    elapsed: Optional[float] = None
+    if job.started_at:
+        elapsed = ((job.finished_at or _now()) - job.started_at).total_seconds()
+    return SyncJobRead(
+        **job.model_dump(),
+        elapsed_seconds=elapsed,
+        coalesced=coalesced,
+    )
+
+
+async def _active_job(session: AsyncSession) -> Optional[SyncJob]:
+    """Return the newest pending or running job, if any."""
+    result = await session.execute(
+        select(SyncJob)
+        .where(SyncJob.status.in_(ACTIVE_STATUSES))
+        .order_by(SyncJob.created_at.desc())
+    )
+    return result.scalars().first()
+
+
+async def _try_run_lock(connection: AsyncConnection) -> bool:
+    """Try to take the session-level run lock without waiting."""
+    result = await connection.execute(select(func.pg_try_advisory_lock(RUN_LOCK_KEY)))
+    acquired = result.scalar_one()
+    await connection.commit()
+    return acquired
+
+
+async def _release_run_lock(connection: AsyncConnection):
+    """Release the run lock and return the connection to the pool.
+
+    Session-level advisory locks survive a pool checkin, so the lock is
+    released explicitly; a connection that cannot do so is discarded.
+    """
+    try:
+        await connection.rollback()
+        await connection.execute(select(func.pg_advisory_unlock(RUN_LOCK_KEY)))
+        await connection.commit()
+    except Exception:
+        await connection.invalidate()
+    await connection.close()
+
+
+async def _update_job(connection: AsyncConnection, job_id: UUID, **values):
+    """Persist job fields in their own short transaction."""
+    await connection.execute(
+        update(SyncJob).where(SyncJob.id == job_id).values(**values)
+    )
+    await connection.commit()
+
+
+def _spawn(coroutine):
+    """Schedule a coroutine in the background of this worker."""
+    task = asyncio.create_task(coroutine)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def _now() -> datetime:
+    """Return the current time in UTC."""
+    return datetime.now(timezone.utc)
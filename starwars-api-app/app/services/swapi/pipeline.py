@@ -0,0 +1,169 @@
+from typing import Optional
+from uuid import UUID, uuid4
+
+from pydantic import BaseModel
+from sqlalchemy import bindparam, delete, or_, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .entities import EntityChanges, EntityType, LinkType, SyncStats, WriteEngine
+from .writers import link_pairs, link_rows, write_rows
+
+
+class SyncPipeline:
+    """Base class writing parsed SWAPI records to the database chunk by chunk.
+
+    Entities must arrive in `EntityType.sync_order()` so every link target is
+    already written when its owner's chunk is processed. Only the
+    `swapi_url -> id` maps are kept between chunks.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        engine: WriteEngine,
+        stats: Optional[SyncStats] = None,
+    ):
+        self.session = session
+        self.engine = engine
+        # Entity rows and link rows are timed as the `rows` and `links` phases
+        self.stats = stats or SyncStats()
+        self.ids: dict[EntityType, dict[str, UUID]] = {e: {} for e in EntityType}
+        self.changes: dict[str, EntityChanges] = {
+            item.label: EntityChanges() for item in (*EntityType, *LinkType)
+        }
+
+    async def write_chunk(self, entity: EntityType, records: list[BaseModel]):
+        """Write one chunk of parsed records and the links they own."""
+        raise NotImplementedError("`write_chunk` must be implemented in subclasses")
+
+    async def finish(self):
+        """Hook run after the last chunk; nothing is committed here."""
+
+
+class FullReload(SyncPipeline):
+    """Insert every record with a fresh id into tables emptied beforehand."""
+
+    async def write_chunk(self, entity: EntityType, records: list[BaseModel]):
+        ids = self.ids[entity]
+        with self.stats.phase("rows"):
+            rows = []
+            for parsed in records:
+                ids[parsed.swapi_url] = uuid4()
+                rows.append({"id": ids[parsed.swapi_url], **entity.to_row(parsed)})
+            await write_rows(self.session, entity.orm_class, rows, self.engine)
+        self.changes[entity.label].inserted += len(rows)
+
+        with self.stats.phase("links"):
+            for link in entity.owned_links:
+                pairs = link_pairs(link, records, self.ids)
+                await write_rows(
+                    self.session, link.link_class, link_rows(link, pairs), self.engine
+                )
+                self.changes[link.label].inserted += len(pairs)
+
+
+class IncrementalSync(SyncPipeline):
+    """Apply the difference between SWAPI and the database, keyed on `swapi_url`.
+
+    Existing rows keep their ids; only changed rows and link-table memberships
+    are written, and rows missing upstream are removed in `finish`.
+    """
+
+    async def write_chunk(self, entity: EntityType, records: list[BaseModel]):
+        with self.stats.phase("rows"):
+            await self._write_rows(entity, records)
+        with self.stats.phase("links"):
+            for link in entity.owned_links:
+                await self._diff_links(link, records)
+
+    async def _write_rows(self, entity: EntityType, records: list[BaseModel]):
+        """Insert new and update changed rows of a chunk of records."""
+        table = entity.orm_class.__table__
+        result = await self.session.execute(
+            select(table).where(table.c.swapi_url.in_([r.swapi_url for r in records]))
+        )
+        existing = {row["swapi_url"]: row for row in result.mappings().all()}
+
+        changes = self.changes[entity.label]
+        ids = self.ids[entity]
+        inserts: list[dict] = []
+        updates: list[dict] = []
+
+        for parsed in records:
+            row = entity.to_row(parsed)
+            current = existing.get(parsed.swapi_url)
+            if current is None:
+                ids[parsed.swapi_url] = uuid4()
+                inserts.append({"id": ids[parsed.swapi_url], **row})
+            elif any(current[column] != value for column, value in row.items()):
+                ids[parsed.swapi_url] = current["id"]
+                updates.append({"row_id": current["id"], **row})
+            else:
+                ids[parsed.swapi_url] = current["id"]
+                changes.unchanged += 1
+
+        await write_rows(self.session, entity.orm_class, inserts, self.engine)
+        if updates:
+            await self.session.execute(
+                update(table).where(table.c.id == bindparam("row_id")), updates
+            )
+        changes.inserted += len(inserts)
+        changes.updated += len(updates)
+
+    async def finish(self):
+        removed: dict[EntityType, list[UUID]] = {}
+        for entity in EntityType:
+            table = entity.orm_class.__table__
+            result = await self.session.execute(select(table.c.id, table.c.swapi_url))
+            seen = self.ids[entity]
+            removed[entity] = [
+                row_id for row_id, url in result.all() if url not in seen
+            ]
+            self.changes[entity.label].deleted += len(removed[entity])
+
+        # Links of removed owners were not visited chunk by chunk, drop them first
+        for link in LinkType:
+            owner_col, target_col = link.owner_column, link.target_column
+            if not (removed[link.owner] or removed[link.target]):
+                continue
+            condition = or_(
+                owner_col.in_(removed[link.owner]),
+                target_col.in_(removed[link.target]),
+            )
+            result = await self.session.execute(select(owner_col).where(condition))
+            self.changes[link.label].deleted += len(result.all())
+            await self.session.execute(
+                delete(link.link_class.__table__).where(condition)
+            )
+
+        for entity, ids in removed.items():
+            if ids:
+                table = entity.orm_class.__table__
+                await self.session.execute(delete(table).where(table.c.id.in_(ids)))
+
+    async def _diff_links(self, link: LinkType, records: list[BaseModel]):
+        """Insert missing and delete stale link rows owned by a chunk of records."""
+        table = link.link_class.__table__
+        owner_col, target_col = link.owner_column, link.target_column
+        owner_ids = [self.ids[link.owner][r.swapi_url] for r in records]
+
+        result = await self.session.execute(
+            select(owner_col, target_col).where(owner_col.in_(owner_ids))
+        )
+        existing = {tuple(row) for row in result.all()}
+        wanted = link_pairs(link, records, self.ids)
+
+        stale = existing - wanted
+        missing = wanted - existing
+        if stale:
+            await self.session.execute(
+                delete(table).where(tuple_(owner_col, target_col).in_(list(stale)))
+            )
+        await write_rows(
+            self.session, link.link_class, link_rows(link, missing), self.engine
+        )
+
+        changes = self.changes[link.label]
+        changes.inserted += len(missing)
+        changes.deleted += len(stale)
+        changes.unchanged += len(existing & wanted)
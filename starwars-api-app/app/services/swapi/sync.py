@@ -1,10 +1,26 @@
-import asyncio
+import json
+import logging
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict
+from datetime import datetime
+from time import perf_counter
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+)
 
 import httpx
+from pydantic import BaseModel
 from sqlalchemy import delete
 
 from ...api.dependencies import AsyncSession
-from ...config import SWAPI_BASE_URL
+from ...config import SWAPI_BASE_URL, SWAPI_SYNC_CHUNK_SIZE
 from ...database.models import (
     Character,
     Film,
@@ -14,11 +30,29 @@ from ...database.models import (
     StarshipPilotLink,
 )
 from ...exceptions import SwapiUnavailableError
-from ...utils import fetch_json
-from .entities import EntityRecord, EntityType
+from ...metrics import (
+    RequestMetrics,
+    current_request,
+    sync_bytes_fetched,
+    sync_duration,
+    sync_phase_time,
+    sync_records,
+    sync_rows_written,
+    sync_statements,
+)
+from ...utils import chunked, stream_json_records
+from ..cache import read_cache
+from ..dataset_version import bump_dataset_version
+from .entities import EntityType, SyncMode, SyncResult, SyncStats, WriteEngine
+from .pipeline import FullReload, IncrementalSync, SyncPipeline
+
+logger = logging.getLogger(__name__)
 
+# Called with the current phase and the records processed so far per entity
+ProgressCallback = Callable[[str, dict[str, int]], Awaitable[None]]
 
-async def clear_swapi_data(session: AsyncSession):
+
+async def clear_swapi_data(session: AsyncSession, commit: bool = True):
     """Delete all existing SWAPI-related records from the database."""
     await session.execute(delete(FilmCharacterLink))
     await session.execute(delete(FilmStarshipLink))
@@ -27,58 +61,228 @@ async def clear_swapi_data(session: AsyncSession):
     await session.execute(delete(Starship))
     await session.execute(delete(Film))
 
-    await session.commit()
-
-
-async def sync_swapi(session: AsyncSession):
-    """Sync data from SWAPI into the local database and handle their relationships."""
-    await clear_swapi_data(session)
-
-    async with httpx.AsyncClient(base_url=SWAPI_BASE_URL) as client:
-        # Fetch all endpoints concurrently
-        try:
-            responses = await asyncio.gather(
-                *(fetch_json(client, entity.endpoint) for entity in EntityType)
-            )
-        except httpx.HTTPError as e:
-            raise SwapiUnavailableError(str(e))
-        # Load ORM objects into dicts
-        entity_dicts: dict[EntityType, dict[str, EntityRecord]] = {}
-
-        for entity, data_list in zip(EntityType, responses):
-            entities = {}
-            for data in data_list:
-                parsed = entity.parsed_class.from_swapi(data)
-                obj = entity.orm_class(**parsed.model_dump())
-                session.add(obj)
-                entities[data.get("url")] = EntityRecord(orm=obj, parsed=parsed)
-            entity_dicts[entity] = entities
-
-        films_dict = entity_dicts[EntityType.FILM]
-        characters_dict = entity_dicts[EntityType.CHARACTER]
-        starships_dict = entity_dicts[EntityType.STARSHIP]
-
-        #  Build film <-> character + starship relations
-        for film_rec in films_dict.values():
-            film, film_parsed = film_rec.orm, film_rec.parsed
-            film.characters.extend(
-                characters_dict[url].orm for url in film_parsed.character_urls
-            )
-            film.starships.extend(
-                starships_dict[url].orm for url in film_parsed.starship_urls
-            )
-
-        #  Build starship <-> pilot relations
-        for starship_rec in starships_dict.values():
-            starship, starship_parsed = starship_rec.orm, starship_rec.parsed
-            starship.pilots.extend(
-                characters_dict[url].orm for url in starship_parsed.pilot_urls
-            )
-
+    if commit:
         await session.commit()
 
-        return {
-            "films": len(films_dict),
-            "characters": len(characters_dict),
-            "starships": len(starships_dict),
-        }
+
+async def sync_swapi(
+    session: AsyncSession,
+    mode: SyncMode = SyncMode.INCREMENTAL,
+    engine: WriteEngine = WriteEngine.VALUES,
+    chunk_size: int = SWAPI_SYNC_CHUNK_SIZE,
+    on_progress: Optional[ProgressCallback] = None,
+    trace_memory: bool = False,
+) -> SyncResult:
+    """Sync data from SWAPI into the local database and handle their relationships.
+
+    Each endpoint is streamed and written in chunks of `chunk_size` records,
+    all within a single transaction that is committed at the end. A run that
+    changed data bumps the dataset version in that transaction, which
+    invalidates the read cache of every worker. With `trace_memory`, the peak
+    traced Python allocation of the run is reported too.
+
+    The run is timed per phase: `fetch` (download and JSON decoding),
+    `parse` (`from_swapi`), `rows` and `links` (writing entities and link
+    tables), `finish`, `commit`, `progress` reporting, and `clear`, which
+    empties the tables of a full reload. Its statistics are returned,
+    recorded as metrics and logged.
+    """
+    stats = SyncStats()
+    responses: list[httpx.Response] = []
+    start = perf_counter()
+
+    async def report(phase: str):
+        if on_progress:
+            with stats.phase("progress"):
+                await on_progress(phase, _processed(pipeline))
+
+    async def on_response(response: httpx.Response):
+        responses.append(response)
+
+    # Statements of the sync are counted apart from the request that started it
+    work = RequestMetrics()
+    token = current_request.set(work)
+    try:
+        with _peak_memory(trace_memory) as memory:
+            with stats.phase("clear"):
+                pipeline = await _start_pipeline(session, mode, engine, stats)
+
+            async with httpx.AsyncClient(
+                base_url=SWAPI_BASE_URL, event_hooks={"response": [on_response]}
+            ) as client:
+                for entity in EntityType.sync_order():
+                    records = stream_json_records(client, entity.endpoint)
+                    chunks = _timed(chunked(records, chunk_size), stats, "fetch")
+                    try:
+                        async for chunk in chunks:
+                            with stats.phase("parse"):
+                                parsed = [
+                                    entity.parsed_class.from_swapi(d) for d in chunk
+                                ]
+                            await pipeline.write_chunk(entity, parsed)
+                            await report(entity.label)
+                    except httpx.HTTPError as e:
+                        raise SwapiUnavailableError(str(e))
+
+            await report("finalizing")
+            with stats.phase("finish"):
+                await pipeline.finish()
+                stamp = await _bump_if_changed(session, pipeline)
+            await report("committing")
+            with stats.phase("commit"):
+                await session.commit()
+            if stamp is not None:
+                read_cache.observe_version(*stamp)
+    finally:
+        current_request.reset(token)
+
+    # Bodies are fully read by now, so the downloaded sizes are final
+    stats.bytes_fetched = sum(r.num_bytes_downloaded for r in responses)
+    stats.statements = work.statements
+    result = _result(pipeline, mode, chunk_size, memory["peak"], perf_counter() - start)
+    _record(result, engine)
+    return result
+
+
+async def apply_swapi(
+    session: AsyncSession,
+    parsed: dict[EntityType, Iterable[BaseModel]],
+    mode: SyncMode = SyncMode.INCREMENTAL,
+    engine: WriteEngine = WriteEngine.VALUES,
+    chunk_size: int = SWAPI_SYNC_CHUNK_SIZE,
+    trace_memory: bool = False,
+) -> SyncResult:
+    """Write already parsed SWAPI records through the sync pipeline without
+    committing."""
+    stats = SyncStats()
+    start = perf_counter()
+    with _peak_memory(trace_memory) as memory:
+        with stats.phase("clear"):
+            pipeline = await _start_pipeline(session, mode, engine, stats)
+        for entity in EntityType.sync_order():
+            async for chunk in chunked(_aiter(parsed[entity]), chunk_size):
+                await pipeline.write_chunk(entity, chunk)
+        with stats.phase("finish"):
+            await pipeline.finish()
+
+    return _result(pipeline, mode, chunk_size, memory["peak"], perf_counter() - start)
+
+
+async def _start_pipeline(
+    session: AsyncSession, mode: SyncMode, engine: WriteEngine, stats: SyncStats
+) -> SyncPipeline:
+    """Create the pipeline for `mode`, emptying the tables for a full reload."""
+    if mode is SyncMode.INCREMENTAL:
+        return IncrementalSync(session, engine, stats)
+
+    # Clear and reload in one transaction so readers never see empty tables
+    await clear_swapi_data(session, commit=False)
+    return FullReload(session, engine, stats)
+
+
+async def _bump_if_changed(
+    session: AsyncSession, pipeline: SyncPipeline
+) -> Optional[tuple[int, datetime]]:
+    """Bump the dataset version unless the run left every table unchanged."""
+    changed = any(
+        counts.inserted or counts.updated or counts.deleted
+        for counts in pipeline.changes.values()
+    )
+    if not changed:
+        return None
+    return await bump_dataset_version(session)
+
+
+def _result(
+    pipeline: SyncPipeline,
+    mode: SyncMode,
+    chunk_size: int,
+    peak: Optional[int],
+    elapsed: float,
+) -> SyncResult:
+    """Summarize a finished pipeline run."""
+    synced = _processed(pipeline)
+    stats = pipeline.stats
+    stats.elapsed_seconds = elapsed
+    stats.records_per_second = sum(synced.values()) / elapsed if elapsed else 0.0
+    stats.rows_written = {
+        label: counts.inserted + counts.updated + counts.deleted
+        for label, counts in pipeline.changes.items()
+    }
+    return SyncResult(
+        mode=mode,
+        synced_entities=synced,
+        changes=pipeline.changes,
+        chunk_size=chunk_size,
+        peak_memory_bytes=peak,
+        stats=stats,
+    )
+
+
+def _record(result: SyncResult, engine: WriteEngine):
+    """Record a successful sync as metrics and one structured log line."""
+    stats, mode = result.stats, result.mode.value
+    sync_duration.observe(stats.elapsed_seconds, mode=mode, engine=engine.value)
+    for phase, seconds in stats.phase_seconds.items():
+        sync_phase_time.observe(seconds, mode=mode, phase=phase)
+    for entity, count in result.synced_entities.items():
+        sync_records.inc(count, entity=entity)
+    sync_bytes_fetched.inc(stats.bytes_fetched)
+    sync_statements.inc(stats.statements)
+    for table, rows in stats.rows_written.items():
+        sync_rows_written.inc(rows, table=table)
+
+    summary = {
+        "event": "sync_finished",
+        "mode": mode,
+        "engine": engine.value,
+        "chunk_size": result.chunk_size,
+        "records": result.synced_entities,
+        "peak_memory_bytes": result.peak_memory_bytes,
+        **asdict(stats),
+    }
+    logger.info("%s", json.dumps(summary, sort_keys=True), extra={"sync": summary})
+
+
+def _processed(pipeline: SyncPipeline) -> dict[str, int]:
+    """Return the number of distinct records written so far per entity."""
+    return {entity.label: len(pipeline.ids[entity]) for entity in EntityType}
+
+
+@contextmanager
+def _peak_memory(enabled: bool) -> Iterator[dict[str, Optional[int]]]:
+    """Measure the peak traced Python allocation size inside the block.
+
+    Tracing slows every allocation in the process, including requests served
+    alongside a background sync, so it only runs when `enabled`. A tracer
+    started elsewhere is left alone and nothing is measured.
+    """
+    memory = {"peak": None}
+    if not enabled or tracemalloc.is_tracing():
+        yield memory
+        return
+    tracemalloc.start()
+    try:
+        yield memory
+    finally:
+        memory["peak"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+
+async def _timed(
+    chunks: AsyncIterator[list], stats: SyncStats, phase: str
+) -> AsyncIterator[list]:
+    """Yield from `chunks`, adding the time spent waiting for each to `phase`."""
+    while True:
+        with stats.phase(phase):
+            try:
+                chunk = await anext(chunks)
+            except StopAsyncIteration:
+                return
+        yield chunk
+
+
+async def _aiter(records: Iterable) -> AsyncIterable:
+    """Adapt a plain iterable to the async stream the pipeline consumes."""
+    for record in records:
+        yield record
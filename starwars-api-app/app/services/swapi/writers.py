@@ -0,0 +1,77 @@
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import SQLModel
+
+from .entities import EntityType, LinkType, WriteEngine
+
+# PostgreSQL caps a single statement at 32767 bind parameters
+MAX_BIND_PARAMS = 32767
+
+
+def link_pairs(
+    link: LinkType,
+    records: list[BaseModel],
+    ids: dict[EntityType, dict[str, UUID]],
+) -> set[tuple[UUID, UUID]]:
+    """Resolve the URL lists on parsed owner records into link-table id pairs.
+
+    URLs of records that SWAPI did not return are skipped.
+    """
+    targets = ids[link.target]
+    return {
+        (ids[link.owner][parsed.swapi_url], targets[url])
+        for parsed in records
+        for url in link.target_urls(parsed)
+        if url in targets
+    }
+
+
+def link_rows(link: LinkType, pairs: set[tuple[UUID, UUID]]) -> list[dict]:
+    """Turn `(owner_id, target_id)` pairs into link-table rows."""
+    owner, target = link.owner_column.name, link.target_column.name
+    return [{owner: owner_id, target: target_id} for owner_id, target_id in pairs]
+
+
+async def write_rows(
+    session: AsyncSession,
+    model: type[SQLModel],
+    rows: list[dict],
+    engine: WriteEngine,
+):
+    """Insert rows with pre-assigned keys into the model's table using `engine`."""
+    if not rows:
+        return
+
+    if engine is WriteEngine.ORM:
+        session.add_all([model(**row) for row in rows])
+        await session.flush()
+    elif engine is WriteEngine.VALUES:
+        await _insert_values(session, model.__table__, rows)
+    else:
+        await _copy_records(session, model.__table__, rows)
+
+
+async def _insert_values(session: AsyncSession, table, rows: list[dict]):
+    """Write rows as multi-row `INSERT ... VALUES` statements."""
+    batch_size = max(1, MAX_BIND_PARAMS // len(rows[0]))
+    for start in range(0, len(rows), batch_size):
+        await session.execute(insert(table).values(rows[start : start + batch_size]))
+
+
+async def _copy_records(session: AsyncSession, table, rows: list[dict]):
+    """Stream rows through asyncpg's binary `COPY ... FROM STDIN`.
+
+    The copy runs on the session's own connection, so it is part of the
+    transaction opened by the statements issued earlier in the sync.
+    """
+    columns = list(rows[0])
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        table.name,
+        records=[tuple(row[column] for column in columns) for row in rows],
+        columns=columns,
+    )
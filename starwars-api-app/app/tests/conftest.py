@@ -0,0 +1,50 @@
+import pytest
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.database.models import DatasetVersion
+
+# -------------------------
+# Async facade over in-memory SQLite
+# -------------------------
+
+
+class SQLiteSession:
+    """Async facade over a synchronous SQLite session that records statements."""
+
+    def __init__(self, session: Session):
+        self.session = session
+        self.statements = []
+
+    async def execute(self, statement, params=None):
+        self.statements.append(statement)
+        return self.session.execute(statement, params)
+
+    async def get(self, model, id):
+        return self.session.get(model, id)
+
+    def add_all(self, objects):
+        self.session.add_all(objects)
+
+    async def flush(self):
+        self.session.flush()
+
+    async def commit(self):
+        self.session.commit()
+
+    async def rollback(self):
+        self.session.rollback()
+
+    @property
+    def writes(self):
+        return [s for s in self.statements if not s.is_select]
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite:///:memory:")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        # Seeded by the migration in a real database
+        session.add(DatasetVersion(id=1, version=0))
+        session.commit()
+        yield SQLiteSession(session)
@@ -0,0 +1,74 @@
+from app.services.cache import ReadCache, estimate_size
+
+# -------------------------
+# Test ReadCache
+# -------------------------
+
+
+def make_cache(**kwargs):
+    return ReadCache(**{"max_bytes": 1024 * 1024, "max_entries": 100, **kwargs})
+
+
+def test_get_counts_hits_and_misses():
+    cache = make_cache()
+
+    assert cache.get("a") is None
+    cache.put("a", "value", cache.generation)
+    assert cache.get("a") == "value"
+
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_put_evicts_least_recently_used_entry():
+    cache = make_cache(max_entries=2)
+    cache.put("a", 1, cache.generation)
+    cache.put("b", 2, cache.generation)
+    cache.get("a")
+
+    cache.put("c", 3, cache.generation)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats.evictions == 1
+
+
+def test_put_respects_memory_bound():
+    value = "x" * 100
+    cache = make_cache(max_bytes=estimate_size(value) * 2)
+
+    for key in range(5):
+        cache.put(key, value, cache.generation)
+
+    assert len(cache) == 2
+    assert cache.size_bytes <= cache.max_bytes
+    assert cache.stats.evictions == 3
+
+
+def test_put_skips_value_larger_than_bound():
+    cache = make_cache(max_bytes=10)
+
+    cache.put("a", "x" * 100, cache.generation)
+
+    assert len(cache) == 0
+
+
+def test_invalidate_drops_entries_and_rejects_stale_loads():
+    cache = make_cache()
+    cache.put("a", 1, cache.generation)
+    generation = cache.generation
+
+    cache.invalidate()
+    # A value loaded before the invalidation must not be stored
+    cache.put("b", 2, generation)
+
+    assert len(cache) == 0
+    assert cache.size_bytes == 0
+    assert cache.stats.invalidations == 1
+
+
+def test_disabled_cache_stores_nothing():
+    cache = make_cache(enabled=False)
+
+    cache.put("a", 1, cache.generation)
+
+    assert len(cache) == 0
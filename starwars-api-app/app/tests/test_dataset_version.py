@@ -0,0 +1,115 @@
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.cache import ReadCache
+from app.services.dataset_version import (
+    DATASET_VERSION_CHANNEL,
+    DatasetVersionWatcher,
+)
+
+# -------------------------
+# Helpers
+# -------------------------
+
+
+def make_cache():
+    cache = ReadCache(max_bytes=1024 * 1024, max_entries=100)
+    cache.observe_version(1)
+    cache.put("films", "cached", cache.generation)
+    return cache
+
+
+def make_connection(versions: list[int]):
+    """Returns an AsyncMock connection whose version query yields `versions`."""
+    driver = AsyncMock()
+    raw_connection = MagicMock(driver_connection=driver)
+    connection = AsyncMock()
+    connection.get_raw_connection.return_value = raw_connection
+    results = []
+    for version in versions:
+        result = MagicMock()
+        result.one.return_value = (version, datetime.now(timezone.utc))
+        results.append(result)
+    connection.execute.side_effect = results
+    return connection, driver
+
+
+# -------------------------
+# Test ReadCache.observe_version
+# -------------------------
+
+
+def test_observe_same_version_keeps_entries():
+    cache = make_cache()
+
+    cache.observe_version(1)
+
+    assert cache.get("films") == "cached"
+
+
+def test_observe_new_version_invalidates():
+    cache = make_cache()
+
+    cache.observe_version(2)
+
+    assert cache.get("films") is None
+    assert cache.version == 2
+
+
+def test_late_notification_of_older_version_is_ignored():
+    cache = make_cache()
+    cache.observe_version(3)
+    cache.put("films", "cached", cache.generation)
+    listener = MagicMock()
+    cache.version_listeners.append(listener)
+    watcher = DatasetVersionWatcher(AsyncMock(), cache, poll_interval=1)
+
+    payload = '{"version" : 2, "updated_at" : "2026-10-18T12:00:00.5+02:00"}'
+    watcher._on_notify(None, 1234, DATASET_VERSION_CHANNEL, payload)
+
+    assert cache.version == 3
+    assert cache.get("films") == "cached"
+    listener.assert_not_called()
+
+
+# -------------------------
+# Test DatasetVersionWatcher
+# -------------------------
+
+
+def test_notification_invalidates_cache():
+    cache = make_cache()
+    watcher = DatasetVersionWatcher(AsyncMock(), cache, poll_interval=1)
+
+    payload = '{"version" : 2, "updated_at" : "2026-10-18T12:00:00.5+02:00"}'
+
+    watcher._on_notify(None, 1234, DATASET_VERSION_CHANNEL, payload)
+
+    assert len(cache) == 0
+    assert cache.version == 2
+    assert cache.updated_at == datetime(2026, 10, 18, 10, 0, 0, 500000, timezone.utc)
+
+
+@pytest.mark.asyncio
+async def test_watch_listens_and_polls_until_cancelled():
+    cache = make_cache()
+    watcher = DatasetVersionWatcher(AsyncMock(), cache, poll_interval=1)
+    connection, driver = make_connection([1, 3])
+
+    sleep = AsyncMock(side_effect=[None, asyncio.CancelledError()])
+    with patch("app.services.dataset_version.asyncio.sleep", sleep):
+        with pytest.raises(asyncio.CancelledError):
+            await watcher._watch(connection)
+
+    driver.add_listener.assert_awaited_once_with(
+        DATASET_VERSION_CHANNEL, watcher._on_notify
+    )
+    driver.remove_listener.assert_awaited_once()
+    # The second poll picked up a bump whose notification was missed
+    assert cache.version == 3
+    assert cache.stats.invalidations == 2
+    # Each poll ends its transaction so notifications can be delivered
+    assert connection.commit.await_count == 2
@@ -1,6 +1,9 @@
+from datetime import datetime, timezone
 from unittest.mock import AsyncMock, patch
 from uuid import uuid4
 
+import httpx
+import pytest
 from fastapi.testclient import TestClient
 
 from app.api.schemas import (
@@ -12,30 +15,147 @@ from app.api.schemas import (
     StarshipRead,
     UUIDRef,
 )
+from app.config import cache_settings
+from app.database.models import Character, Film, Starship, SyncJob
+from app.api.dependencies import get_read_session
+from app.database.session import get_session
 from app.main import app
+from app.services.cache import ReadCache, read_cache
 
 client = TestClient(app)
 
+# Routes import the sync jobs module on first use, so it is patched at source
+JOBS = "app.services.swapi.jobs"
+
 
 # -----------------------------
 # /api/sync
 # -----------------------------
+def make_job(**kwargs):
+    return SyncJob(
+        id=uuid4(),
+        status="running",
+        phase="characters",
+        mode="incremental",
+        engine="values",
+        chunk_size=500,
+        progress={"characters": 40},
+        created_at=datetime.now(timezone.utc),
+        started_at=datetime.now(timezone.utc),
+        **kwargs,
+    )
+
+
 def test_sync_data():
-    mock_response = {"films": 3, "characters": 10, "starships": 5}
+    job = make_job()
+
+    with patch(f"{JOBS}.enqueue_sync", new_callable=AsyncMock) as mock_enqueue:
+        mock_enqueue.return_value = (job, False)
+
+        response = client.post("/api/sync?mode=full&chunk_size=100")
+        assert response.status_code == 202
+        data = response.json()
+        assert data["id"] == str(job.id)
+        assert data["coalesced"] is False
+        assert mock_enqueue.await_args.kwargs["chunk_size"] == 100
+        assert mock_enqueue.await_args.kwargs["trace_memory"] is False
+
+
+def test_sync_data_traces_memory_when_asked():
+    with patch(f"{JOBS}.enqueue_sync", new_callable=AsyncMock) as mock_enqueue:
+        mock_enqueue.return_value = (make_job(), False)
+
+        response = client.post("/api/sync?trace_memory=true")
+        assert response.status_code == 202
+        assert mock_enqueue.await_args.kwargs["trace_memory"] is True
 
-    with patch("app.api.router.sync_swapi", new_callable=AsyncMock) as mock_sync:
-        mock_sync.return_value = mock_response
+
+def test_sync_data_coalesces_running_job():
+    job = make_job()
+
+    with patch(f"{JOBS}.enqueue_sync", new_callable=AsyncMock) as mock_enqueue:
+        mock_enqueue.return_value = (job, True)
 
         response = client.post("/api/sync")
+        assert response.status_code == 202
+        assert response.json()["coalesced"] is True
+
+
+def test_get_sync_status():
+    job = make_job(result={"status": "success", "synced_entities": {"films": 6}})
+    job.status = "succeeded"
+    job.finished_at = datetime.now(timezone.utc)
+
+    with patch(f"{JOBS}.get_sync_job", new_callable=AsyncMock) as mock_get:
+        mock_get.return_value = job
+
+        response = client.get(f"/api/sync/{job.id}")
         assert response.status_code == 200
         data = response.json()
-        assert data["status"] == "success"
-        assert data["synced_entities"]["films"] == 3
+        assert data["status"] == "succeeded"
+        assert data["progress"] == {"characters": 40}
+        assert data["result"]["synced_entities"]["films"] == 6
+        assert data["elapsed_seconds"] >= 0
+
+
+# -----------------------------
+# /api/cache/stats
+# -----------------------------
+def test_get_cache_stats():
+    response = client.get("/api/cache/stats")
+    assert response.status_code == 200
+    data = response.json()
+    assert {"hits", "misses", "evictions", "size_bytes"} <= data.keys()
+
+
+# -----------------------------
+# /api/database/pool
+# -----------------------------
+def test_get_pool_stats():
+    response = client.get("/api/database/pool")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["size"] == 5
+    assert {"checked_out", "overflow", "timeouts", "wait_seconds_max"} <= data.keys()
 
 
 # -----------------------------
 # /api/films
 # -----------------------------
+def make_film_page(size):
+    films = [
+        FilmRead(
+            id=uuid4(),
+            title=f"Film {i}",
+            episode_id=i,
+            opening_crawl="",
+            director="George Lucas",
+            producer="Gary Kurtz",
+            release_date="1977-05-25",
+            characters=[],
+            starships=[],
+        )
+        for i in range(size)
+    ]
+    return PaginatedFilmRead(total=size, offset=0, limit=size, items=films)
+
+
+def test_get_films_streams_large_pages():
+    with patch(
+        "app.services.get_services.FilmGetService.get_paginated", new_callable=AsyncMock
+    ) as mock_pg:
+        mock_pg.return_value = large = make_film_page(60)
+        streamed = client.get("/api/films?limit=60")
+        mock_pg.return_value = small = make_film_page(10)
+        encoded = client.get("/api/films?limit=10")
+
+    # Streamed bodies are sent in chunks, without a Content-Length
+    assert "content-length" not in streamed.headers
+    assert streamed.json() == large.model_dump(mode="json")
+    assert "content-length" in encoded.headers
+    assert encoded.json() == small.model_dump(mode="json")
+
+
 def test_get_films():
     mock_film = FilmRead(
         id=uuid4(),
@@ -67,6 +187,121 @@ def test_get_films():
         assert data["items"][0]["title"] == "A New Hope"
 
 
+@pytest.fixture
+def known_version():
+    """Pretend this worker has seen dataset version 7."""
+    cache = ReadCache(max_bytes=1024, max_entries=10)
+    cache.observe_version(7, datetime(2026, 10, 18, 12, 0, 30, tzinfo=timezone.utc))
+    with patch("app.api.http_cache.read_cache", cache):
+        yield cache
+
+
+def test_get_films_sets_validators(known_version):
+    with patch(
+        "app.services.get_services.FilmGetService.get_paginated", new_callable=AsyncMock
+    ) as mock_pg:
+        mock_pg.return_value = PaginatedFilmRead(total=0, offset=0, limit=10, items=[])
+
+        response = client.get("/api/films?title=hope")
+        other_page = client.get("/api/films?title=hope&offset=10")
+
+    assert response.headers["etag"].startswith('"7-')
+    assert response.headers["etag"] != other_page.headers["etag"]
+    assert response.headers["last-modified"] == "Sun, 18 Oct 2026 12:00:30 GMT"
+    assert "must-revalidate" in response.headers["cache-control"]
+
+
+def test_get_films_not_modified_skips_service(known_version):
+    with patch(
+        "app.services.get_services.FilmGetService.get_paginated", new_callable=AsyncMock
+    ) as mock_pg:
+        mock_pg.return_value = PaginatedFilmRead(total=0, offset=0, limit=10, items=[])
+        etag = client.get("/api/films").headers["etag"]
+        mock_pg.reset_mock()
+
+        response = client.get("/api/films", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    mock_pg.assert_not_awaited()
+
+
+def test_get_films_if_modified_since(known_version):
+    with patch(
+        "app.services.get_services.FilmGetService.get_paginated", new_callable=AsyncMock
+    ) as mock_pg:
+        mock_pg.return_value = PaginatedFilmRead(total=0, offset=0, limit=10, items=[])
+
+        fresh = client.get(
+            "/api/films", headers={"If-Modified-Since": "Sun, 18 Oct 2026 12:00:30 GMT"}
+        )
+        stale = client.get(
+            "/api/films", headers={"If-Modified-Since": "Sun, 18 Oct 2026 11:00:00 GMT"}
+        )
+
+    assert fresh.status_code == 304
+    assert stale.status_code == 200
+
+
+@pytest.mark.parametrize(
+    "since",
+    [
+        "Sun, 18 Oct 2026 12:00:30 -0000",
+        "Sunday, 18-Oct-26 12:00:30 GMT",
+        "Sun Oct 18 12:00:30 2026",
+    ],
+)
+def test_get_films_if_modified_since_without_zone(known_version, since):
+    with patch(
+        "app.services.get_services.FilmGetService.get_paginated", new_callable=AsyncMock
+    ) as mock_pg:
+        mock_pg.return_value = PaginatedFilmRead(total=0, offset=0, limit=10, items=[])
+
+        response = client.get("/api/films", headers={"If-Modified-Since": since})
+
+    # Read as UTC rather than failing to compare with an aware date
+    assert response.status_code == 304
+
+
+def test_stale_etag_after_sync_returns_full_response(known_version):
+    with patch(
+        "app.services.get_services.FilmGetService.get_paginated", new_callable=AsyncMock
+    ) as mock_pg:
+        mock_pg.return_value = PaginatedFilmRead(total=0, offset=0, limit=10, items=[])
+        etag = client.get("/api/films").headers["etag"]
+        known_version.observe_version(8)
+
+        response = client.get("/api/films", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["etag"].startswith('"8-')
+
+
+def test_cache_control_is_configurable_per_route(known_version):
+    routes = {"/api/films/{id}": "public, max-age=60"}
+    with (
+        patch.dict(cache_settings.HTTP_CACHE_CONTROL_ROUTES, routes),
+        patch(
+            "app.services.get_services.FilmGetService.get", new_callable=AsyncMock
+        ) as mock_get,
+    ):
+        mock_get.return_value = FilmRead(
+            id=uuid4(),
+            title="A New Hope",
+            episode_id=4,
+            opening_crawl="",
+            director="George Lucas",
+            producer="Gary Kurtz",
+            release_date="1977-05-25",
+            characters=[],
+            starships=[],
+        )
+        detail = client.get(f"/api/films/{uuid4()}")
+
+    assert detail.headers["cache-control"] == "public, max-age=60"
+
+
 def test_get_film_by_id():
     film_id = uuid4()
     mock_film = FilmRead(
@@ -92,6 +327,33 @@ def test_get_film_by_id():
         assert data["title"] == "Empire Strikes Back"
 
 
+def test_get_film_by_id_without_bytes_cache(known_version):
+    film = FilmRead(
+        id=uuid4(),
+        title="Return of the Jedi",
+        episode_id=6,
+        opening_crawl="Some crawl text",
+        director="Richard Marquand",
+        producer="Howard Kazanjian",
+        release_date="1983-05-25",
+        characters=[UUIDRef(id=uuid4())],
+        starships=[],
+    )
+
+    with patch(
+        "app.services.get_services.FilmGetService.get", new_callable=AsyncMock
+    ) as mock_get:
+        mock_get.return_value = film
+        cached = client.get(f"/api/films/{film.id}")
+        with patch.object(cache_settings, "DETAIL_BYTES_CACHE_ENABLED", False):
+            encoded = client.get(f"/api/films/{film.id}")
+
+    assert cached.json() == encoded.json() == film.model_dump(mode="json")
+    assert cached.headers["content-type"] == "application/json"
+    assert cached.headers["etag"] == encoded.headers["etag"]
+    assert cached.headers["cache-control"] == encoded.headers["cache-control"]
+
+
 # -----------------------------
 # /api/characters
 # -----------------------------
@@ -129,6 +391,44 @@ def test_get_characters():
         assert data["items"][0]["name"] == "Luke Skywalker"
 
 
+def test_get_characters_passes_cursor():
+    with patch(
+        "app.services.get_services.CharacterGetService.get_paginated",
+        new_callable=AsyncMock,
+    ) as mock_pg:
+        mock_pg.return_value = PaginatedCharacterRead(
+            total=0, limit=10, items=[], next_cursor="abc"
+        )
+
+        response = client.get("/api/characters?cursor=xyz")
+        assert response.status_code == 200
+        assert response.json()["next_cursor"] == "abc"
+        assert response.json()["offset"] is None
+        assert mock_pg.await_args.kwargs["cursor"] == "xyz"
+
+
+def test_get_characters_passes_total_mode():
+    with patch(
+        "app.services.get_services.CharacterGetService.get_paginated",
+        new_callable=AsyncMock,
+    ) as mock_pg:
+        mock_pg.return_value = PaginatedCharacterRead(
+            total_mode="none", limit=10, items=[], has_more=True
+        )
+
+        response = client.get("/api/characters?total=none")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] is None
+        assert (data["total_mode"], data["has_more"]) == ("none", True)
+        assert mock_pg.await_args.kwargs["total_mode"] == "none"
+
+
+def test_get_characters_rejects_malformed_cursor():
+    response = client.get("/api/characters?cursor=not-a-cursor")
+    assert response.status_code == 400
+
+
 def test_get_character_by_id():
     char_id = uuid4()
     mock_char = CharacterRead(
@@ -228,3 +528,188 @@ def test_get_starship_by_id():
         assert response.status_code == 200
         data = response.json()
         assert data["name"] == "TIE Fighter"
+
+
+# -----------------------------
+# SQL statement budget per endpoint
+# -----------------------------
+# Exact-total pages run a count and a page query; details run one query
+STATEMENT_BUDGET = {"list": 2, "detail": 1}
+
+
+@pytest.fixture
+def linked_rows(db):
+    """Serve requests from the SQLite database, seeded with one linked row of
+    each entity, with a cold read cache."""
+    luke = Character(
+        name="Luke Skywalker",
+        hair_color="Blond",
+        skin_color="Fair",
+        eye_color="Blue",
+        gender="Male",
+        birth_year="19BBY",
+        swapi_url="https://swapi.dev/api/people/1/",
+    )
+    xwing = Starship(
+        name="X-wing",
+        model="T-65 X-wing",
+        manufacturer="Incom Corporation",
+        crew="1",
+        consumables="1 week",
+        starship_class="Starfighter",
+        swapi_url="https://swapi.dev/api/starships/12/",
+        pilots=[luke],
+    )
+    film = Film(
+        title="A New Hope",
+        episode_id=4,
+        opening_crawl="It is a period of civil war...",
+        director="George Lucas",
+        producer="Gary Kurtz",
+        release_date=datetime(1977, 5, 25),
+        swapi_url="https://swapi.dev/api/films/1/",
+        characters=[luke],
+        starships=[xwing],
+    )
+    db.add_all([film])
+    db.session.commit()
+    ids = {"films": film.id, "characters": luke.id, "starships": xwing.id}
+
+    app.dependency_overrides[get_session] = lambda: db
+    app.dependency_overrides[get_read_session] = lambda: db
+    read_cache.invalidate()
+    yield ids
+    read_cache.invalidate()
+    app.dependency_overrides.pop(get_session)
+    app.dependency_overrides.pop(get_read_session)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("resource", ["films", "characters", "starships"])
+async def test_endpoints_stay_within_statement_budget(db, linked_rows, resource):
+    # In-process so the SQLite connection stays on this thread
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+        db.statements.clear()
+        listing = await ac.get(f"/api/{resource}")
+        list_statements = len(db.statements)
+
+        db.statements.clear()
+        detail = await ac.get(f"/api/{resource}/{linked_rows[resource]}")
+        detail_statements = len(db.statements)
+
+    assert listing.status_code == detail.status_code == 200
+    assert listing.json()["total"] == 1
+    assert list_statements <= STATEMENT_BUDGET["list"]
+    assert detail_statements <= STATEMENT_BUDGET["detail"]
+
+
+# -----------------------------
+# /metrics
+# -----------------------------
+@pytest.mark.asyncio
+async def test_metrics_record_statements_and_response_size(linked_rows):
+    route = 'method="GET",route="/api/films/{id}"'
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+        before = metric_samples(await ac.get("/metrics"))
+        detail = await ac.get(f"/api/films/{linked_rows['films']}")
+        after = metric_samples(await ac.get("/metrics"))
+
+    def added(name):
+        return after[name] - before.get(name, 0)
+
+    assert added(f"http_request_duration_seconds_count{{{route},status=\"200\"}}") == 1
+    assert added(f"http_request_db_statements_sum{{{route}}}") >= 1
+    assert added(f"http_request_db_seconds_sum{{{route}}}") > 0
+    assert added(f"http_request_serialization_seconds_sum{{{route}}}") > 0
+    assert added(f"http_response_size_bytes_sum{{{route}}}") == len(detail.content)
+
+
+def metric_samples(response) -> dict[str, float]:
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    return {
+        line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1])
+        for line in response.text.splitlines()
+        if not line.startswith("#")
+    }
+
+
+# -----------------------------
+# fields= and expand=
+# -----------------------------
+@pytest.mark.asyncio
+async def test_fields_and_expand_shape_items(linked_rows):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+        sparse = await ac.get("/api/films?fields=title&fields=starships")
+        expanded = await ac.get(
+            f"/api/starships/{linked_rows['starships']}?fields=name&expand=pilots"
+        )
+        unknown = await ac.get("/api/films?fields=swapi_url")
+
+    assert sparse.json()["items"] == [
+        {"title": "A New Hope", "starships": [{"id": str(linked_rows["starships"])}]}
+    ]
+    pilots = expanded.json()["pilots"]
+    assert expanded.json()["name"] == "X-wing"
+    assert [(p["id"], p["name"]) for p in pilots] == [
+        (str(linked_rows["characters"]), "Luke Skywalker")
+    ]
+    assert unknown.status_code == 400
+
+
+# -----------------------------
+# Batch lookup by ids
+# -----------------------------
+@pytest.mark.asyncio
+async def test_batch_lookup_by_query_and_body(linked_rows):
+    luke, unknown = str(linked_rows["characters"]), str(uuid4())
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+        by_query = await ac.get(f"/api/characters?ids={unknown},{luke}")
+        by_body = await ac.post(
+            "/api/characters/batch", json={"ids": [luke], "fields": ["id", "name"]}
+        )
+
+    assert by_query.status_code == 200
+    assert [c["name"] for c in by_query.json()["items"]] == ["Luke Skywalker"]
+    assert by_query.json()["missing"] == [unknown]
+    assert by_body.json() == {
+        "items": [{"id": luke, "name": "Luke Skywalker"}],
+        "missing": [],
+    }
+
+
+# -----------------------------
+# Graph traversal
+# -----------------------------
+@pytest.mark.asyncio
+async def test_traverse_film_to_pilots(linked_rows):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get(
+            f"/api/films/{linked_rows['films']}/traverse?path=starships,pilots"
+        )
+        too_deep = await ac.get(
+            f"/api/films/{linked_rows['films']}/traverse?path=characters,"
+            + ",".join(["films", "characters"] * 2)
+        )
+
+    assert response.status_code == 200
+    assert response.json()["items"] == [
+        {"id": str(linked_rows["characters"]), "count": 1}
+    ]
+    assert too_deep.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_count_starship_relations(linked_rows):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get(f"/api/starships/{linked_rows['starships']}/counts")
+        missing = await ac.get(f"/api/starships/{uuid4()}/counts")
+
+    assert response.status_code == 200
+    assert response.json()["counts"] == {"pilots": 1, "films": 1}
+    assert missing.status_code == 404
@@ -1,10 +1,23 @@
+from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock
 from uuid import uuid4
 
 import pytest
 
-from app.api.schemas import PaginatedResponse
+from sqlalchemy.dialects import postgresql
+
+from app.api.schemas import CharacterRead, FilmRead, PaginatedResponse, TotalMode
 from app.database.models import Character, Film, Starship
+from app.database.explain import Explain
+from app.exceptions import (
+    InvalidBatchError,
+    InvalidCursorError,
+    InvalidFieldError,
+    InvalidPathError,
+)
+from app.services.cache import ReadCache
+from app.services.graph import AdjacencyIndexHolder, build_adjacency_index
+from app.services.snapshot import build_dataset_snapshot
 from app.services.get_services import (
     CharacterGetService,
     FilmGetService,
@@ -22,21 +35,25 @@ from app.services.get_services import (
 async def test_get_returns_entity():
     mock_session = AsyncMock()
     entity_id = uuid4()
-    mock_entity = Character(id=entity_id, name="Luke Skywalker")
-    mock_session.get.return_value = mock_entity
+    mock_row = MagicMock(id=entity_id, name="Luke Skywalker")
+    mock_result = MagicMock()
+    mock_result.first.return_value = mock_row
+    mock_session.execute.return_value = mock_result
 
     service = GetService(Character, session=mock_session)
     result = await service.get(entity_id)
 
-    assert result == mock_entity
-    mock_session.get.assert_awaited_once_with(Character, entity_id)
+    assert result == mock_row
+    mock_session.execute.assert_awaited_once()
 
 
 @pytest.mark.asyncio
 async def test_get_raises_not_found():
     mock_session = AsyncMock()
     entity_id = uuid4()
-    mock_session.get.return_value = None
+    mock_result = MagicMock()
+    mock_result.first.return_value = None
+    mock_session.execute.return_value = mock_result
 
     service = GetService(Character, session=mock_session)
     with pytest.raises(NotFoundError):
@@ -45,12 +62,12 @@ async def test_get_raises_not_found():
 
 @pytest.mark.asyncio
 async def test_get_paginated_returns_items():
-    # Sample items
-    items = [Character(id=uuid4(), name="Luke"), Character(id=uuid4(), name="Leia")]
+    # Sample rows
+    items = [MagicMock(id=uuid4(), name="Luke"), MagicMock(id=uuid4(), name="Leia")]
 
     # Mock result object returned by session.execute()
     mock_result = MagicMock()
-    mock_result.scalars.return_value.all.return_value = items
+    mock_result.all.return_value = items
     mock_result.scalar_one.return_value = len(items)
 
     # Mock AsyncSession
@@ -70,6 +87,909 @@ async def test_get_paginated_returns_items():
     mock_session.execute.assert_called()  # ensure execute was called
 
 
+# -------------------------
+# Helpers: rows in the in-memory SQLite database
+# -------------------------
+
+
+def make_character(name="Luke", **kwargs):
+    kwargs.setdefault("swapi_url", f"people/{uuid4()}")
+    return Character(
+        name=name,
+        hair_color="blond",
+        skin_color="fair",
+        eye_color="blue",
+        gender="male",
+        birth_year="19BBY",
+        **kwargs,
+    )
+
+
+def make_film(title="A New Hope", **kwargs):
+    kwargs.setdefault("swapi_url", f"films/{uuid4()}")
+    return Film(
+        title=title,
+        episode_id=4,
+        opening_crawl="It is a period of civil war...",
+        director="George Lucas",
+        producer="Gary Kurtz",
+        release_date=datetime(1977, 5, 25),
+        **kwargs,
+    )
+
+
+def add_characters(db, names):
+    characters = [make_character(name) for name in names]
+    db.session.add_all(characters)
+    db.session.commit()
+    return characters
+
+
+def make_cached_service(session):
+    cache = ReadCache(max_bytes=1024 * 1024, max_entries=100)
+    return GetService(
+        Character, session=session, read_schema=CharacterRead, cache=cache
+    )
+
+
+def selects(db):
+    return [s for s in db.statements if s.is_select]
+
+
+# -------------------------
+# Test projection-only relationship loading
+# -------------------------
+
+
+@pytest.mark.asyncio
+async def test_get_returns_related_ids_from_link_tables(db):
+    luke, leia = add_characters(db, ["Luke", "Leia"])
+    film = Film(
+        title="A New Hope",
+        episode_id=4,
+        opening_crawl="",
+        director="",
+        producer="",
+        release_date=datetime(1977, 5, 25),
+        swapi_url="films/1",
+        characters=[luke, leia],
+    )
+    db.session.add(film)
+    db.session.commit()
+    service = FilmGetService(session=db)
+    service.cache = ReadCache(max_bytes=1024 * 1024, max_entries=100)
+
+    result = await service.get(film.id)
+
+    assert isinstance(result, FilmRead)
+    assert sorted(ref.id for ref in result.characters) == sorted([luke.id, leia.id])
+    assert result.starships == []
+    # Columns and related ids come back in a single statement
+    assert len(db.statements) == 1
+    sql = str(db.statements[0].compile(dialect=postgresql.dialect()))
+    assert "array_agg(filmcharacterlink.character_id" in sql
+    assert "JOIN character" not in sql
+
+
+@pytest.mark.asyncio
+async def test_get_paginated_builds_items_without_orm_objects(db):
+    add_characters(db, ["Anakin", "Clone"])
+    db.session.expunge_all()
+    service = make_cached_service(db)
+
+    page = await service.get_paginated(limit=10)
+
+    assert [item.name for item in page.items] == ["Anakin", "Clone"]
+    assert all(item.films == [] for item in page.items)
+    assert len(db.session.identity_map) == 0
+
+
+# -------------------------
+# Test sparse fieldsets and relation expansion
+# -------------------------
+
+
+@pytest.mark.asyncio
+async def test_fields_limit_items_and_selected_columns(db):
+    luke, leia = add_characters(db, ["Luke", "Leia"])
+    db.session.add(make_film(characters=[luke, leia]))
+    db.session.commit()
+    service = FilmGetService(session=db)
+    service.cache = ReadCache(max_bytes=1024 * 1024, max_entries=100)
+
+    page = await service.get_paginated(fields=["title,characters"])
+
+    assert page.items[0].model_dump().keys() == {"title", "characters"}
+    assert len(page.items[0].characters) == 2
+    sql = str(db.statements[-1].compile(dialect=postgresql.dialect()))
+    assert "opening_crawl" not in sql.split("FROM")[0]
+    assert "filmstarshiplink" not in sql
+
+
+@pytest.mark.asyncio
+async def test_fields_may_select_id_missing_from_read_schema(db):
+    (luke,) = add_characters(db, ["Luke"])
+    service = CharacterGetService(session=db)
+
+    result = await service.get(luke.id, fields=["id", "name"])
+
+    assert result.model_dump() == {"id": luke.id, "name": "Luke"}
+
+
+@pytest.mark.asyncio
+async def test_expand_inlines_related_objects_in_one_query(db):
+    luke, leia, han = add_characters(db, ["Luke", "Leia", "Han"])
+    db.session.add_all(
+        [
+            make_film("A New Hope", characters=[luke, leia]),
+            make_film("The Empire Strikes Back", characters=[leia, han]),
+        ]
+    )
+    db.session.commit()
+    db.statements.clear()
+    service = FilmGetService(session=db)
+    service.cache = ReadCache(max_bytes=1024 * 1024, max_entries=100)
+
+    page = await service.get_paginated(
+        total_mode=TotalMode.NONE, expand=["characters"]
+    )
+
+    names = [sorted(c.name for c in film.characters) for film in page.items]
+    assert names == [["Leia", "Luke"], ["Han", "Leia"]]
+    assert page.items[0].characters[0].id in {luke.id, leia.id}
+    # Full fields, with starships still as ids
+    assert page.items[0].starships == []
+    assert page.items[0].opening_crawl
+    # The page query plus one query for every expanded character
+    assert len(db.statements) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "fields, expand",
+    [(["name,swapi_url"], None), (["nickname"], None), (None, ["name"])],
+)
+async def test_unknown_fields_are_rejected(db, fields, expand):
+    service = CharacterGetService(session=db)
+
+    with pytest.raises(InvalidFieldError):
+        await service.get_paginated(fields=fields, expand=expand)
+
+
+# -------------------------
+# Test batch lookup by ids
+# -------------------------
+
+
+@pytest.mark.asyncio
+async def test_get_many_preserves_order_and_reports_missing(db):
+    luke, leia, han = add_characters(db, ["Luke", "Leia", "Han"])
+    unknown = uuid4()
+    service = make_cached_service(db)
+
+    batch = await service.get_many([f"{han.id},{unknown}", luke.id, han.id])
+
+    assert [c.name for c in batch.items] == ["Han", "Luke"]
+    assert batch.missing == [unknown]
+    assert len(db.statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_many_binds_ids_as_one_array():
+    result = MagicMock()
+    result.all.return_value = []
+    mock_session = AsyncMock()
+    mock_session.execute.return_value = result
+    service = GetService(Character, session=mock_session)
+
+    await service.get_many([uuid4(), uuid4(), uuid4()])
+
+    query = mock_session.execute.await_args.args[0]
+    compiled = query.compile(dialect=postgresql.dialect())
+    assert "character.id = ANY (%(param_1)s::UUID[])" in str(compiled)
+    assert len(compiled.params["param_1"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_get_many_reuses_compiled_statement_across_batch_sizes(db):
+    luke, leia, han = add_characters(db, ["Luke", "Leia", "Han"])
+    service = GetService(Character, session=db)
+    db.execute = AsyncMock(wraps=db.execute)
+
+    one = await service.get_many([leia.id])
+    three = await service.get_many([han.id, luke.id, leia.id])
+
+    first, second = (call.args[0] for call in db.execute.await_args_list)
+    assert first._generate_cache_key().key == second._generate_cache_key().key
+    assert [c.name for c in one.items] == ["Leia"]
+    assert [c.name for c in three.items] == ["Han", "Luke", "Leia"]
+
+
+@pytest.mark.asyncio
+async def test_get_many_shares_cache_with_get(db):
+    luke, leia = add_characters(db, ["Luke", "Leia"])
+    service = make_cached_service(db)
+    await service.get(luke.id)
+    db.statements.clear()
+
+    batch = await service.get_many([leia.id, luke.id])
+    again = await service.get(leia.id)
+
+    assert [c.name for c in batch.items] == ["Leia", "Luke"]
+    assert again is batch.items[0]
+    # Only Leia was queried
+    assert len(db.statements) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("ids", [["not-an-id"], [str(uuid4()) for _ in range(1001)]])
+async def test_get_many_rejects_bad_batches(db, ids):
+    service = GetService(Character, session=db)
+
+    with pytest.raises(InvalidBatchError):
+        await service.get_many(ids)
+
+
+# -------------------------
+# Test graph traversal
+# -------------------------
+
+
+@pytest.fixture
+def cast(db):
+    luke, leia, han = add_characters(db, ["Luke", "Leia", "Han"])
+    xwing = Starship(
+        name="X-wing",
+        model="T-65",
+        manufacturer="Incom",
+        crew="1",
+        consumables="1 week",
+        starship_class="Starfighter",
+        swapi_url="starships/12",
+        pilots=[luke],
+    )
+    falcon = Starship(
+        name="Millennium Falcon",
+        model="YT-1300",
+        manufacturer="Corellian",
+        crew="4",
+        consumables="2 months",
+        starship_class="Light freighter",
+        swapi_url="starships/10",
+        pilots=[han],
+    )
+    hope = make_film("A New Hope", characters=[luke, leia, han], starships=[xwing])
+    empire = make_film(
+        "The Empire Strikes Back", characters=[luke, leia], starships=[falcon]
+    )
+    db.session.add_all([hope, empire])
+    db.session.commit()
+    db.statements.clear()
+    return {
+        "luke": luke,
+        "leia": leia,
+        "han": han,
+        "xwing": xwing,
+        "falcon": falcon,
+        "hope": hope,
+        "empire": empire,
+    }
+
+
+@pytest.mark.asyncio
+async def test_traverse_counts_shared_films_in_one_query(db, cast):
+    service = CharacterGetService(session=db)
+
+    result = await service.traverse(cast["luke"].id, path=["films,characters"])
+
+    assert [(node.id, node.count) for node in result.items] == [
+        (cast["leia"].id, 2),
+        (cast["han"].id, 1),
+    ]
+    assert (result.total, result.has_more) == (2, False)
+    assert len(db.statements) == 1
+    sql = str(db.statements[0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("WITH frontier1 AS")
+
+
+@pytest.mark.asyncio
+async def test_traverse_deduplicates_multi_hop_paths(db, cast):
+    service = FilmGetService(session=db)
+
+    starships = await service.traverse(
+        cast["hope"].id, path=["characters", "starships"]
+    )
+    films = await service.traverse(
+        cast["hope"].id, path=["characters", "films"], include_start=True
+    )
+
+    assert [node.id for node in starships.items] == sorted(
+        [cast["xwing"].id, cast["falcon"].id]
+    )
+    assert {node.id: node.count for node in films.items} == {
+        cast["hope"].id: 3,
+        cast["empire"].id: 2,
+    }
+
+
+@pytest.mark.asyncio
+async def test_traverse_limits_results(db, cast):
+    service = CharacterGetService(session=db)
+
+    result = await service.traverse(
+        cast["luke"].id, path=["films", "characters"], limit=1
+    )
+
+    assert [node.id for node in result.items] == [cast["leia"].id]
+    assert (result.total, result.has_more) == (2, True)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "path", [["films,pilots"], ["ships"], ["films,characters"] * 3, [""]]
+)
+async def test_traverse_rejects_invalid_paths(db, path):
+    service = CharacterGetService(session=db)
+
+    with pytest.raises(InvalidPathError):
+        await service.traverse(uuid4(), path=path)
+
+
+@pytest.mark.asyncio
+async def test_traverse_unknown_start_is_not_found(db):
+    service = CharacterGetService(session=db)
+
+    with pytest.raises(NotFoundError):
+        await service.traverse(uuid4(), path=["films"])
+
+
+# -------------------------
+# Test adjacency index
+# -------------------------
+
+
+async def use_index(db, service, version=0, build=build_adjacency_index):
+    """Serve the relations of `service` from an index built over `db`, with
+    reads reconciled to dataset `version` and left uncached."""
+    holder = AdjacencyIndexHolder(engine=None)
+    holder.swap(await build(db))
+    service.adjacency = holder
+    service.cache = ReadCache(max_bytes=1024, max_entries=1, enabled=False)
+    service.cache.observe_version(version)
+    db.statements.clear()
+    return service
+
+
+def link_tables_read(db):
+    sql = " ".join(str(statement) for statement in db.statements)
+    tables = ("filmcharacterlink", "starshippilotlink")
+    return [table for table in tables if table in sql]
+
+
+def by_id(item):
+    """Dump a read item with related ids sorted, as PostgreSQL aggregates them
+    and SQLite does not."""
+    data = item.model_dump()
+    for key, value in data.items():
+        if isinstance(value, list):
+            data[key] = sorted(value, key=lambda ref: ref["id"])
+    return data
+
+
+@pytest.mark.asyncio
+async def test_index_counts_nodes_and_edges(db, cast):
+    index = await build_adjacency_index(db)
+
+    assert (index.version, index.nodes, index.edges) == (0, 7, 9)
+    assert index.memory_bytes > 0
+    assert index.related(Film, uuid4(), "characters") is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "service_class, entity",
+    [
+        (FilmGetService, "hope"),
+        (CharacterGetService, "luke"),
+        (StarshipGetService, "falcon"),
+    ],
+)
+async def test_index_serves_same_reads_without_link_tables(
+    db, cast, service_class, entity
+):
+    id = cast[entity].id
+    expected_detail = await service_class(session=db).get(id)
+    expected_page = await service_class(session=db).get_paginated(
+        offset=0, limit=10
+    )
+
+    service = await use_index(db, service_class(session=db))
+    detail = await service.get(id)
+    page = await service.get_paginated(offset=0, limit=10)
+
+    assert by_id(detail) == by_id(expected_detail)
+    assert [by_id(item) for item in page.items] == [
+        by_id(item) for item in expected_page.items
+    ]
+    assert link_tables_read(db) == []
+
+
+@pytest.mark.asyncio
+async def test_index_feeds_expand_and_fields(db, cast):
+    expected = await FilmGetService(session=db).get_many(
+        [str(cast["hope"].id)], fields=["title"], expand=["characters"]
+    )
+
+    service = await use_index(db, FilmGetService(session=db))
+    batch = await service.get_many(
+        [str(cast["hope"].id)], fields=["title"], expand=["characters"]
+    )
+
+    assert [by_id(item) for item in batch.items] == [
+        by_id(item) for item in expected.items
+    ]
+    assert len(db.statements) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "start, path, include_start",
+    [
+        ("luke", ["films", "characters"], False),
+        ("hope", ["characters", "films"], True),
+        ("hope", ["starships", "pilots", "films"], False),
+        ("falcon", ["films", "characters", "starships"], False),
+    ],
+)
+async def test_index_traversal_matches_sql(db, cast, start, path, include_start):
+    model_services = {
+        Character: CharacterGetService,
+        Film: FilmGetService,
+        Starship: StarshipGetService,
+    }
+    service_class = model_services[type(cast[start])]
+    expected = await service_class(session=db).traverse(
+        cast[start].id, path=path, limit=2, include_start=include_start
+    )
+
+    service = await use_index(db, service_class(session=db))
+    result = await service.traverse(
+        cast[start].id, path=path, limit=2, include_start=include_start
+    )
+
+    assert result == expected
+    assert db.statements == []
+
+
+@pytest.mark.asyncio
+async def test_count_related_from_index_and_sql(db, cast):
+    expected = await FilmGetService(session=db).count_related(cast["hope"].id)
+    service = await use_index(db, FilmGetService(session=db))
+
+    assert expected.counts == {"characters": 3, "starships": 1}
+    assert await service.count_related(cast["hope"].id) == expected
+    assert db.statements == []
+    with pytest.raises(NotFoundError):
+        await service.count_related(uuid4())
+    with pytest.raises(NotFoundError):
+        await FilmGetService(session=db).count_related(uuid4())
+
+
+@pytest.mark.asyncio
+async def test_stale_index_falls_back_to_sql(db, cast):
+    service = await use_index(db, CharacterGetService(session=db), version=1)
+
+    await service.get(cast["luke"].id)
+    await service.traverse(cast["luke"].id, path=["films"])
+
+    assert link_tables_read(db) == ["filmcharacterlink", "starshippilotlink"]
+    assert len(db.statements) == 2
+
+
+@pytest.mark.asyncio
+async def test_holder_keeps_the_newest_index(db, cast):
+    index = await build_adjacency_index(db)
+    holder = AdjacencyIndexHolder(engine=None)
+    holder.swap(index)
+    older = await build_adjacency_index(db)
+    older.version = -1
+
+    holder.swap(older)
+
+    assert holder.current(0) is index
+    assert holder.current(1) is None
+    assert AdjacencyIndexHolder(engine=None, enabled=False).current(0) is None
+
+
+# -------------------------
+# Test dataset snapshot
+# -------------------------
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "service_class, entity",
+    [
+        (FilmGetService, "hope"),
+        (CharacterGetService, "luke"),
+        (StarshipGetService, "falcon"),
+    ],
+)
+async def test_snapshot_serves_reads_without_database(
+    db, cast, service_class, entity
+):
+    id, unknown = cast[entity].id, uuid4()
+    view = {"fields": ["id", service_class(session=db).filter_field]}
+    sql = service_class(session=db)
+    expected = [
+        await sql.get(id),
+        await sql.get_paginated(limit=2, total_mode=TotalMode.NONE),
+        await sql.get_many([id, unknown], **view),
+    ]
+
+    service = await use_index(
+        db, service_class(session=db), build=build_dataset_snapshot
+    )
+    result = [
+        await service.get(id),
+        await service.get_paginated(limit=2, total_mode=TotalMode.NONE),
+        await service.get_many([id, unknown], **view),
+    ]
+
+    assert by_id(result[0]) == by_id(expected[0])
+    assert [by_id(item) for item in result[1].items] == [
+        by_id(item) for item in expected[1].items
+    ]
+    assert result[1].model_dump(exclude={"items"}) == expected[1].model_dump(
+        exclude={"items"}
+    )
+    assert result[2] == expected[2]
+    assert db.statements == []
+    with pytest.raises(NotFoundError):
+        await service.get(unknown)
+
+
+@pytest.mark.asyncio
+async def test_snapshot_expands_relations_from_memory(db, cast):
+    service = await use_index(
+        db, FilmGetService(session=db), build=build_dataset_snapshot
+    )
+
+    film = await service.get(
+        cast["empire"].id, fields=["title"], expand=["characters"]
+    )
+
+    assert sorted(c.name for c in film.characters) == ["Leia", "Luke"]
+    assert db.statements == []
+
+
+@pytest.mark.asyncio
+async def test_snapshot_expands_several_relations_like_sql(db, cast):
+    view = {"fields": ["title"], "expand": ["characters", "starships"]}
+    expected = await FilmGetService(session=db).get(cast["hope"].id, **view)
+    service = await use_index(
+        db, FilmGetService(session=db), build=build_dataset_snapshot
+    )
+
+    film = await service.get(cast["hope"].id, **view)
+
+    assert by_id(film) == by_id(expected)
+    assert [s.name for s in film.starships] == ["X-wing"]
+    assert db.statements == []
+
+
+@pytest.mark.asyncio
+async def test_snapshot_expansion_skips_rows_it_does_not_hold(db, cast):
+    service = await use_index(
+        db, FilmGetService(session=db), build=build_dataset_snapshot
+    )
+    snapshot = service.adjacency.current(0)
+    snapshot._listings[Character].ranks.pop(cast["luke"].id)
+
+    film = await service.get(
+        cast["empire"].id, fields=["title"], expand=["characters"]
+    )
+
+    assert [c.name for c in film.characters] == ["Leia"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("value", ["a", "LU", "eia", "ark", "0%", "h_V", "rt"])
+async def test_snapshot_search_matches_ilike(db, value):
+    add_characters(
+        db, ["Luke", "Leia", "Dark Helmet", "100% Droid", "Darth_Vader", "Darth Maul"]
+    )
+    expected = await GetService(Character, session=db).get_paginated(
+        filter_value=value
+    )
+
+    service = await use_index(
+        db, GetService(Character, session=db), build=build_dataset_snapshot
+    )
+    page = await service.get_paginated(filter_value=value)
+
+    assert [c.name for c in page.items] == [c.name for c in expected.items]
+    assert page.total == expected.total
+    assert db.statements == []
+
+
+@pytest.mark.asyncio
+async def test_snapshot_continues_sql_cursor(db):
+    add_characters(db, ["Yoda", "Clone", "Anakin", "Clone", "Leia"])
+    full = await GetService(Character, session=db).get_paginated(limit=10)
+    first = await GetService(Character, session=db).get_paginated(limit=2)
+
+    service = await use_index(
+        db, GetService(Character, session=db), build=build_dataset_snapshot
+    )
+    seen, cursor = [c.id for c in first.items], first.next_cursor
+    while cursor is not None:
+        page = await service.get_paginated(limit=2, cursor=cursor)
+        seen += [c.id for c in page.items]
+        cursor = page.next_cursor
+
+    assert seen == [c.id for c in full.items]
+    assert db.statements == []
+
+
+@pytest.mark.asyncio
+async def test_snapshot_falls_back_to_sql_when_missing_or_stale(db, cast):
+    stale = await use_index(
+        db, CharacterGetService(session=db), version=1, build=build_dataset_snapshot
+    )
+    await stale.get(cast["luke"].id)
+    assert len(db.statements) == 1
+
+    service = await use_index(
+        db, CharacterGetService(session=db), build=build_dataset_snapshot
+    )
+    # A cursor on a row the snapshot does not hold yet
+    add_characters(db, ["Biggs"])
+    first = await GetService(Character, session=db).get_paginated(limit=1)
+    db.statements.clear()
+    page = await service.get_paginated(cursor=first.next_cursor)
+
+    assert [c.name for c in page.items] == ["Han", "Leia", "Luke"]
+    assert len(db.statements) == 2
+
+
+# -------------------------
+# Test read-through cache
+# -------------------------
+
+
+@pytest.mark.asyncio
+async def test_get_is_served_from_cache(db):
+    (luke,) = add_characters(db, ["Luke"])
+    service = make_cached_service(db)
+
+    first = await service.get(luke.id)
+    second = await service.get(luke.id)
+
+    assert isinstance(first, CharacterRead)
+    assert second is first
+    assert len(db.statements) == 1
+    assert (service.cache.stats.hits, service.cache.stats.misses) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_get_json_caches_serialized_bytes(db):
+    (luke,) = add_characters(db, ["Luke"])
+    service = make_cached_service(db)
+
+    first = await service.get_json(luke.id)
+    second = await service.get_json(luke.id)
+
+    assert first == (await service.get(luke.id)).model_dump_json().encode()
+    assert second is first
+    assert len(db.statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_does_not_cache_not_found(db):
+    service = make_cached_service(db)
+
+    for _ in range(2):
+        with pytest.raises(NotFoundError):
+            await service.get(uuid4())
+
+    assert len(service.cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_get_paginated_cache_is_keyed_by_filter_and_page(db):
+    add_characters(db, ["Luke"])
+    service = make_cached_service(db)
+
+    await service.get_paginated(filter_value="lu", offset=0, limit=10)
+    await service.get_paginated(filter_value="lu", offset=0, limit=10)
+    await service.get_paginated(filter_value="lu", offset=10, limit=10)
+
+    # Count and page queries for the two distinct pages only
+    assert len(db.statements) == 4
+    assert service.cache.stats.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_get_reloads_after_invalidation(db):
+    (luke,) = add_characters(db, ["Luke"])
+    service = make_cached_service(db)
+
+    await service.get(luke.id)
+    service.cache.invalidate()
+    await service.get(luke.id)
+
+    assert len(db.statements) == 2
+
+
+# -------------------------
+# Test keyset pagination against SQLite
+# -------------------------
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_cover_every_row_once_in_order(db):
+    add_characters(db, ["Yoda", "Clone", "Anakin", "Clone", "Leia"])
+    service = GetService(Character, session=db)
+
+    full = await service.get_paginated(limit=10)
+    seen, cursor = [], None
+    while True:
+        page = await service.get_paginated(limit=2, cursor=cursor)
+        seen += [c.id for c in page.items]
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert [c.name for c in full.items] == ["Anakin", "Clone", "Clone", "Leia", "Yoda"]
+    assert seen == [c.id for c in full.items]
+    assert full.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_cursor_page_seeks_instead_of_offset(db):
+    add_characters(db, ["Anakin", "Clone", "Leia"])
+    service = GetService(Character, session=db)
+
+    first = await service.get_paginated(filter_value="a", offset=0, limit=1)
+    second = await service.get_paginated(
+        filter_value="a", limit=1, cursor=first.next_cursor
+    )
+
+    assert first.offset == 0
+    assert second.offset is None
+    assert [c.name for c in second.items] == ["Leia"]
+    page_query = str(db.statements[-1].compile())
+    assert "ORDER BY" in page_query
+    assert "OFFSET" not in page_query
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "WyJvbmx5LW9uZSJd"])
+async def test_malformed_cursor_is_rejected(db, cursor):
+    service = GetService(Character, session=db)
+
+    with pytest.raises(InvalidCursorError):
+        await service.get_paginated(cursor=cursor)
+
+
+@pytest.mark.asyncio
+async def test_filter_matches_wildcards_literally(db):
+    add_characters(db, ["R2-D2", "100% Droid", "Darth_Vader", "Darth Maul"])
+    service = GetService(Character, session=db)
+
+    percent = await service.get_paginated(filter_value="0%")
+    underscore = await service.get_paginated(filter_value="h_V")
+
+    assert [c.name for c in percent.items] == ["100% Droid"]
+    assert [c.name for c in underscore.items] == ["Darth_Vader"]
+
+
+@pytest.mark.asyncio
+async def test_filter_compiles_to_plain_ilike_on_column():
+    service = GetService(Character, session=AsyncMock())
+
+    query, _ = await service._build_base_query("luke")
+
+    sql = str(query.compile(dialect=postgresql.dialect()))
+    # No lower() or other wrapping, so the trigram GIN index on name applies
+    assert "character.name ILIKE" in sql
+
+
+# -------------------------
+# Test total count modes
+# -------------------------
+
+
+@pytest.mark.asyncio
+async def test_exact_total_runs_count_and_page_queries(db):
+    add_characters(db, ["Anakin", "Clone", "Leia"])
+    service = GetService(Character, session=db)
+
+    page = await service.get_paginated(limit=2)
+
+    assert (page.total, page.total_mode, page.has_more) == (3, TotalMode.EXACT, True)
+    assert len(selects(db)) == 2
+
+
+@pytest.mark.asyncio
+async def test_window_total_uses_single_query(db):
+    add_characters(db, ["Anakin", "Clone", "Leia", "Yoda"])
+    service = GetService(Character, session=db)
+
+    first = await service.get_paginated(limit=2, total_mode=TotalMode.WINDOW)
+    db.statements.clear()
+    second = await service.get_paginated(
+        limit=2, cursor=first.next_cursor, total_mode=TotalMode.WINDOW
+    )
+
+    assert first.total == 4
+    # The cursor seek does not shrink the window count
+    assert second.total == 4
+    assert [c.name for c in second.items] == ["Leia", "Yoda"]
+    assert second.has_more is False
+    assert len(selects(db)) == 1
+
+
+@pytest.mark.asyncio
+async def test_window_total_falls_back_to_count_past_the_end(db):
+    add_characters(db, ["Anakin"])
+    service = GetService(Character, session=db)
+
+    page = await service.get_paginated(offset=5, total_mode=TotalMode.WINDOW)
+
+    assert page.items == []
+    assert page.total == 1
+
+
+@pytest.mark.asyncio
+async def test_no_total_skips_count_query(db):
+    add_characters(db, ["Anakin", "Clone", "Leia"])
+    service = GetService(Character, session=db)
+
+    page = await service.get_paginated(limit=2, total_mode=TotalMode.NONE)
+
+    assert page.total is None
+    assert page.has_more is True
+    assert len(page.items) == 2
+    assert len(selects(db)) == 1
+
+
+@pytest.mark.asyncio
+async def test_estimated_total_reuses_exact_count_from_cache(db):
+    add_characters(db, ["Anakin", "Clone", "Leia"])
+    service = make_cached_service(db)
+    await service.get_paginated(limit=1)
+    db.statements.clear()
+
+    page = await service.get_paginated(
+        offset=1, limit=1, total_mode=TotalMode.ESTIMATED
+    )
+
+    assert page.total == 3
+    assert len(selects(db)) == 1
+
+
+@pytest.mark.asyncio
+async def test_estimated_total_asks_the_planner():
+    page_result = MagicMock()
+    page_result.all.return_value = [make_character() for _ in range(3)]
+    plan_result = MagicMock()
+    plan_result.scalar_one.return_value = '[{"Plan": {"Plan Rows": 1200}}]'
+    mock_session = AsyncMock()
+    mock_session.execute.side_effect = [page_result, plan_result]
+    service = GetService(Character, session=mock_session)
+
+    page = await service.get_paginated(limit=2, total_mode=TotalMode.ESTIMATED)
+
+    assert page.total == 1200
+    assert page.total_mode == TotalMode.ESTIMATED
+    explain = mock_session.execute.await_args.args[0]
+    assert isinstance(explain, Explain)
+    sql = str(explain.compile(dialect=postgresql.dialect()))
+    assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT")
+
+
 # -------------------------
 # Test subclasses
 # -------------------------
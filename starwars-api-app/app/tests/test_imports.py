@@ -0,0 +1,45 @@
+import json
+import subprocess
+import sys
+
+# -------------------------
+# Test what importing the application loads
+# -------------------------
+
+DEFERRED_MODULES = ["scalar_fastapi", "httpx", "app.services.swapi.sync"]
+
+
+def run_fresh(code: str):
+    """Run `code` in a new interpreter and return what it printed as JSON."""
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout)
+
+
+def test_app_import_defers_docs_and_sync_stack():
+    loaded = run_fresh(
+        "import json, sys; import app.main; "
+        f"print(json.dumps([m for m in {DEFERRED_MODULES!r} if m in sys.modules]))"
+    )
+
+    assert loaded == []
+
+
+def test_app_import_reads_no_settings():
+    resolved = run_fresh(
+        "import json; import app.main; from app.config import _SETTINGS; "
+        "print(json.dumps([g.cache_info().currsize for g in _SETTINGS.values()]))"
+    )
+
+    assert resolved == [0] * 4
+
+
+def test_settings_are_read_once_on_first_access():
+    reads = run_fresh(
+        "import json; import app.config as config; "
+        "config.db_settings; config.db_settings; "
+        "print(json.dumps(config.get_db_settings.cache_info().misses))"
+    )
+
+    assert reads == 1
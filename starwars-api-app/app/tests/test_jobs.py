@@ -0,0 +1,185 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.database.models import SyncJob
+from app.exceptions import SyncConflictError
+from app.services.swapi.entities import SyncMode, SyncResult, WriteEngine
+from app.services.swapi.jobs import JobStatus, enqueue_sync, run_sync_job
+
+# -------------------------
+# Helpers
+# -------------------------
+
+
+def make_lock_connection(acquired: bool):
+    """Returns an AsyncMock connection answering pg_try_advisory_lock."""
+    connection = AsyncMock()
+    result = MagicMock()
+    result.scalar_one.return_value = acquired
+    connection.execute.return_value = result
+    return connection
+
+
+def make_session(active_job=None):
+    """Returns an AsyncMock session whose active-job query yields `active_job`."""
+    session = AsyncMock()
+    session.add = MagicMock()
+    result = MagicMock()
+    result.scalars.return_value.first.return_value = active_job
+    session.execute.return_value = result
+    return session
+
+
+def existing_job():
+    return SyncJob(
+        id=uuid4(),
+        status=JobStatus.RUNNING.value,
+        mode="incremental",
+        engine="values",
+        chunk_size=500,
+    )
+
+
+async def enqueue(session, connection):
+    with (
+        patch("app.services.swapi.jobs.get_engine") as get_engine,
+        patch("app.services.swapi.jobs._spawn") as mock_spawn,
+    ):
+        get_engine.return_value.connect = AsyncMock(return_value=connection)
+        job, coalesced = await enqueue_sync(
+            session, SyncMode.INCREMENTAL, WriteEngine.VALUES, 500
+        )
+        spawned = mock_spawn.call_count
+        if spawned:
+            mock_spawn.call_args.args[0].close()
+    return job, coalesced, spawned
+
+
+# -------------------------
+# Test enqueue_sync
+# -------------------------
+
+
+@pytest.mark.asyncio
+async def test_enqueue_creates_job_and_starts_runner():
+    session = make_session()
+    connection = make_lock_connection(acquired=True)
+
+    job, coalesced, spawned = await enqueue(session, connection)
+
+    assert coalesced is False
+    assert job.status == JobStatus.PENDING.value
+    session.add.assert_called_once_with(job)
+    session.commit.assert_awaited_once()
+    assert spawned == 1
+    # The runner now owns the lock connection
+    connection.close.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_enqueue_coalesces_into_running_job():
+    active = existing_job()
+    session = make_session(active_job=active)
+    connection = make_lock_connection(acquired=False)
+
+    job, coalesced, spawned = await enqueue(session, connection)
+
+    assert job is active
+    assert coalesced is True
+    assert spawned == 0
+    session.add.assert_not_called()
+    connection.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_enqueue_replaces_job_of_dead_worker():
+    stale = existing_job()
+    session = make_session(active_job=stale)
+    connection = make_lock_connection(acquired=True)
+
+    job, coalesced, spawned = await enqueue(session, connection)
+
+    assert stale.status == JobStatus.FAILED.value
+    assert job is not stale
+    assert coalesced is False
+    assert spawned == 1
+
+
+@pytest.mark.asyncio
+async def test_enqueue_conflicts_when_lock_held_without_job():
+    session = make_session(active_job=None)
+    connection = make_lock_connection(acquired=False)
+
+    with pytest.raises(SyncConflictError):
+        await enqueue(session, connection)
+
+
+@pytest.mark.asyncio
+async def test_enqueue_waits_for_finishing_runner_to_release_lock():
+    session = make_session(active_job=None)
+    connection = make_lock_connection(acquired=False)
+    # The previous job is already recorded as finished, its lock follows
+    connection.execute.return_value.scalar_one.side_effect = [False, True]
+
+    job, coalesced, spawned = await enqueue(session, connection)
+
+    assert job.status == JobStatus.PENDING.value
+    assert coalesced is False
+    assert spawned == 1
+
+
+# -------------------------
+# Test run_sync_job
+# -------------------------
+
+
+def job_updates(connection):
+    """Return the values of every UPDATE written through the connection."""
+    return [
+        call.args[0].compile().params
+        for call in connection.execute.call_args_list
+        if call.args[0].is_update
+    ]
+
+
+@pytest.mark.asyncio
+@patch("app.services.swapi.jobs.async_session")
+@patch("app.services.swapi.jobs.sync_swapi", new_callable=AsyncMock)
+async def test_run_sync_job_records_progress_and_result(mock_sync, mock_factory):
+    async def fake_sync(session, on_progress, **kwargs):
+        await on_progress("characters", {"characters": 10})
+        return SyncResult(mode=SyncMode.INCREMENTAL, synced_entities={"films": 6})
+
+    mock_sync.side_effect = fake_sync
+    connection = make_lock_connection(acquired=True)
+
+    await run_sync_job(uuid4(), connection, SyncMode.INCREMENTAL, WriteEngine.VALUES, 1)
+
+    assert mock_sync.await_args.kwargs["trace_memory"] is False
+    updates = job_updates(connection)
+    assert [u.get("status") for u in updates] == ["running", None, "succeeded"]
+    assert updates[1]["progress"] == {"characters": 10}
+    assert updates[2]["result"]["synced_entities"] == {"films": 6}
+    connection.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@patch("app.services.swapi.jobs.async_session")
+@patch("app.services.swapi.jobs.sync_swapi", new_callable=AsyncMock)
+async def test_run_sync_job_records_failure(mock_sync, mock_factory):
+    mock_sync.side_effect = RuntimeError("SWAPI exploded")
+    connection = make_lock_connection(acquired=True)
+
+    await run_sync_job(uuid4(), connection, SyncMode.FULL, WriteEngine.COPY, 1)
+
+    updates = job_updates(connection)
+    assert updates[-1]["status"] == JobStatus.FAILED.value
+    assert updates[-1]["error"] == "SWAPI exploded"
+    # The run lock is always released
+    assert any(
+        "pg_advisory_unlock" in str(call.args[0])
+        for call in connection.execute.call_args_list
+    )
+    connection.close.assert_awaited_once()
@@ -0,0 +1,95 @@
+import pytest
+
+from app.metrics import MetricsRegistry
+
+# -------------------------
+# Test metric rendering and aggregation across workers
+# -------------------------
+
+
+def make_registry():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests served.", ["route"])
+    latency = registry.histogram(
+        "latency_seconds", "Request latency.", ["route"], buckets=[0.1, 1]
+    )
+    return registry, requests, latency
+
+
+def test_render_prometheus_text():
+    registry, requests, latency = make_registry()
+    requests.inc(route='/a"b')
+    requests.inc(2, route='/a"b')
+    latency.observe(0.05, route="/films")
+    latency.observe(0.5, route="/films")
+    latency.observe(5, route="/films")
+
+    assert registry.render().splitlines() == [
+        "# HELP requests_total Requests served.",
+        "# TYPE requests_total counter",
+        'requests_total{route="/a\\"b"} 3',
+        "# HELP latency_seconds Request latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/films",le="0.1"} 1',
+        'latency_seconds_bucket{route="/films",le="1"} 2',
+        'latency_seconds_bucket{route="/films",le="+Inf"} 3',
+        'latency_seconds_sum{route="/films"} 5.55',
+        'latency_seconds_count{route="/films"} 3',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_workers_are_summed_through_shared_directory(tmp_path):
+    first, first_requests, first_latency = make_registry()
+    second, second_requests, second_latency = make_registry()
+    first.start(tmp_path, interval=60)
+    second.start(tmp_path, interval=60)
+
+    first_requests.inc(route="/films")
+    first_latency.observe(0.05, route="/films")
+    second_requests.inc(route="/films")
+    second_requests.inc(route="/people")
+    second_latency.observe(0.5, route="/films")
+    await second.stop()
+
+    merged = first.collect()
+    await first.stop()
+
+    assert merged["requests_total"] == {("/films",): 2, ("/people",): 1}
+    assert merged["latency_seconds"][("/films",)] == [[1, 1, 0], 0.55, 2]
+    # Stopped workers' totals are kept, folded into a single file
+    assert [p.name for p in tmp_path.glob("*.json")] == ["retired.json"]
+
+
+@pytest.mark.asyncio
+async def test_restarted_workers_keep_totals_without_piling_up_files(tmp_path):
+    for _ in range(3):
+        worker, requests, _ = make_registry()
+        worker.start(tmp_path, interval=60)
+        requests.inc(route="/films")
+        await worker.stop()
+
+    current, _, _ = make_registry()
+    current.start(tmp_path, interval=60)
+
+    assert current.collect()["requests_total"] == {("/films",): 3}
+    await current.stop()
+    assert [p.name for p in tmp_path.glob("*.json")] == ["retired.json"]
+
+
+@pytest.mark.asyncio
+async def test_files_of_dead_workers_are_retired_on_start(tmp_path):
+    dead, requests, _ = make_registry()
+    dead.start(tmp_path, interval=60)
+    requests.inc(5, route="/films")
+    dead.write()
+    # Killed without stopping, under a pid no process holds
+    dead._task.cancel()
+    dead._path.rename(tmp_path / "worker-999999999-deadbeef.json")
+
+    current, _, _ = make_registry()
+    current.start(tmp_path, interval=60)
+
+    assert not list(tmp_path.glob("worker-*.json"))
+    assert current.collect()["requests_total"] == {("/films",): 5}
+    await current.stop()
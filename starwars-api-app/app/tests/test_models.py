@@ -2,7 +2,9 @@ from datetime import datetime
 from uuid import uuid4
 
 import pytest
-from sqlmodel import Session, SQLModel, create_engine
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, SQLModel, create_engine, select
 
 from ..database.models import Character, Film, Starship
 
@@ -116,7 +118,11 @@ def test_film_character_relationship(session):
     session.add(film)
     session.commit()
 
-    db_film = session.get(Film, film.id)
+    db_film = session.exec(
+        select(Film)
+        .where(Film.id == film.id)
+        .options(selectinload(Film.characters))
+    ).one()
     assert len(db_film.characters) == 1
     assert db_film.characters[0].name == "Luke Skywalker"
 
@@ -149,7 +155,11 @@ def test_film_starship_relationship(session):
     session.add(film)
     session.commit()
 
-    db_film = session.get(Film, film.id)
+    db_film = session.exec(
+        select(Film)
+        .where(Film.id == film.id)
+        .options(selectinload(Film.starships))
+    ).one()
     assert len(db_film.starships) == 1
     assert db_film.starships[0].name == "X-wing"
 
@@ -182,6 +192,32 @@ def test_starship_pilot_relationship(session):
     session.add(ship)
     session.commit()
 
-    db_ship = session.get(Starship, ship.id)
+    db_ship = session.exec(
+        select(Starship)
+        .where(Starship.id == ship.id)
+        .options(selectinload(Starship.pilots))
+    ).one()
     assert len(db_ship.pilots) == 1
     assert db_ship.pilots[0].name == "Luke Skywalker"
+
+
+# -------------------------
+# Test relationships never load implicitly
+# -------------------------
+def test_unloaded_relationship_raises(session):
+    film = Film(
+        id=uuid4(),
+        title="A New Hope",
+        episode_id=4,
+        opening_crawl="...",
+        director="George Lucas",
+        producer="Gary Kurtz, Rick McCallum",
+        release_date=datetime(1977, 5, 25),
+        swapi_url="https://swapi.dev/api/films/1/",
+    )
+    session.add(film)
+    session.commit()
+
+    db_film = session.get(Film, film.id)
+    with pytest.raises(InvalidRequestError):
+        db_film.characters
@@ -0,0 +1,65 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.pool import QueuePool
+
+from app.config import DatabaseSettings
+from app.database.pool import PoolTimingMixin
+
+# -------------------------
+# Test pool configuration and wait statistics
+# -------------------------
+
+
+class TimedQueuePool(PoolTimingMixin, QueuePool):
+    """Synchronous counterpart of the app's pool, for SQLite."""
+
+
+def make_engine(**kwargs):
+    return create_engine("sqlite://", poolclass=TimedQueuePool, **kwargs)
+
+
+def test_checkouts_are_counted_and_timed():
+    engine = make_engine(pool_size=2, max_overflow=0)
+
+    for _ in range(3):
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+    stats = engine.pool.wait_stats
+    assert (stats.checkouts, stats.timeouts) == (3, 0)
+    assert 0 < stats.wait_seconds_max <= stats.wait_seconds_total
+    assert (engine.pool.checkedout(), engine.pool.checkedin()) == (0, 1)
+
+
+def test_exhausted_pool_records_timeouts():
+    engine = make_engine(pool_size=1, max_overflow=0, pool_timeout=0.05)
+
+    with engine.connect():
+        with ThreadPoolExecutor(1) as executor:
+            with pytest.raises(exc.TimeoutError):
+                executor.submit(engine.connect).result()
+
+    stats = engine.pool.wait_stats
+    assert (stats.checkouts, stats.timeouts) == (2, 1)
+    assert stats.wait_seconds_max >= 0.05
+
+
+def test_engine_options_come_from_settings():
+    settings = DatabaseSettings(
+        POSTGRES_SERVER="db",
+        POSTGRES_PORT=5432,
+        POSTGRES_USER="u",
+        POSTGRES_PASSWORD="p",
+        POSTGRES_DB="d",
+        POOL_SIZE=8,
+        STATEMENT_TIMEOUT_MS=2500,
+    )
+
+    options = settings.engine_options
+
+    assert (options["pool_size"], options["max_overflow"]) == (8, 10)
+    assert options["connect_args"] == {
+        "server_settings": {"statement_timeout": "2500"}
+    }
@@ -0,0 +1,126 @@
+import pytest
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.api import dependencies
+from app.database.replicas import ReplicaRouter
+
+# -------------------------
+# Stub engines
+# -------------------------
+
+
+class StubResult:
+    def __init__(self, row):
+        self.row = row
+
+    def one(self):
+        return self.row
+
+
+class StubEngine:
+    """Engine whose connections answer the replica status query with `row`,
+    or fail when `row` is None."""
+
+    def __init__(self, name, row=(0, 1)):
+        self.url = make_url(f"postgresql+asyncpg://u:secret@{name}/db")
+        self.row = row
+        self.disposed = False
+
+    def connect(self):
+        return self
+
+    async def __aenter__(self):
+        if self.row is None:
+            raise ConnectionRefusedError("replica is down")
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, statement):
+        return StubResult(self.row)
+
+    async def dispose(self):
+        self.disposed = True
+
+
+# -------------------------
+# Test ReplicaRouter
+# -------------------------
+
+
+@pytest.mark.asyncio
+async def test_reads_rotate_over_healthy_replicas():
+    primary, first, second = StubEngine("primary"), StubEngine("r1"), StubEngine("r2")
+    router = ReplicaRouter(primary, [first, second])
+
+    unchecked = router.engine()
+    await router.check()
+
+    assert unchecked is primary
+    assert [router.engine() for _ in range(4)] == [first, second, first, second]
+
+
+@pytest.mark.asyncio
+async def test_unreachable_replica_is_skipped_until_it_recovers():
+    primary, down, up = StubEngine("primary"), StubEngine("r1", None), StubEngine("r2")
+    router = ReplicaRouter(primary, [down, up])
+    await router.check()
+
+    assert {router.engine() for _ in range(4)} == {up}
+    up.row = None
+    await router.check()
+    assert router.engine() is primary
+
+    down.row = (0, 1)
+    await router.check()
+    assert router.engine() is down
+    assert router.replicas[0].name == "postgresql+asyncpg://u:***@r1/db"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "row, version, routed",
+    [
+        ((0.5, 3), 3, "replica"),
+        ((12.0, 3), 3, "primary"),
+        ((None, 3), 3, "primary"),
+        ((0, 2), 3, "primary"),
+        ((0, 4), 3, "replica"),
+        ((0, 2), None, "replica"),
+    ],
+)
+async def test_lagging_replica_falls_back_to_primary(row, version, routed):
+    primary, replica = StubEngine("primary"), StubEngine("r1", row)
+    router = ReplicaRouter(primary, [replica], max_lag=5.0)
+    await router.check()
+
+    engine = router.engine(version)
+
+    assert engine is (replica if routed == "replica" else primary)
+
+
+@pytest.mark.asyncio
+async def test_stop_disposes_replica_pools():
+    replica = StubEngine("r1")
+    router = ReplicaRouter(StubEngine("primary"), [replica])
+    router.start()
+
+    await router.stop()
+
+    assert replica.disposed
+
+
+@pytest.mark.asyncio
+async def test_read_sessions_are_bound_to_the_routed_engine(monkeypatch):
+    primary = create_async_engine("postgresql+asyncpg://u:p@primary/db")
+    replica = create_async_engine("postgresql+asyncpg://u:p@replica/db")
+    router = ReplicaRouter(primary, [replica])
+    monkeypatch.setattr(dependencies, "get_replica_router", lambda: router)
+
+    async for session in dependencies.get_read_session():
+        assert session.bind is primary
+    router.replicas[0].healthy, router.replicas[0].lag_seconds = True, 0.0
+    async for session in dependencies.get_read_session():
+        assert session.bind is replica
@@ -0,0 +1,100 @@
+import json
+from datetime import date
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+from pydantic import BaseModel
+
+from app.api.responses import (
+    ConfiguredJSONResponse,
+    NativeJSONResponse,
+    StdlibJSONResponse,
+    StreamingJSONResponse,
+    json_response,
+)
+from app.api.schemas import FilmRead, PaginatedFilmRead, UUIDRef
+from app.config import api_settings
+
+# -------------------------
+# Test JSON responses
+# -------------------------
+
+
+def make_page(size):
+    films = [
+        FilmRead(
+            id=uuid4(),
+            title=f"Film {i}",
+            episode_id=i,
+            opening_crawl="A long time ago",
+            director="George Lucas",
+            producer="Gary Kurtz",
+            release_date=date(1977, 5, 25),
+            characters=[UUIDRef(id=uuid4())],
+            starships=[],
+        )
+        for i in range(size)
+    ]
+    return PaginatedFilmRead(total=size, offset=0, limit=size, items=films)
+
+
+async def read_body(response):
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+def test_native_and_stdlib_responses_encode_the_same_json():
+    page = make_page(3)
+
+    native = json.loads(NativeJSONResponse(page).body)
+
+    assert native == json.loads(StdlibJSONResponse(page).body)
+    assert native == page.model_dump(mode="json")
+
+
+def test_configured_response_encodes_as_the_setting_says():
+    content = {"title": "A New Hope", "crawl": "é"}
+
+    with patch.object(api_settings, "JSON_RESPONSE_CLASS", "stdlib"):
+        stdlib = ConfiguredJSONResponse(content)
+    with patch.object(api_settings, "JSON_RESPONSE_CLASS", "native"):
+        native = ConfiguredJSONResponse(content)
+
+    assert stdlib.body == StdlibJSONResponse(content).body
+    assert native.body == NativeJSONResponse(content).body
+    assert json.loads(stdlib.body) == json.loads(native.body) == content
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("size", [0, 1, 120])
+async def test_streamed_page_matches_encoded_page(size):
+    page = make_page(size)
+
+    body = await read_body(StreamingJSONResponse(page))
+
+    assert json.loads(body) == page.model_dump(mode="json")
+
+
+@pytest.mark.asyncio
+async def test_streamed_items_without_other_fields():
+    class Items(BaseModel):
+        items: list[int]
+
+    body = await read_body(StreamingJSONResponse(Items(items=[1, 2])))
+
+    assert body == b'{"items":[1,2]}'
+
+
+def test_json_response_streams_only_large_pages():
+    with patch.object(api_settings, "JSON_STREAM_MIN_ITEMS", 3):
+        small = json_response(make_page(2), {"ETag": '"1-a"'})
+        large = json_response(make_page(3), {"ETag": '"1-a"'})
+        raw = json_response(b"{}")
+    with patch.object(api_settings, "JSON_STREAM_MIN_ITEMS", 0):
+        disabled = json_response(make_page(3))
+
+    assert isinstance(small, ConfiguredJSONResponse)
+    assert isinstance(large, StreamingJSONResponse)
+    assert large.headers["etag"] == '"1-a"'
+    assert raw.body == b"{}"
+    assert isinstance(disabled, ConfiguredJSONResponse)
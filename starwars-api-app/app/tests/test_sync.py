@@ -1,8 +1,26 @@
+import copy
+import json
+import logging
+import tracemalloc
+from functools import partial
 from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
 
 import httpx
 import pytest
-
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+
+from app.database.models import (
+    Character,
+    DatasetVersion,
+    Film,
+    FilmCharacterLink,
+    Starship,
+    StarshipPilotLink,
+)
+from app.metrics import sync_records
+from app.services.swapi.entities import SyncMode, WriteEngine
 from app.services.swapi.sync import (
     SwapiUnavailableError,
     clear_swapi_data,
@@ -28,16 +46,66 @@ async def test_clear_swapi_data_calls_deletes_and_commit():
 
 
 # -------------------------
-# Helper function to create mock execute results
+# Helpers: SWAPI fixtures
 # -------------------------
 
-
-def make_mock_execute(items):
-    """Returns an AsyncMock that mimics session.execute."""
-    mock_result = MagicMock()
-    mock_result.scalars.return_value.all.return_value = items
-    mock_result.scalar_one.return_value = len(items)
-    return AsyncMock(return_value=mock_result)
+FILM_URL, CHAR_URL, SHIP_URL = "film1", "char1", "starship1"
+
+SWAPI_DATA = {
+    "films": [
+        {
+            "url": FILM_URL,
+            "title": "A New Hope",
+            "episode_id": 4,
+            "opening_crawl": "",
+            "director": "Lucas",
+            "producer": "Gary",
+            "release_date": "1977-05-25",
+            "characters": [CHAR_URL],
+            "starships": [SHIP_URL],
+        }
+    ],
+    "people": [
+        {
+            "url": CHAR_URL,
+            "name": "Luke",
+            "height": "172",
+            "mass": "77",
+            "hair_color": "blond",
+            "skin_color": "fair",
+            "eye_color": "blue",
+            "birth_year": "19BBY",
+            "gender": "male",
+        }
+    ],
+    "starships": [
+        {
+            "url": SHIP_URL,
+            "name": "X-wing",
+            "model": "T-65",
+            "manufacturer": "Incom",
+            "crew": "1",
+            "consumables": "1 week",
+            "starship_class": "fighter",
+            "pilots": [CHAR_URL],
+        }
+    ],
+}
+
+
+def fake_stream(data: dict[str, list[dict]]):
+    """Return a stand-in for stream_json_records serving `data` by endpoint."""
+
+    async def stream(client, url):
+        for record in data[url]:
+            yield record
+
+    return stream
+
+
+async def run_sync(db, data=SWAPI_DATA, **kwargs):
+    with patch("app.services.swapi.sync.stream_json_records", fake_stream(data)):
+        return await sync_swapi(db, **kwargs)
 
 
 # -------------------------
@@ -46,147 +114,322 @@ def make_mock_execute(items):
 
 
 @pytest.mark.asyncio
-@patch("app.services.swapi.sync.fetch_json")
-async def test_sync_swapi_happy_path(mock_fetch_json):
+@pytest.mark.parametrize("engine", [WriteEngine.ORM, WriteEngine.VALUES])
+async def test_sync_swapi_happy_path(db, engine):
+    result = await run_sync(db, mode=SyncMode.FULL, engine=engine)
+
+    # Check returned counts
+    assert result.synced_entities == {"films": 1, "characters": 1, "starships": 1}
+
+    # Every entity ended up in the database
+    assert db.session.exec(select(Film)).one().title == "A New Hope"
+    assert db.session.exec(select(Character)).one().name == "Luke"
+    assert db.session.exec(select(Starship)).one().name == "X-wing"
+
+
+# -------------------------
+# Test sync_swapi with network error
+# -------------------------
+
+
+@pytest.mark.asyncio
+async def test_sync_swapi_raises_on_fetch_error():
     mock_session = AsyncMock()
 
-    # Minimal mock SWAPI data
-    mock_fetch_json.side_effect = [
-        [
-            {
-                "url": "film1",
-                "title": "A New Hope",
-                "episode_id": 4,
-                "opening_crawl": "",
-                "director": "Lucas",
-                "producer": "Gary",
-                "release_date": "1977-05-25",
-                "characters": ["char1"],
-                "starships": ["starship1"],
-            }
-        ],
-        [
-            {
-                "url": "char1",
-                "name": "Luke",
-                "height": "172",
-                "mass": "77",
-                "hair_color": "blond",
-                "skin_color": "fair",
-                "eye_color": "blue",
-                "birth_year": "19BBY",
-                "gender": "male",
-            }
-        ],
-        [
-            {
-                "url": "starship1",
-                "name": "X-wing",
-                "model": "T-65",
-                "manufacturer": "Incom",
-                "crew": "1",
-                "consumables": "1 week",
-                "starship_class": "fighter",
-            }
-        ],
-    ]
+    async def failing_stream(client, url):
+        raise httpx.HTTPError("Network error")
+        yield
 
-    # Mock execute to handle any query
-    mock_session.execute = make_mock_execute(items=[1])  # dummy items
-    mock_session.commit = AsyncMock()
-    mock_session.add = AsyncMock()
+    with patch("app.services.swapi.sync.stream_json_records", failing_stream):
+        with pytest.raises(SwapiUnavailableError):
+            await sync_swapi(mock_session)
 
-    result = await sync_swapi(mock_session)
+    mock_session.commit.assert_not_awaited()
 
-    # Check returned counts
-    assert result == {"films": 1, "characters": 1, "starships": 1}
 
-    # Ensure session.add was called for each entity
-    assert mock_session.add.call_count == 3
+@pytest.mark.asyncio
+async def test_sync_swapi_raises_on_truncated_body():
+    def handler(request):
+        return httpx.Response(200, text='[{"url": "film1", "title": "A New')
+
+    client = partial(httpx.AsyncClient, transport=httpx.MockTransport(handler))
+    mock_session = AsyncMock()
+
+    with patch("app.services.swapi.sync.httpx.AsyncClient", client):
+        with pytest.raises(SwapiUnavailableError):
+            await sync_swapi(mock_session)
 
-    # Commit was called at least once
-    mock_session.commit.assert_awaited()
+    mock_session.commit.assert_not_awaited()
 
 
 # -------------------------
-# Test sync_swapi with network error
+# Test relationship building
 # -------------------------
 
 
 @pytest.mark.asyncio
-@patch("app.services.swapi.sync.fetch_json", new_callable=AsyncMock)
-async def test_sync_swapi_raises_on_fetch_error(mock_fetch):
-    mock_session = AsyncMock()
-    mock_fetch.side_effect = httpx.HTTPError("Network error")
+@pytest.mark.parametrize("engine", [WriteEngine.ORM, WriteEngine.VALUES])
+async def test_sync_swapi_builds_relationships(db, engine):
+    result = await run_sync(db, mode=SyncMode.FULL, engine=engine)
+
+    film = db.session.exec(
+        select(Film).options(
+            selectinload(Film.characters), selectinload(Film.starships)
+        )
+    ).one()
+    starship = db.session.exec(
+        select(Starship).options(selectinload(Starship.pilots))
+    ).one()
+    assert [c.name for c in film.characters] == ["Luke"]
+    assert [s.name for s in film.starships] == ["X-wing"]
+    assert [p.name for p in starship.pilots] == ["Luke"]
+    assert result.changes["starship_pilots"].inserted == 1
 
-    with pytest.raises(SwapiUnavailableError):
-        await sync_swapi(mock_session)
+
+# -------------------------
+# Test incremental sync
+# -------------------------
+
+
+@pytest.mark.asyncio
+async def test_incremental_sync_inserts_into_empty_database(db):
+    result = await run_sync(db)
+
+    assert result.mode is SyncMode.INCREMENTAL
+    assert result.changes["films"].inserted == 1
+    assert result.changes["film_characters"].inserted == 1
+    assert result.changes["starship_pilots"].inserted == 1
+    # One INSERT per entity table and per link table plus the version bump
+    assert len(db.writes) == 7
+
+
+@pytest.mark.asyncio
+async def test_incremental_sync_noop_issues_no_writes(db):
+    await run_sync(db)
+    film_id = db.session.exec(select(Film)).one().id
+    db.statements.clear()
+
+    result = await run_sync(db)
+
+    # Nothing changed, so the dataset version is not bumped either
+    assert db.writes == []
+    assert db.session.get(DatasetVersion, 1).version == 1
+    for label in ("films", "characters", "starships"):
+        assert result.changes[label].unchanged == 1
+        assert result.changes[label].inserted == 0
+        assert result.changes[label].updated == 0
+    assert result.changes["starship_pilots"].unchanged == 1
+    assert db.session.exec(select(Film)).one().id == film_id
+
+
+@pytest.mark.asyncio
+async def test_incremental_sync_updates_and_deletes(db):
+    await run_sync(db)
+    char_id = db.session.exec(select(Character)).one().id
+
+    data = copy.deepcopy(SWAPI_DATA)
+    data["people"][0]["hair_color"] = "brown"
+    data["starships"] = []
+    data["films"][0]["starships"] = []
+    result = await run_sync(db, data)
+
+    assert result.changes["characters"].updated == 1
+    assert result.changes["starships"].deleted == 1
+    assert result.changes["film_starships"].deleted == 1
+    assert result.changes["starship_pilots"].deleted == 1
+    assert result.changes["film_characters"].unchanged == 1
+
+    # The updated character keeps its id, the starship and its links are gone
+    character = db.session.exec(select(Character)).one()
+    assert (character.id, character.hair_color) == (char_id, "brown")
+    assert db.session.exec(select(Starship)).all() == []
+    assert db.session.exec(select(StarshipPilotLink)).all() == []
+
+
+@pytest.mark.asyncio
+async def test_incremental_sync_adds_new_link_only(db):
+    await run_sync(db)
+    data = copy.deepcopy(SWAPI_DATA)
+    data["people"].append({**data["people"][0], "url": "char2", "name": "Leia"})
+    data["films"][0]["characters"].append("char2")
+    db.statements.clear()
+
+    result = await run_sync(db, data)
+
+    assert result.changes["characters"].inserted == 1
+    assert result.changes["film_characters"].inserted == 1
+    assert result.changes["film_characters"].unchanged == 1
+    # Only the new character, its link row and the version bump are written
+    assert len(db.writes) == 3
+    assert len(db.session.exec(select(FilmCharacterLink)).all()) == 2
 
 
 # -------------------------
-# Test relationship building
+# Test dataset version and read cache invalidation
 # -------------------------
 
 
 @pytest.mark.asyncio
-@patch("app.services.swapi.sync.fetch_json")
-async def test_sync_swapi_builds_relationships(mock_fetch_json):
-    mock_session = AsyncMock()
+async def test_sync_bumps_dataset_version_and_invalidates_cache(db):
+    with patch("app.services.swapi.sync.read_cache") as mock_cache:
+        await run_sync(db)
+        await run_sync(db, mode=SyncMode.FULL)
+
+    assert db.session.get(DatasetVersion, 1).version == 2
+    versions = [c.args[0] for c in mock_cache.observe_version.call_args_list]
+    assert versions == [1, 2]
 
-    # Mock data with multiple relationships
-    mock_fetch_json.side_effect = [
-        [
-            {
-                "url": "film1",
-                "title": "A New Hope",
-                "episode_id": 4,
-                "opening_crawl": "",
-                "director": "Lucas",
-                "producer": "Gary",
-                "release_date": "1977-05-25",
-                "characters": ["char1"],
-                "starships": ["starship1"],
-            }
-        ],
-        [
-            {
-                "url": "char1",
-                "name": "Luke",
-                "height": "172",
-                "mass": "77",
-                "hair_color": "blond",
-                "skin_color": "fair",
-                "eye_color": "blue",
-                "birth_year": "19BBY",
-                "gender": "male",
-            }
-        ],
-        [
-            {
-                "url": "starship1",
-                "name": "X-wing",
-                "model": "T-65",
-                "manufacturer": "Incom",
-                "crew": "1",
-                "consumables": "1 week",
-                "starship_class": "fighter",
-                "pilots": ["char1"],
-            }
-        ],
+
+@pytest.mark.asyncio
+async def test_noop_sync_keeps_dataset_version_and_cache(db):
+    await run_sync(db)
+
+    with patch("app.services.swapi.sync.read_cache") as mock_cache:
+        await run_sync(db)
+
+    mock_cache.observe_version.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_failed_sync_keeps_read_cache():
+    async def failing_stream(client, url):
+        raise httpx.HTTPError("Network error")
+        yield
+
+    with (
+        patch("app.services.swapi.sync.stream_json_records", failing_stream),
+        patch("app.services.swapi.sync.read_cache") as mock_cache,
+    ):
+        with pytest.raises(SwapiUnavailableError):
+            await sync_swapi(AsyncMock())
+
+    mock_cache.observe_version.assert_not_called()
+
+
+# -------------------------
+# Test chunked pipeline
+# -------------------------
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", [SyncMode.FULL, SyncMode.INCREMENTAL])
+async def test_sync_writes_in_chunks(db, mode):
+    data = copy.deepcopy(SWAPI_DATA)
+    data["people"] = [
+        {**data["people"][0], "url": f"char{i}", "name": f"Clone {i}"}
+        for i in range(1, 6)
+    ]
+    data["films"][0]["characters"] = [f"char{i}" for i in range(1, 6)]
+
+    result = await run_sync(db, data, mode=mode, chunk_size=2, trace_memory=True)
+
+    character_inserts = [
+        s for s in db.writes if s.is_insert and s.table.name == "character"
+    ]
+    assert len(character_inserts) == 3
+    assert result.synced_entities["characters"] == 5
+    assert result.changes["film_characters"].inserted == 5
+    assert result.chunk_size == 2
+    assert result.peak_memory_bytes > 0
+
+
+# -------------------------
+# Test sync statistics
+# -------------------------
+
+
+@pytest.mark.asyncio
+async def test_sync_reports_phase_timings_and_volume(db, caplog):
+    bodies = {url: json.dumps(records).encode() for url, records in SWAPI_DATA.items()}
+
+    def handler(request):
+        # Streamed like a network response, so downloaded bytes are counted
+        body = bodies[request.url.path.rsplit("/", 1)[-1]]
+        return httpx.Response(200, stream=httpx.ByteStream(body))
+
+    transport = httpx.MockTransport(handler)
+    client = partial(httpx.AsyncClient, transport=transport)
+    synced = sync_records.values.get(("characters",), 0)
+
+    with (
+        patch("app.services.swapi.sync.httpx.AsyncClient", client),
+        caplog.at_level(logging.INFO, logger="app.services.swapi.sync"),
+    ):
+        result = await sync_swapi(db, mode=SyncMode.FULL)
+
+    stats = result.stats
+    phases = {"clear", "fetch", "parse", "rows", "links", "finish", "commit"}
+    assert set(stats.phase_seconds) == phases
+    assert sum(stats.phase_seconds.values()) <= stats.elapsed_seconds
+    assert stats.records_per_second == pytest.approx(3 / stats.elapsed_seconds)
+    assert stats.bytes_fetched == sum(len(body) for body in bodies.values())
+    # Six deletes, six inserts and the dataset version bump, at least
+    assert stats.statements >= 13
+    assert stats.rows_written["characters"] == 1
+    assert stats.rows_written["film_characters"] == 1
+    assert sync_records.values[("characters",)] == synced + 1
+
+    (record,) = [r for r in caplog.records if hasattr(r, "sync")]
+    assert json.loads(record.getMessage()) == record.sync
+    assert record.sync["event"] == "sync_finished"
+    assert record.sync["statements"] == stats.statements
+
+
+@pytest.mark.asyncio
+async def test_sync_leaves_memory_untraced_by_default(db):
+    result = await run_sync(db)
+
+    assert result.peak_memory_bytes is None
+    assert not tracemalloc.is_tracing()
+
+
+# -------------------------
+# Test bulk write engines
+# -------------------------
+
+
+@pytest.mark.asyncio
+async def test_full_sync_values_engine_uses_multi_row_inserts(db):
+    result = await run_sync(db, mode=SyncMode.FULL)
+
+    inserts = [s for s in db.writes if s.is_insert]
+    # Three entity tables plus three link tables, one statement each
+    assert len(inserts) == 6
+    assert all(s._multi_values for s in inserts)
+    assert result.changes["starship_pilots"].inserted == 1
+
+
+@pytest.mark.asyncio
+async def test_values_engine_splits_batches_at_bind_param_limit():
+    from app.services.swapi.writers import MAX_BIND_PARAMS, write_rows
+
+    mock_session = AsyncMock()
+    rows = [
+        {"film_id": uuid4(), "character_id": uuid4()}
+        for _ in range(MAX_BIND_PARAMS // 2 + 1)
     ]
 
-    # Mock execute to handle any query
-    mock_session.execute = make_mock_execute(items=[1])  # dummy items
-    mock_session.commit = AsyncMock()
-    mock_session.add = AsyncMock()
+    await write_rows(mock_session, FilmCharacterLink, rows, WriteEngine.VALUES)
+
+    assert mock_session.execute.await_count == 2
 
-    result = await sync_swapi(mock_session)
 
-    # Validate counts
-    assert result == {"films": 1, "characters": 1, "starships": 1}
+@pytest.mark.asyncio
+async def test_copy_engine_uses_copy_records_to_table():
+    from app.services.swapi.writers import write_rows
+
+    driver = AsyncMock()
+    raw_connection = MagicMock(driver_connection=driver)
+    connection = AsyncMock()
+    connection.get_raw_connection.return_value = raw_connection
+    mock_session = AsyncMock()
+    mock_session.connection.return_value = connection
 
-    # session.add should have been called for each entity
-    assert mock_session.add.call_count == 3
+    row = {"starship_id": uuid4(), "pilot_id": uuid4()}
+    await write_rows(mock_session, StarshipPilotLink, [row], WriteEngine.COPY)
 
-    # commit was called at least once
-    mock_session.commit.assert_awaited()
+    driver.copy_records_to_table.assert_awaited_once_with(
+        "starshippilotlink",
+        records=[(row["starship_id"], row["pilot_id"])],
+        columns=["starship_id", "pilot_id"],
+    )
@@ -3,7 +3,16 @@ from unittest.mock import AsyncMock, Mock
 import httpx
 import pytest
 
-from ..utils import fetch_json, parse_float, parse_int, parse_value
+from ..exceptions import SwapiUnavailableError
+from ..utils import (
+    chunked,
+    fetch_json,
+    iter_json_array,
+    parse_float,
+    parse_int,
+    parse_value,
+    stream_json_records,
+)
 
 
 # -------------------------
@@ -42,6 +51,82 @@ async def test_fetch_json_raises():
         await fetch_json(mock_client, "https://fake.url")
 
 
+# -------------------------
+# Test streaming JSON
+# -------------------------
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+@pytest.mark.asyncio
+async def test_iter_json_array_handles_split_chunks():
+    body = '[{"name": "Luke", "films": [1, 2]}, {"name": "Leia"}, 42]'
+    chunks = [body[i : i + 5] for i in range(0, len(body), 5)]
+
+    items = [item async for item in iter_json_array(_aiter(chunks))]
+
+    assert items == [{"name": "Luke", "films": [1, 2]}, {"name": "Leia"}, 42]
+
+
+@pytest.mark.asyncio
+async def test_iter_json_array_rejects_truncated_body():
+    with pytest.raises(ValueError):
+        [item async for item in iter_json_array(_aiter(['[{"a": 1}, {"b"']))]
+
+
+@pytest.mark.asyncio
+async def test_stream_json_records_reads_array_body():
+    def handler(request):
+        return httpx.Response(200, text='[{"url": "a"}, {"url": "b"}]')
+
+    async with httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), base_url="https://fake.url"
+    ) as client:
+        records = [r async for r in stream_json_records(client, "/people")]
+
+    assert records == [{"url": "a"}, {"url": "b"}]
+
+
+@pytest.mark.asyncio
+async def test_stream_json_records_follows_pagination():
+    pages = {
+        "/people": {"results": [{"url": "a"}], "next": "https://fake.url/people/2"},
+        "/people/2": {"results": [{"url": "b"}], "next": None},
+    }
+
+    def handler(request):
+        return httpx.Response(200, json=pages[request.url.path])
+
+    async with httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), base_url="https://fake.url"
+    ) as client:
+        records = [r async for r in stream_json_records(client, "/people")]
+
+    assert records == [{"url": "a"}, {"url": "b"}]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "body", ['[{"url": "a"}, {"url": "b"', '{"results": [{"url": "a"}', ""]
+)
+async def test_stream_json_records_rejects_truncated_body(body):
+    def handler(request):
+        return httpx.Response(200, text=body)
+
+    async with httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), base_url="https://fake.url"
+    ) as client:
+        with pytest.raises(SwapiUnavailableError):
+            [r async for r in stream_json_records(client, "/people")]
+
+
+@pytest.mark.asyncio
+async def test_chunked_groups_records():
+    chunks = [c async for c in chunked(_aiter(range(5)), 2)]
+    assert chunks == [[0, 1], [2, 3], [4]]
+
+
 # -------------------------
 # Test parse_int
 # -------------------------
@@ -1,15 +1,110 @@
-from typing import Optional
+import json
+from typing import TYPE_CHECKING, AsyncIterable, AsyncIterator, Optional
 
-import httpx
+if TYPE_CHECKING:
+    # Schemas import this module; httpx is only loaded by the sync itself
+    import httpx
 
+from .exceptions import SwapiUnavailableError
 
-async def fetch_json(client: httpx.AsyncClient, url: str):
+_decoder = json.JSONDecoder()
+
+
+async def fetch_json(client: "httpx.AsyncClient", url: str):
     """Fetch a single resource as JSON."""
     response = await client.get(url)
     response.raise_for_status()
     return response.json()
 
 
+async def stream_json_records(
+    client: "httpx.AsyncClient", url: str
+) -> AsyncIterator[dict]:
+    """Yield records from a JSON array endpoint without loading the whole body.
+
+    Endpoints answering with a SWAPI-style page (`{"results": [...], "next": ...}`)
+    are followed page by page instead. A truncated or malformed body raises
+    SwapiUnavailableError, like a failed request.
+    """
+    next_url: Optional[str] = url
+    while next_url:
+        async with client.stream("GET", next_url) as response:
+            response.raise_for_status()
+            chunks = response.aiter_text()
+            try:
+                head = await _read_until_content(chunks)
+                if head.lstrip().startswith("["):
+                    async for record in iter_json_array(_prepend(head, chunks)):
+                        yield record
+                    return
+
+                page = json.loads(head + "".join([chunk async for chunk in chunks]))
+            except ValueError as e:
+                raise SwapiUnavailableError(f"Malformed response from {next_url}: {e}")
+            for record in page.get("results", []):
+                yield record
+            next_url = page.get("next")
+
+
+async def iter_json_array(chunks: AsyncIterable[str]) -> AsyncIterator:
+    """Incrementally decode the elements of a top-level JSON array."""
+    buffer, pos, opened = "", 0, False
+    async for chunk in chunks:
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos == len(buffer):
+                break
+            if not opened:
+                if buffer[pos] != "[":
+                    raise ValueError("Expected a JSON array")
+                opened = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                return
+            try:
+                item, end = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break  # element continues in the next chunk
+            if end == len(buffer) and not isinstance(item, (dict, list, str)):
+                break  # a number or literal may be cut off at the chunk edge
+            yield item
+            pos = end
+    raise ValueError("Unterminated JSON array")
+
+
+async def chunked(records: AsyncIterable, size: int) -> AsyncIterator[list]:
+    """Group an async stream of records into lists of at most `size` items."""
+    chunk = []
+    async for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def _read_until_content(chunks: AsyncIterator[str]) -> str:
+    """Consume chunks until the first non-whitespace character has arrived."""
+    head = ""
+    async for chunk in chunks:
+        head += chunk
+        if head.strip():
+            break
+    return head
+
+
+async def _prepend(head: str, chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Re-attach already consumed text in front of the remaining chunks."""
+    yield head
+    async for chunk in chunks:
+        yield chunk
+
+
 def parse_int(value: str) -> Optional[int]:
     """Convert string to int if possible, else None."""
     try:
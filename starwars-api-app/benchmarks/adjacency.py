@@ -0,0 +1,125 @@
+"""Compare link table reads with the in-memory adjacency index.
+
+Fills the `read_path` scratch schema, builds the adjacency index from it and
+reports its build time and memory, then measures pages of films and
+character traversals served from SQL and from the index: statements issued,
+rows fetched and median latency. The scratch schema is dropped at the end
+unless `--keep` is given.
+
+    uv run python -m benchmarks.adjacency --characters 20000 --repeat 10
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.api.schemas import TotalMode
+from app.config import db_settings
+from app.database.models import Character
+from app.services.cache import ReadCache
+from app.services.get_services import CharacterGetService, FilmGetService
+from app.services.graph import AdjacencyIndexHolder, build_adjacency_index
+
+from .read_path import SCHEMA, measure, populate
+
+TRAVERSAL_PATH = ["films", "characters"]
+
+
+def uncached(service, holder=None):
+    """Measure the database or index path, not the read cache."""
+    service.cache = ReadCache(max_bytes=0, max_entries=0, enabled=False)
+    service.cache.observe_version(0)
+    service.adjacency = holder
+    return service
+
+
+def loaders(holder, starts):
+    """Page and traversal loads, each served from SQL and from `holder`."""
+
+    def page(adjacency):
+        async def load(session, page_size):
+            service = uncached(FilmGetService(session), adjacency)
+            await service.get_paginated(limit=page_size, total_mode=TotalMode.NONE)
+
+        return load
+
+    def traversal(adjacency):
+        async def load(session, page_size):
+            service = uncached(CharacterGetService(session), adjacency)
+            for id in starts:
+                await service.traverse(id, path=TRAVERSAL_PATH, limit=page_size)
+
+        return load
+
+    return (
+        ("page sql", page(None)),
+        ("page index", page(holder)),
+        ("walk sql", traversal(None)),
+        ("walk index", traversal(holder)),
+    )
+
+
+async def run(args):
+    engine = create_async_engine(
+        db_settings.POSTGRES_URL,
+        connect_args={"server_settings": {"search_path": f"{SCHEMA},public"}},
+    )
+    try:
+        await populate(engine, args)
+        async with engine.begin() as connection:
+            await connection.execute(
+                text("INSERT INTO datasetversion (id, version) VALUES (1, 0)")
+            )
+            result = await connection.execute(
+                select(Character.id).order_by(Character.id).limit(args.starts)
+            )
+            starts = result.scalars().all()
+
+        start = time.perf_counter()
+        async with engine.connect() as connection:
+            index = await build_adjacency_index(connection)
+        built = (time.perf_counter() - start) * 1000
+        holder = AdjacencyIndexHolder(engine=engine)
+        holder.swap(index)
+
+        print(
+            f"{args.films} films, {args.characters} characters, "
+            f"{args.starships} starships, {args.links} characters per film"
+        )
+        print(
+            f"index: {index.nodes} nodes, {index.edges} edges, "
+            f"{index.memory_bytes / 2**20:.1f} MiB, built in {built:.0f}ms"
+        )
+        print(
+            f"pages of {args.page_size} films; traversals of "
+            f"{','.join(TRAVERSAL_PATH)} from {len(starts)} characters"
+        )
+        print(f"{'path':>10} {'statements':>10} {'rows':>8} {'latency':>10}")
+        for label, load in loaders(holder, starts):
+            statements, rows, latency = await measure(
+                engine, load, args.page_size, args.repeat
+            )
+            print(f"{label:>10} {statements:>10} {rows:>8} {latency:8.1f}ms")
+    finally:
+        if not args.keep:
+            async with engine.begin() as connection:
+                await connection.execute(
+                    text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+                )
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--films", type=int, default=500)
+    parser.add_argument("--characters", type=int, default=20000)
+    parser.add_argument("--starships", type=int, default=2000)
+    parser.add_argument("--links", type=int, default=80)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--starts", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--keep", action="store_true", help="keep the scratch schema")
+    asyncio.run(run(parser.parse_args()))
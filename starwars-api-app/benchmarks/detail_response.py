@@ -0,0 +1,117 @@
+"""Measure detail route throughput with and without the detail bytes cache.
+
+Fills the `read_path` scratch schema, then drives the application in-process
+through httpx with concurrent `GET /api/{films,characters,starships}/{id}`
+requests for a fixed duration. Every id is requested once before measuring,
+so both runs are served from a warm read cache and differ only in whether
+the cached value is the model, validated and encoded per request, or its
+JSON bytes. The scratch schema is dropped at the end unless `--keep` is
+given.
+
+    uv run python -m benchmarks.detail_response --seconds 5 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import itertools
+import time
+
+import httpx
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.api.dependencies import get_read_session
+from app.config import cache_settings, db_settings
+from app.database.models import Character, Film, Starship
+from app.database.session import AsyncSession
+from app.main import app
+from app.services.cache import read_cache
+
+from .read_path import SCHEMA, populate
+
+ROUTES = {"films": Film, "characters": Character, "starships": Starship}
+
+
+async def throughput(client, urls: list[str], seconds: float, concurrency: int):
+    """Return requests per second sustained over `urls` by `concurrency`
+    clients, failing on any non-200 response."""
+    cycle = itertools.cycle(urls)
+    deadline = time.perf_counter() + seconds
+    done = 0
+
+    async def worker():
+        nonlocal done
+        while time.perf_counter() < deadline:
+            response = await client.get(next(cycle))
+            response.raise_for_status()
+            done += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return done / (time.perf_counter() - start)
+
+
+async def run(args):
+    engine = create_async_engine(
+        db_settings.POSTGRES_URL,
+        connect_args={"server_settings": {"search_path": f"{SCHEMA},public"}},
+    )
+
+    async def scratch_session():
+        async with AsyncSession(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_read_session] = scratch_session
+    try:
+        await populate(engine, args)
+        urls = {}
+        async with engine.connect() as connection:
+            for route, model in ROUTES.items():
+                result = await connection.execute(select(model.id).limit(args.ids))
+                urls[route] = [f"/api/{route}/{id}" for id in result.scalars()]
+
+        print(
+            f"{args.films} films, {args.characters} characters, "
+            f"{args.starships} starships, {args.links} characters per film; "
+            f"{args.concurrency} clients for {args.seconds}s per run"
+        )
+        print(f"{'route':>12} {'model req/s':>12} {'bytes req/s':>12} {'speedup':>8}")
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://b") as ac:
+            for route, route_urls in urls.items():
+                rates = []
+                for enabled in (False, True):
+                    cache_settings.DETAIL_BYTES_CACHE_ENABLED = enabled
+                    read_cache.invalidate()
+                    for url in route_urls:
+                        (await ac.get(url)).raise_for_status()
+                    rates.append(
+                        await throughput(
+                            ac, route_urls, args.seconds, args.concurrency
+                        )
+                    )
+                print(
+                    f"{route:>12} {rates[0]:>12.0f} {rates[1]:>12.0f} "
+                    f"{rates[1] / rates[0]:>7.2f}x"
+                )
+    finally:
+        app.dependency_overrides.pop(get_read_session, None)
+        if not args.keep:
+            async with engine.begin() as connection:
+                await connection.execute(
+                    text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+                )
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--films", type=int, default=500)
+    parser.add_argument("--characters", type=int, default=20000)
+    parser.add_argument("--starships", type=int, default=2000)
+    parser.add_argument("--links", type=int, default=80)
+    parser.add_argument("--ids", type=int, default=200, help="distinct ids per route")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--keep", action="store_true", help="keep the scratch schema")
+    asyncio.run(run(parser.parse_args()))
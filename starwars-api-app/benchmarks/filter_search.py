@@ -0,0 +1,134 @@
+"""Measure filtered list latency with and without the trigram indexes.
+
+Builds a synthetic `character` table in a scratch schema of the configured
+database, then times `GetService.get_paginated` name searches before and
+after creating `ix_character_name_trgm`. The scratch schema is dropped at
+the end unless `--keep` is given. Requires the `pg_trgm` extension to be
+available.
+
+    uv run python -m benchmarks.filter_search --characters 1000000 --repeat 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+
+from app.api.schemas import TotalMode
+from app.config import db_settings
+from app.database.models import Character
+from app.database.session import AsyncSession
+from app.services.get_services import GetService
+
+SCHEMA = "bench_filter_search"
+TRGM_INDEX = "ix_character_name_trgm"
+
+# Terms matching one row, about a hundred rows, over a tenth of the rows, and
+# a pattern too short to yield a trigram
+SEARCHES = {
+    "rare": "123457 ",
+    "moderate": "12345",
+    "common": "Character 1",
+    "short": "ab",
+}
+
+
+async def populate(engine, characters: int):
+    """Create the scratch schema and fill it server-side with characters."""
+    async with engine.begin() as connection:
+        await connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await connection.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await connection.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        await connection.run_sync(SQLModel.metadata.create_all)
+        await connection.execute(
+            text(
+                """
+                INSERT INTO character (
+                    id, name, hair_color, skin_color, eye_color,
+                    gender, birth_year, swapi_url
+                )
+                SELECT
+                    gen_random_uuid(),
+                    'Character ' || i || ' ' || substr(md5(i::text), 1, 8),
+                    'brown', 'fair', 'blue', 'n/a', '19BBY',
+                    'https://swapi.test/people/' || i
+                FROM generate_series(1, :characters) AS i
+                """
+            ),
+            {"characters": characters},
+        )
+        await connection.execute(text(f"DROP INDEX {TRGM_INDEX}"))
+    async with engine.connect() as connection:
+        await connection.execution_options(isolation_level="AUTOCOMMIT")
+        await connection.execute(text("VACUUM ANALYZE character"))
+
+
+async def time_searches(engine, repeat: int, total_mode: TotalMode) -> dict:
+    """Return the median latency in milliseconds of each search term."""
+    timings = {}
+    for label, term in SEARCHES.items():
+        samples = []
+        for _ in range(repeat):
+            async with AsyncSession(engine) as session:
+                service = GetService(Character, session=session)
+                start = time.perf_counter()
+                await service.get_paginated(
+                    filter_value=term, limit=10, total_mode=total_mode
+                )
+                samples.append((time.perf_counter() - start) * 1000)
+        timings[label] = statistics.median(samples)
+    return timings
+
+
+async def run(args):
+    engine = create_async_engine(
+        db_settings.POSTGRES_URL,
+        connect_args={"server_settings": {"search_path": f"{SCHEMA},public"}},
+    )
+    try:
+        start = time.perf_counter()
+        await populate(engine, args.characters)
+        print(
+            f"{args.characters} characters loaded in "
+            f"{time.perf_counter() - start:.1f}s, total={args.total.value}"
+        )
+
+        before = await time_searches(engine, args.repeat, args.total)
+        async with engine.begin() as connection:
+            await connection.execute(
+                text(
+                    f"CREATE INDEX {TRGM_INDEX} ON character "
+                    "USING gin (name gin_trgm_ops)"
+                )
+            )
+            await connection.execute(text("ANALYZE character"))
+        after = await time_searches(engine, args.repeat, args.total)
+
+        print(f"{'search':>9} {'no index':>10} {'trigram':>10} {'speedup':>8}")
+        for label in SEARCHES:
+            print(
+                f"{label:>9} {before[label]:8.1f}ms {after[label]:8.1f}ms "
+                f"{before[label] / after[label]:7.1f}x"
+            )
+    finally:
+        if not args.keep:
+            async with engine.begin() as connection:
+                await connection.execute(
+                    text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+                )
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--characters", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--total", type=TotalMode, default=TotalMode.EXACT, choices=list(TotalMode)
+    )
+    parser.add_argument("--keep", action="store_true", help="keep the scratch schema")
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,80 @@
+"""Measure how long importing the application takes.
+
+Imports `app.main` in fresh interpreters under `python -X importtime` and
+reports the median cumulative time of the import and of the slowest
+top-level packages it pulls in. With `--max-ms`, exits non-zero when the
+median exceeds that budget, so import-time regressions fail a CI step. No
+database is needed; connections are only opened on startup.
+
+    uv run python -m benchmarks.import_time --runs 7 --max-ms 1500
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+# Placeholders so settings resolve when the environment has none
+PLACEHOLDER_ENV = {
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_PORT": "5432",
+    "POSTGRES_USER": "postgres",
+    "POSTGRES_PASSWORD": "postgres",
+    "POSTGRES_DB": "postgres",
+}
+
+
+def import_times(module: str) -> dict[str, float]:
+    """Import `module` in a new interpreter and return the cumulative import
+    time in milliseconds of every module it loaded."""
+    env = {**PLACEHOLDER_ENV, **os.environ}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+def top_packages(runs: list[dict[str, float]], count: int) -> list[tuple[str, float]]:
+    """Return the `count` top-level packages with the highest median time."""
+    medians = defaultdict(list)
+    for times in runs:
+        for name, ms in times.items():
+            if "." not in name:
+                medians[name].append(ms)
+    ranked = ((name, statistics.median(ms)) for name, ms in medians.items())
+    return sorted(ranked, key=lambda item: item[1], reverse=True)[:count]
+
+
+def run(args) -> int:
+    runs = [import_times(args.module) for _ in range(args.runs)]
+    total = statistics.median(times[args.module] for times in runs)
+    print(f"import {args.module}: {total:.1f} ms (median of {args.runs})")
+    print(f"{'package':>24} {'ms':>8}")
+    for name, ms in top_packages(runs, args.top):
+        if name != args.module:
+            print(f"{name:>24} {ms:>8.1f}")
+    if args.max_ms is not None and total > args.max_ms:
+        print(f"over the {args.max_ms:.0f} ms budget", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="packages to list")
+    parser.add_argument("--max-ms", type=float, help="fail above this median")
+    sys.exit(run(parser.parse_args()))
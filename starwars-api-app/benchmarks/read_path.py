@@ -0,0 +1,185 @@
+"""Compare ORM selectin loading with the projection read path for list pages.
+
+Builds synthetic films, characters and starships in a scratch schema of the
+configured database, then fetches pages of films through both paths and
+reports statements issued, rows fetched and median latency. The scratch
+schema is dropped at the end unless `--keep` is given.
+
+    uv run python -m benchmarks.read_path --page-size 100 --repeat 10
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import event, select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import selectinload
+from sqlmodel import SQLModel
+
+from app.api.schemas import FilmRead, TotalMode
+from app.config import db_settings
+from app.database.models import Film
+from app.database.session import AsyncSession
+from app.services.cache import ReadCache
+from app.services.get_services import FilmGetService
+
+SCHEMA = "bench_read_path"
+
+# Each film links `links` random characters and a quarter as many starships;
+# each starship has a few pilots. The `* 0` terms correlate the lateral
+# subqueries so every owner draws its own sample.
+POPULATE = [
+    """
+    INSERT INTO character (
+        id, name, hair_color, skin_color, eye_color, gender, birth_year, swapi_url
+    )
+    SELECT gen_random_uuid(), 'Character ' || i, 'brown', 'fair', 'blue', 'n/a',
+        '19BBY', 'https://swapi.test/people/' || i
+    FROM generate_series(1, :characters) AS i
+    """,
+    """
+    INSERT INTO starship (
+        id, name, model, manufacturer, crew, consumables, starship_class, swapi_url
+    )
+    SELECT gen_random_uuid(), 'Starship ' || i, 'T-65', 'Incom', '1', '1 week',
+        'Starfighter', 'https://swapi.test/starships/' || i
+    FROM generate_series(1, :starships) AS i
+    """,
+    """
+    INSERT INTO film (
+        id, title, episode_id, opening_crawl, director, producer, release_date,
+        swapi_url
+    )
+    SELECT gen_random_uuid(), 'Film ' || i, i, repeat('A long time ago ', 40),
+        'George Lucas', 'Gary Kurtz', now(), 'https://swapi.test/films/' || i
+    FROM generate_series(1, :films) AS i
+    """,
+    """
+    INSERT INTO filmcharacterlink (film_id, character_id)
+    SELECT f.id, c.id FROM film f CROSS JOIN LATERAL (
+        SELECT id FROM character ORDER BY random() + f.episode_id * 0
+        LIMIT :links
+    ) c
+    """,
+    """
+    INSERT INTO filmstarshiplink (film_id, starship_id)
+    SELECT f.id, s.id FROM film f CROSS JOIN LATERAL (
+        SELECT id FROM starship ORDER BY random() + f.episode_id * 0
+        LIMIT :links / 4
+    ) s
+    """,
+    """
+    INSERT INTO starshippilotlink (starship_id, pilot_id)
+    SELECT s.id, c.id FROM starship s CROSS JOIN LATERAL (
+        SELECT id FROM character ORDER BY random() + length(s.name) * 0
+        LIMIT 3
+    ) c
+    """,
+]
+
+
+async def populate(engine, args):
+    """Create the scratch schema and fill it server-side with linked rows."""
+    async with engine.begin() as connection:
+        await connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await connection.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await connection.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        await connection.run_sync(SQLModel.metadata.create_all)
+        for statement in POPULATE:
+            await connection.execute(
+                text(statement),
+                {
+                    "films": args.films,
+                    "characters": args.characters,
+                    "starships": args.starships,
+                    "links": args.links,
+                },
+            )
+    async with engine.connect() as connection:
+        await connection.execution_options(isolation_level="AUTOCOMMIT")
+        await connection.execute(text("VACUUM ANALYZE"))
+
+
+async def selectin_page(session, page_size: int):
+    """Load a page of films as ORM objects with their relationships."""
+    result = await session.execute(
+        select(Film)
+        .options(selectinload(Film.characters), selectinload(Film.starships))
+        .order_by(Film.title, Film.id)
+        .limit(page_size)
+    )
+    return [FilmRead.model_validate(f, from_attributes=True) for f in result.scalars()]
+
+
+async def projection_page(session, page_size: int):
+    """Load a page of films through the projection read path."""
+    service = FilmGetService(session)
+    # Measure the database path, not the read cache
+    service.cache = ReadCache(max_bytes=0, max_entries=0, enabled=False)
+    page = await service.get_paginated(limit=page_size, total_mode=TotalMode.NONE)
+    return page.items
+
+
+async def measure(engine, load, page_size: int, repeat: int):
+    """Return statements, rows fetched and median latency in ms of `load`."""
+    counters = {"statements": 0, "rows": 0}
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        counters["statements"] += 1
+        counters["rows"] += max(cursor.rowcount, 0)
+
+    samples, first = [], {}
+    for i in range(repeat + 1):
+        event.listen(engine.sync_engine, "after_cursor_execute", count)
+        async with AsyncSession(engine) as session:
+            start = time.perf_counter()
+            await load(session, page_size)
+            elapsed = (time.perf_counter() - start) * 1000
+        event.remove(engine.sync_engine, "after_cursor_execute", count)
+        if i == 0:
+            # The first run warms the connection and statement caches
+            first = dict(counters)
+        samples.append(elapsed)
+    return first["statements"], first["rows"], statistics.median(samples[1:])
+
+
+async def run(args):
+    engine = create_async_engine(
+        db_settings.POSTGRES_URL,
+        connect_args={"server_settings": {"search_path": f"{SCHEMA},public"}},
+    )
+    try:
+        await populate(engine, args)
+        print(
+            f"{args.films} films, {args.characters} characters, "
+            f"{args.starships} starships, {args.links} characters per film, "
+            f"page of {args.page_size}"
+        )
+        print(f"{'path':>10} {'statements':>10} {'rows':>8} {'latency':>10}")
+        paths = (("selectin", selectin_page), ("projection", projection_page))
+        for label, load in paths:
+            statements, rows, latency = await measure(
+                engine, load, args.page_size, args.repeat
+            )
+            print(f"{label:>10} {statements:>10} {rows:>8} {latency:8.1f}ms")
+    finally:
+        if not args.keep:
+            async with engine.begin() as connection:
+                await connection.execute(
+                    text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+                )
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--films", type=int, default=500)
+    parser.add_argument("--characters", type=int, default=20000)
+    parser.add_argument("--starships", type=int, default=2000)
+    parser.add_argument("--links", type=int, default=80)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--keep", action="store_true", help="keep the scratch schema")
+    asyncio.run(run(parser.parse_args()))
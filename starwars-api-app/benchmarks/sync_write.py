@@ -0,0 +1,112 @@
+"""Compare sync write engines on a synthetic SWAPI-shaped dataset.
+
+Runs a full reload with every `WriteEngine` against the configured database,
+rolling each run back so existing data is left untouched. Requires the
+migrations to be applied.
+
+    uv run python -m benchmarks.sync_write --characters 20000 --repeat 3
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from app.api.schemas import CharacterSWAPICreate, FilmSWAPICreate, StarshipSWAPICreate
+from app.database.session import AsyncSession, get_engine
+from app.services.swapi.entities import EntityType, SyncMode, WriteEngine
+from app.services.swapi.sync import apply_swapi
+
+
+def build_dataset(films: int, characters: int, starships: int, links: int):
+    """Generate parsed records with `links` related URLs per film and starship."""
+    rng = random.Random(42)
+    char_urls = [f"https://swapi.test/people/{i}" for i in range(characters)]
+    ship_urls = [f"https://swapi.test/starships/{i}" for i in range(starships)]
+
+    return {
+        EntityType.FILM: [
+            FilmSWAPICreate(
+                swapi_url=f"https://swapi.test/films/{i}",
+                title=f"Film {i}",
+                episode_id=i,
+                opening_crawl="It is a period of civil war. " * 20,
+                director="George Lucas",
+                producer="Gary Kurtz",
+                release_date="1977-05-25",
+                character_urls=rng.sample(char_urls, min(links, characters)),
+                starship_urls=rng.sample(ship_urls, min(links, starships)),
+            )
+            for i in range(films)
+        ],
+        EntityType.CHARACTER: [
+            CharacterSWAPICreate(
+                swapi_url=url,
+                name=f"Character {i}",
+                height=170,
+                mass=70,
+                hair_color="brown",
+                skin_color="fair",
+                eye_color="blue",
+                gender="n/a",
+                birth_year="19BBY",
+            )
+            for i, url in enumerate(char_urls)
+        ],
+        EntityType.STARSHIP: [
+            StarshipSWAPICreate(
+                swapi_url=url,
+                name=f"Starship {i}",
+                model="T-65",
+                manufacturer="Incom",
+                crew="1",
+                consumables="1 week",
+                starship_class="Starfighter",
+                pilot_urls=rng.sample(char_urls, min(links // 10 + 1, characters)),
+            )
+            for i, url in enumerate(ship_urls)
+        ],
+    }
+
+
+async def run(args):
+    dataset = build_dataset(args.films, args.characters, args.starships, args.links)
+    rows = sum(len(records) for records in dataset.values())
+    engine = get_engine()
+    print(f"{rows} entity rows, engines: {', '.join(e.value for e in WriteEngine)}")
+
+    for write_engine in WriteEngine:
+        timings, peak = [], 0
+        for _ in range(args.repeat):
+            async with AsyncSession(engine, expire_on_commit=False) as session:
+                start = time.perf_counter()
+                result = await apply_swapi(
+                    session,
+                    dataset,
+                    mode=SyncMode.FULL,
+                    engine=write_engine,
+                    chunk_size=args.chunk_size,
+                    trace_memory=True,
+                )
+                await session.flush()
+                timings.append(time.perf_counter() - start)
+                peak = max(peak, result.peak_memory_bytes)
+                await session.rollback()
+        best = min(timings)
+        print(
+            f"{write_engine.value:>7}: {best:8.3f}s best, {rows / best:10.0f} rows/s, "
+            f"peak {peak / 2**20:7.1f} MiB"
+        )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--films", type=int, default=100)
+    parser.add_argument("--characters", type=int, default=20000)
+    parser.add_argument("--starships", type=int, default=5000)
+    parser.add_argument("--links", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    asyncio.run(run(parser.parse_args()))
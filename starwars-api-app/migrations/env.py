@@ -5,11 +5,13 @@ from alembic import context
 from app.config import db_settings
 from app.database.models import (
     Character,
+    DatasetVersion,
     Film,
     FilmCharacterLink,
     FilmStarshipLink,
     Starship,
     StarshipPilotLink,
+    SyncJob,
 )
 from sqlalchemy import pool
 from sqlalchemy.engine import Connection
@@ -0,0 +1,49 @@
+"""notify dataset version timestamp
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 12:20:05.861447
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, Sequence[str], None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Send the bump time along with the version so workers can serve
+    # Last-Modified without reading the row back
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_dataset_version() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify(
+                'dataset_version',
+                json_build_object(
+                    'version', NEW.version,
+                    'updated_at', NEW.updated_at
+                )::text
+            );
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_dataset_version() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('dataset_version', NEW.version::text);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)